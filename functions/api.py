@@ -0,0 +1,319 @@
+"""
+JSON API (/api/v1). HTML route'larıyla aynı modelleri ve filtreleri kullanır;
+toplu işlemler (çok öğrenci ekleme, çok not ekleme, çok öğrencinin durumunu
+değiştirme) tek transaction'da çalışır.
+
+Kimlik doğrulama HTML tarafıyla aynı oturum çerezi üzerinden yapılır.
+"""
+from flask import Blueprint, jsonify, request, abort
+from flask_login import current_user
+from werkzeug.exceptions import HTTPException
+
+import audit
+from database import read_replica
+from faculties import resolve_faculty_department
+from models import (
+    db, STATUSES, Student, StudentNote,
+    read_student_filters, apply_student_filters, read_page_size, read_before_id,
+    read_before_at, count_students, student_model,
+    NOTES_PAGE_SIZE, NOTES_MAX_PAGE_SIZE, fetch_note_page,
+)
+
+api = Blueprint("api", __name__, url_prefix="/api/v1")
+
+# Tek istekte kabul edilen en fazla kayıt
+MAX_BATCH = 1000
+
+STUDENT_FIELDS = (
+    "id", "name", "phone", "school_no", "added_by", "status",
+    "department", "faculty", "problem", "created_at", "updated_at",
+    "note_count", "last_note_at",
+)
+DEFAULT_STUDENT_FIELDS = (
+    "id", "name", "phone", "school_no", "added_by", "status", "department", "faculty",
+)
+NOTE_FIELDS = ("id", "student_id", "text", "author", "created_at")
+AUDIT_FIELDS = ("id", "at", "actor", "action", "entity", "entity_id", "changes")
+
+# Toplu eklemede kabul edilen alanlar ve uzunluk sınırları (model kolonlarıyla aynı)
+WRITABLE_STUDENT_FIELDS = {
+    "name": 150, "phone": 30, "school_no": 30,
+    "department": 200, "faculty": 200, "problem": None,
+}
+
+
+class ApiError(Exception):
+    def __init__(self, message, status=400, details=None):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+        self.details = details
+
+
+@api.errorhandler(ApiError)
+def _api_error(e):
+    body = {"error": e.message}
+    if e.details:
+        body["details"] = e.details
+    return jsonify(body), e.status
+
+
+@api.errorhandler(HTTPException)
+def _http_error(e):
+    return jsonify({"error": e.description or e.name}), e.code
+
+
+@api.before_request
+def _require_login():
+    if not current_user.is_authenticated:
+        return jsonify({"error": "Giriş gerekli."}), 401
+
+
+# -------------------------------
+# Yardımcılar
+# -------------------------------
+def _serialize(value):
+    return value.isoformat() if hasattr(value, "isoformat") else value
+
+
+def _row_to_dict(row, fields):
+    return {f: _serialize(getattr(row, f)) for f in fields}
+
+
+def read_fields(args, allowed, default):
+    """?fields=id,name,... -> doğrulanmış alan listesi (id her zaman dahil)."""
+    raw = (args.get("fields") or "").strip()
+    if not raw:
+        return list(default)
+    fields = [f.strip() for f in raw.split(",") if f.strip()]
+    unknown = sorted(set(fields) - set(allowed))
+    if unknown:
+        raise ApiError("Bilinmeyen alan.", details={"fields": unknown})
+    if "id" not in fields:
+        fields.insert(0, "id")
+    return list(dict.fromkeys(fields))
+
+
+def _json_body():
+    data = request.get_json(silent=True)
+    if data is None:
+        raise ApiError("JSON gövde bekleniyor.")
+    return data
+
+
+def _items(data, key):
+    """{"<key>": [...]} ya da doğrudan liste kabul eder."""
+    items = data.get(key) if isinstance(data, dict) else data
+    if not isinstance(items, list) or not items:
+        raise ApiError(f"'{key}' boş olmayan bir liste olmalı.")
+    if len(items) > MAX_BATCH:
+        raise ApiError(f"Tek istekte en fazla {MAX_BATCH} kayıt gönderilebilir.")
+    return items
+
+
+def _is_int(value):
+    # JSON true / false Python'da int alt sınıfı
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _clean_str(value):
+    if value is None:
+        return None
+    return str(value).strip() or None
+
+
+def validate_student(item):
+    """Toplu ekleme için tek kaydı doğrular: (temiz değerler, hata listesi)."""
+    if not isinstance(item, dict):
+        return None, ["Kayıt bir nesne olmalı."]
+    errors = []
+    values = {}
+    for field, max_len in WRITABLE_STUDENT_FIELDS.items():
+        value = _clean_str(item.get(field))
+        if value is not None and max_len and len(value) > max_len:
+            errors.append(f"{field} en fazla {max_len} karakter olabilir.")
+        values[field] = value
+    if not values["name"]:
+        errors.append("name zorunlu.")
+    try:
+        values["faculty"], values["department"] = \
+            resolve_faculty_department(values["faculty"], values["department"])
+    except ValueError as e:
+        errors.append(str(e))
+    status = item.get("status") or "cozulmedi"
+    if status not in STATUSES:
+        errors.append(f"status {'/'.join(STATUSES)} olmalı.")
+    values["status"] = status
+    return values, errors
+
+
+# -------------------------------
+# Öğrenciler
+# -------------------------------
+@api.get("/students")
+@read_replica
+def list_students():
+    filters = read_student_filters(request.args)
+    fields = read_fields(request.args, STUDENT_FIELDS, DEFAULT_STUDENT_FIELDS)
+    per_page = read_page_size(request.args)
+    before_id = read_before_id(request.args)
+
+    model = student_model(filters)
+    query = apply_student_filters(
+        db.session.query(*(getattr(model, f) for f in fields)), filters, model
+    )
+    if before_id is not None:
+        query = query.filter(model.id < before_id)
+    rows = query.order_by(model.id.desc()).limit(per_page + 1).all()
+
+    body = {
+        "items": [_row_to_dict(r, fields) for r in rows[:per_page]],
+        "next_before_id": rows[per_page - 1].id if len(rows) > per_page else None,
+    }
+    # COUNT ayrı sorgu; yalnızca istenirse
+    if request.args.get("count") in ("1", "true"):
+        body["total"] = count_students(filters)
+    return jsonify(body)
+
+
+@api.get("/students/<int:id>")
+@read_replica
+def get_student(id):
+    fields = read_fields(request.args, STUDENT_FIELDS, STUDENT_FIELDS)
+    row = db.session.query(*(getattr(Student, f) for f in fields))\
+        .filter(Student.id == id).first()
+    if row is None:
+        abort(404, "Öğrenci bulunamadı.")
+    body = _row_to_dict(row, fields)
+    if request.args.get("include") == "notes":
+        body["notes"] = _notes_for(id)
+    return jsonify(body)
+
+
+@api.get("/students/<int:id>/notes")
+@read_replica
+def list_student_notes(id):
+    """Tüm notlar; ?per_page= (ve dönen `next` imleci) verilirse keyset sayfalı."""
+    if not db.session.query(Student.id).filter(Student.id == id).first():
+        abort(404, "Öğrenci bulunamadı.")
+    if "per_page" not in request.args:
+        return jsonify({"items": _notes_for(id)})
+    notes, cursor = fetch_note_page(
+        id, read_before_at(request.args), read_before_id(request.args),
+        read_page_size(request.args, NOTES_PAGE_SIZE, NOTES_MAX_PAGE_SIZE),
+    )
+    return jsonify({"items": [_row_to_dict(n, NOTE_FIELDS) for n in notes], "next": cursor})
+
+
+@api.get("/students/<int:id>/history")
+@read_replica
+def student_history(id):
+    """Öğrencinin değişiklik geçmişi (yeniden eskiye); silinmiş öğrenciler için de çalışır."""
+    events, next_before_id = audit.student_history(
+        id, read_before_id(request.args), read_page_size(request.args),
+    )
+    if not events and not db.session.query(Student.id).filter(Student.id == id).first():
+        abort(404, "Öğrenci bulunamadı.")
+    return jsonify({
+        "items": [_row_to_dict(e, AUDIT_FIELDS) for e in events],
+        "next_before_id": next_before_id,
+    })
+
+
+def _notes_for(student_id):
+    rows = db.session.query(*(getattr(StudentNote, f) for f in NOTE_FIELDS))\
+        .filter(StudentNote.student_id == student_id)\
+        .order_by(StudentNote.created_at.desc()).all()
+    return [_row_to_dict(r, NOTE_FIELDS) for r in rows]
+
+
+@api.post("/students")
+def create_students():
+    """Toplu öğrenci ekleme; herhangi bir kayıt hatalıysa hiçbiri eklenmez."""
+    items = _items(_json_body(), "students")
+
+    students, errors = [], []
+    for index, item in enumerate(items):
+        values, item_errors = validate_student(item)
+        if item_errors:
+            errors.append({"index": index, "errors": item_errors})
+        else:
+            students.append(Student(added_by=current_user.username, **values))
+    if errors:
+        raise ApiError("Geçersiz kayıtlar var; hiçbiri eklenmedi.", status=422, details=errors)
+
+    db.session.add_all(students)
+    # id'ler commit'ten önce: commit tüm nesneleri expire eder, sonrasında her
+    # .id erişimi ayrı bir SELECT olurdu
+    db.session.flush()
+    ids = [s.id for s in students]
+    db.session.commit()
+    return jsonify({"created": len(students), "ids": ids}), 201
+
+
+@api.post("/students/status")
+def set_students_status():
+    """{"ids": [...], "status": "cozuldu"} -> tek transaction'da durum güncelleme."""
+    data = _json_body()
+    status = data.get("status") if isinstance(data, dict) else None
+    if status not in STATUSES:
+        raise ApiError(f"status {'/'.join(STATUSES)} olmalı.")
+    ids = _items(data, "ids")
+    if not all(_is_int(i) for i in ids):
+        raise ApiError("ids tam sayı listesi olmalı.")
+
+    # ORM üzerinden: student_stats / sürüm damgaları flush hook'larıyla güncellenir
+    students = Student.query.filter(Student.id.in_(set(ids))).all()
+    missing = sorted(set(ids) - {s.id for s in students})
+    if missing:
+        raise ApiError("Bulunamayan öğrenciler var.", status=404, details={"missing": missing})
+
+    changed = 0
+    for s in students:
+        if s.status != status:
+            s.status = status
+            changed += 1
+    db.session.commit()
+    return jsonify({"matched": len(students), "changed": changed})
+
+
+# -------------------------------
+# Notlar
+# -------------------------------
+@api.post("/notes")
+def create_notes():
+    """{"notes": [{"student_id": 1, "text": "..."}, ...]} -> tek transaction'da ekler."""
+    items = _items(_json_body(), "notes")
+
+    errors, notes = [], []
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            errors.append({"index": index, "errors": ["Kayıt bir nesne olmalı."]})
+            continue
+        item_errors = []
+        student_id = item.get("student_id")
+        text = _clean_str(item.get("text"))
+        if not _is_int(student_id):
+            item_errors.append("student_id tam sayı olmalı.")
+        if not text:
+            item_errors.append("text zorunlu.")
+        if item_errors:
+            errors.append({"index": index, "errors": item_errors})
+        else:
+            notes.append(StudentNote(student_id=student_id, text=text,
+                                     author=current_user.username))
+
+    if not errors:
+        wanted = {n.student_id for n in notes}
+        found = {row[0] for row in db.session.query(Student.id)
+                 .filter(Student.id.in_(wanted))}
+        errors = [{"index": i, "errors": ["Öğrenci bulunamadı."]}
+                  for i, n in enumerate(notes) if n.student_id not in found]
+    if errors:
+        raise ApiError("Geçersiz kayıtlar var; hiçbiri eklenmedi.", status=422, details=errors)
+
+    db.session.add_all(notes)
+    db.session.flush()
+    ids = [n.id for n in notes]
+    db.session.commit()
+    return jsonify({"created": len(notes), "ids": ids}), 201
@@ -0,0 +1,127 @@
+"""
+Çözülmüş vakaların arşivi.
+
+Durumu "cozuldu" olan ve ARCHIVE_AFTER_DAYS gündür hareket görmeyen (kayıt /
+güncelleme / son not) öğrenciler notlarıyla birlikte student_archive ve
+student_note_archive tablolarına taşınır; dashboard listesi, sayımlar ve
+arama sıcak tabloda kalanlar üzerinden çalışır. Taşıma `archive-students`
+işiyle (bkz. jobs.py) JOB_BATCH_SIZE'lık partiler hâlinde, her parti tek
+transaction'da yapılır; id'ler korunur, bağlantılar ve geçmiş bozulmaz.
+
+Arşivdeki öğrenciler dashboard'da "Arşiv dahil" filtresiyle listelenir,
+detay sayfası salt okunurdur; restore_student() öğrenciyi notlarıyla sıcak
+tabloya geri taşır. student_stats toplamları arşivlemeyle değişmez.
+
+Ayarlar (ortam):
+  ARCHIVE_AFTER_DAYS   çözülmüş vakanın arşive taşınması için hareketsiz gün  (180)
+"""
+import os
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, delete, func, insert, literal, or_, select
+from sqlalchemy.types import DateTime
+
+import audit
+from database import env_int
+from models import (
+    db, ArchivedNote, ArchivedStudent, Student, StudentNote, mark_students_changed,
+)
+
+ARCHIVE_STATUS = "cozuldu"
+
+
+def archive_after_days(env=None):
+    return env_int(os.environ if env is None else env, "ARCHIVE_AFTER_DAYS", 180)
+
+
+def archive_cutoff(days, now=None):
+    return (now or datetime.utcnow()) - timedelta(days=days)
+
+
+def archivable(cutoff):
+    """Arşive taşınabilecek öğrenciler: çözülmüş ve cutoff'tan beri hareketsiz."""
+    t = Student.__table__
+    return and_(
+        t.c.status == ARCHIVE_STATUS,
+        func.coalesce(t.c.updated_at, t.c.created_at) < cutoff,
+        or_(t.c.last_note_at.is_(None), t.c.last_note_at < cutoff),
+    )
+
+
+def _move(source, target, where, **values):
+    """source'taki satırları target'a INSERT ... SELECT ile kopyalar, sonra siler."""
+    names = [c.name for c in target.columns]
+    columns = [values[n] if n in values else source.c[n] for n in names]
+    db.session.execute(insert(target).from_select(names, select(*columns).where(where)))
+    db.session.execute(delete(source).where(where))
+
+
+def archive_students(ids, cutoff, now=None):
+    """
+    ids içinden hâlâ arşivlenebilir olanları notlarıyla taşır; commit etmez.
+    Core yazımları flush hook'larından geçmez: geçmiş olayları ve liste
+    sürümü burada. Dönen değer: taşınan id'ler.
+    """
+    student = Student.__table__
+    moved = db.session.execute(
+        select(student.c.id).where(student.c.id.in_(ids), archivable(cutoff))
+        .with_for_update()
+    ).scalars().all()
+    if not moved:
+        return []
+
+    now = now or datetime.utcnow()
+    # Önce notlar (student_note.student_id -> student.id)
+    _move(StudentNote.__table__, ArchivedNote.__table__,
+          StudentNote.__table__.c.student_id.in_(moved))
+    _move(student, ArchivedStudent.__table__, student.c.id.in_(moved),
+          archived_at=literal(now, DateTime))
+
+    audit.stage(db.session, [audit.audit_event("archive", "student", sid, sid, {})
+                             for sid in moved])
+    mark_students_changed(db.session)
+    return moved
+
+
+def restore_student(id):
+    """
+    Arşivdeki öğrenciyi notlarıyla geri taşır; commit etmez. Bulunamazsa
+    False; id'si (ya da bir notunun id'si) sıcak tabloda başka bir kayda
+    verilmişse ValueError. Geri yüklenen kayıt hareket görmüş sayılır
+    (updated_at), hemen yeniden arşive gitmez.
+    """
+    archive = ArchivedStudent.__table__
+    found = db.session.execute(
+        select(archive.c.id).where(archive.c.id == id).with_for_update()
+    ).first()
+    if found is None:
+        return False
+    # AUTOINCREMENT'tan (0012) önce SQLite arşivdeki id'leri yeniden verebiliyordu
+    notes = ArchivedNote.__table__
+    if db.session.get(Student, id) is not None or db.session.execute(
+        select(StudentNote.id).where(StudentNote.id.in_(
+            select(notes.c.id).where(notes.c.student_id == id)
+        )).limit(1)
+    ).first() is not None:
+        raise ValueError("Bu öğrencinin id'si başka bir kayda verilmiş; geri yüklenemedi.")
+
+    _move(archive, Student.__table__, archive.c.id == id,
+          updated_at=literal(datetime.utcnow(), DateTime),
+          row_version=archive.c.row_version + 1)
+    _move(ArchivedNote.__table__, StudentNote.__table__,
+          ArchivedNote.__table__.c.student_id == id)
+
+    audit.stage(db.session, [audit.audit_event("restore", "student", id, id, {})])
+    mark_students_changed(db.session)
+    return True
+
+
+def archived_student_with_notes(id):
+    """(arşivdeki öğrenci, notları yeniden eskiye) ya da None."""
+    s = db.session.get(ArchivedStudent, id)
+    if s is None:
+        return None
+    notes = db.session.query(ArchivedNote)\
+        .filter(ArchivedNote.student_id == id)\
+        .order_by(ArchivedNote.created_at.desc(), ArchivedNote.id.desc()).all()
+    return s, notes
@@ -0,0 +1,227 @@
+"""
+Statik CSS / JS paketleri ve yanıt sıkıştırma.
+
+Şablonların ortak stil ve script'leri static/css, static/js altındadır; BUNDLES
+her paketin kaynak dosyalarını sırayla birleştirir. Paketler ilk kullanımda
+(ilk render / ilk /assets isteği; import'ta değil, soğuk başlangıç için)
+bellekte kurulur ve adları içeriğin hash'ini taşır (app.3f2a9c1e0b.css):
+/assets/<ad> yanıtları bir yıl, immutable önbelleklenir; içerik değişince
+şablondaki URL de değişir. Şablonlarda: {{ asset_url("app.css") }}.
+
+`flask build-assets` (deploy öncesi) paketleri static/dist'e yazar, yanlarına
+en yüksek seviyede sıkıştırılmış .gz ve .br sürümlerini koyar. Adında hash
+olduğundan eski bir dist içeriği yanlışlıkla sunulmaz; dist'te karşılığı
+olmayan paket ilk istekte bellekte sıkıştırılır.
+
+HTML ve JSON yanıtları COMPRESS_MIN_SIZE'dan büyükse istemcinin
+Accept-Encoding'ine göre brotli ya da gzip ile sıkıştırılır (after_request'te;
+test istemcisi ve main.serving dahil her yol aynı kodu çalıştırır). Akış
+yanıtları (SSE, CSV dışa aktarma) sıkıştırılmaz. brotli paketi kurulu değilse yalnızca gzip.
+
+Ayarlar (ortam):
+  COMPRESS             yanıt sıkıştırma açık/kapalı            (1)
+  COMPRESS_MIN_SIZE    sıkıştırılacak en küçük gövde, bayt     (1024)
+  COMPRESS_LEVEL       gzip seviyesi (dinamik yanıtlar)        (6)
+  COMPRESS_BR_QUALITY  brotli kalitesi (dinamik yanıtlar)      (4)
+"""
+import gzip
+import hashlib
+import os
+from pathlib import Path
+
+from flask import Response, abort, redirect, request, url_for
+from werkzeug.utils import cached_property
+
+from database import env_flag, env_int
+
+try:
+    import brotli
+except ImportError:  # isteğe bağlı; yoksa yalnızca gzip
+    brotli = None
+
+STATIC_DIR = Path(__file__).resolve().parent / "static"
+DIST_DIR = STATIC_DIR / "dist"
+
+# paket adı -> static/ altındaki kaynaklar (sırayla birleştirilir)
+BUNDLES = {
+    "app.css": ["css/app.css"],
+    "login.css": ["css/login.css"],
+    # her parça kendi elemanı sayfada yoksa hiçbir şey yapmaz
+    "app.js": ["js/faculty-select.js", "js/notes.js", "js/dashboard-live.js",
+               "js/password-toggle.js"],
+}
+
+MIMETYPES = {
+    ".css": "text/css",
+    ".js": "text/javascript",
+}
+
+# Dinamik yanıtlarda sıkıştırılan içerik türleri
+COMPRESSIBLE_MIMETYPES = {"text/html", "application/json"}
+
+# Dosya uzantısı / tercih sırası
+ENCODINGS = {"br": ".br", "gzip": ".gz"}
+
+
+def available_encodings():
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def compress(data, encoding, level=None):
+    """level None: en yüksek seviye (build zamanı)."""
+    if encoding == "br":
+        return brotli.compress(data, quality=11 if level is None else level)
+    return gzip.compress(data, compresslevel=9 if level is None else level, mtime=0)
+
+
+def choose_encoding(accept_encodings, encodings=None):
+    """Accept-Encoding'de kabul edilen ilk kodlama (br > gzip) ya da None."""
+    for encoding in encodings or available_encodings():
+        if accept_encodings.quality(encoding) > 0:
+            return encoding
+    return None
+
+
+# -------------------------------
+# Paketler
+# -------------------------------
+class Bundle:
+    """Birleştirilmiş tek paket; sıkıştırılmış sürümleri ilk istekte doldurulur."""
+    __slots__ = ("name", "filename", "mimetype", "data", "digest", "_variants")
+
+    def __init__(self, name, data):
+        stem, ext = os.path.splitext(name)
+        self.name = name
+        self.data = data
+        self.digest = hashlib.sha256(data).hexdigest()[:10]
+        self.filename = f"{stem}.{self.digest}{ext}"
+        self.mimetype = MIMETYPES[ext]
+        self._variants = {}
+
+    def variant(self, encoding, dist_dir=DIST_DIR):
+        """Kodlanmış gövde: önce build çıktısı, yoksa bellekte sıkıştırılır."""
+        data = self._variants.get(encoding)
+        if data is None:
+            path = dist_dir / (self.filename + ENCODINGS[encoding])
+            data = path.read_bytes() if path.is_file() else compress(self.data, encoding)
+            self._variants[encoding] = data
+        return data
+
+
+class AssetRegistry:
+    """
+    BUNDLES'tan kurulan paketler; ada ve hash'li dosya adına göre. Dosyalar
+    ilk erişimde okunup hash'lenir.
+    """
+
+    def __init__(self, bundles=BUNDLES, static_dir=STATIC_DIR):
+        self.sources = bundles
+        self.static_dir = static_dir
+
+    @cached_property
+    def bundles(self):
+        return {
+            name: Bundle(name, b"\n".join((self.static_dir / src).read_bytes() for src in sources))
+            for name, sources in self.sources.items()
+        }
+
+    @cached_property
+    def by_filename(self):
+        return {b.filename: b for b in self.bundles.values()}
+
+    @cached_property
+    def version(self):
+        """Tüm paketlerin ortak sürümü (sayfa ETag'lerine girer)."""
+        return hashlib.sha256("".join(sorted(self.by_filename)).encode()).hexdigest()[:12]
+
+    def url(self, name):
+        return url_for("assets", filename=self.bundles[name].filename)
+
+    def build(self, dist_dir=DIST_DIR):
+        """Paketleri ve .gz / .br sürümlerini dist'e yazar; yazılan dosya adları."""
+        dist_dir.mkdir(parents=True, exist_ok=True)
+        written = []
+        for bundle in self.bundles.values():
+            files = {bundle.filename: bundle.data}
+            for encoding, suffix in ENCODINGS.items():
+                if encoding in available_encodings():
+                    files[bundle.filename + suffix] = compress(bundle.data, encoding)
+            for filename, data in files.items():
+                (dist_dir / filename).write_bytes(data)
+                written.append(filename)
+        return written
+
+
+bundles = AssetRegistry()
+
+
+def serve_asset(filename):
+    bundle = bundles.by_filename.get(filename)
+    if bundle is None:
+        stem, _, rest = filename.partition(".")
+        ext = os.path.splitext(rest)[1]
+        current = bundles.bundles.get(stem + ext)
+        if current is None:
+            abort(404)
+        # eski HTML'deki eski hash -> güncel paket
+        return redirect(url_for("assets", filename=current.filename))
+
+    encoding = choose_encoding(request.accept_encodings)
+    resp = Response(bundle.variant(encoding) if encoding else bundle.data,
+                    mimetype=bundle.mimetype)
+    resp.vary.add("Accept-Encoding")
+    if encoding:
+        resp.headers["Content-Encoding"] = encoding
+    # Güçlü ETag kodlamaya göre farklı olmalı
+    resp.set_etag(f"{bundle.digest}-{encoding}" if encoding else bundle.digest)
+    resp.cache_control.public = True
+    resp.cache_control.max_age = 31536000
+    resp.cache_control.immutable = True
+    return resp.make_conditional(request)
+
+
+# -------------------------------
+# Yanıt sıkıştırma
+# -------------------------------
+def compress_response(response, min_size=1024, gzip_level=6, br_quality=4):
+    """HTML / JSON gövdesini istemcinin kabul ettiği kodlamayla sıkıştırır."""
+    if response.mimetype not in COMPRESSIBLE_MIMETYPES:
+        return response
+    response.vary.add("Accept-Encoding")
+    if (response.status_code < 200 or response.status_code in (204, 206, 304)
+            or response.direct_passthrough or response.is_streamed
+            or "Content-Encoding" in response.headers):
+        return response
+    encoding = choose_encoding(request.accept_encodings)
+    if encoding is None:
+        return response
+    data = response.get_data()
+    if len(data) < min_size:
+        return response
+
+    response.set_data(compress(data, encoding, br_quality if encoding == "br" else gzip_level))
+    response.headers["Content-Encoding"] = encoding
+    # Sıkıştırılmış gövde bayt bayt aynı değil: güçlü ETag zayıflatılır
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def init_app(app):
+    """/assets/<dosya> route'u, asset_url() şablon fonksiyonu ve sıkıştırma."""
+    app.add_url_rule("/assets/<filename>", "assets", serve_asset)
+    app.add_template_global(bundles.url, "asset_url")
+
+    env = os.environ
+    if not env_flag(env, "COMPRESS", "1"):
+        return
+    options = {
+        "min_size": env_int(env, "COMPRESS_MIN_SIZE", 1024),
+        "gzip_level": env_int(env, "COMPRESS_LEVEL", 6),
+        "br_quality": env_int(env, "COMPRESS_BR_QUALITY", 4),
+    }
+
+    @app.after_request
+    def _compress(response):
+        return compress_response(response, **options)
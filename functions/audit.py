@@ -0,0 +1,285 @@
+"""
+Öğrenci / not değişiklik geçmişi (audit_events), write-behind.
+
+Değişiklikler ORM session hook'larıyla toplanır (flush sırasında eski / yeni
+değerler bellekte okunur), transaction commit edilince yazıcıya gider;
+rollback'te atılır. Yazıcı (AUDIT_MODE):
+  thread  istek yolunda veritabanına ek yazım yoktur. Arka plan thread'i
+          kuyruğu AUDIT_BATCH_SIZE olaya ya da AUDIT_FLUSH_MS süreye ulaşınca
+          tek bir çok-satırlı INSERT ile yazar; process kapanırken (atexit)
+          kuyruk boşaltılır.
+  sync    commit'in olayları after_commit'te, yanıt dönmeden tek INSERT'le
+          yazılır. Cloud Functions / Cloud Run'da varsayılan budur: orada CPU
+          istek dışında kısılır (thread kuyruğu boşaltamaz) ve instance
+          SIGTERM ile kapanır (atexit çalışmaz); kuyruktaki olaylar kaybolurdu.
+
+Core INSERT kullanan yollar (importer) olaylarını stage() ile aynı
+transaction'a ekler. Commit edilen olaylar changes_committed sinyaliyle de
+yayınlanır (bkz. live.py).
+
+Ayarlar (ortam):
+  AUDIT               geçmiş kaydı açık/kapalı            (1)
+  AUDIT_MODE          thread / sync          (yerelde thread, bulutta sync)
+  AUDIT_BATCH_SIZE    tek INSERT'teki en fazla olay       (200)
+  AUDIT_FLUSH_MS      kuyrukta en fazla bekleme, ms       (1000)
+  AUDIT_QUEUE_MAX     kuyruk sınırı; doluysa olay düşer   (50000)
+
+thread modunda geçmiş okunurken son AUDIT_FLUSH_MS içindeki olaylar henüz
+yazılmamış olabilir.
+"""
+import atexit
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+
+from blinker import Namespace
+from flask import current_app, has_request_context
+from flask_login import current_user
+from sqlalchemy import event, insert, inspect as sa_inspect
+from sqlalchemy.orm import Session
+
+from database import env_flag, env_int, serverless
+from models import db, AuditEvent, Student, StudentNote
+
+# Geçmişte izlenen öğrenci alanları (sayaç / sürüm kolonları hariç)
+STUDENT_FIELDS = (
+    "name", "phone", "school_no", "added_by", "status",
+    "department", "faculty", "problem",
+)
+NOTE_FIELDS = ("text", "author")
+
+_signals = Namespace()
+# Commit edilen olaylar: send(app, events=[...], version=students sürümü).
+# Canlı dashboard akışı (live.py) dinler.
+changes_committed = _signals.signal("changes-committed")
+
+
+# -------------------------------
+# Olay toplama (session hook'ları)
+# -------------------------------
+def _actor():
+    if has_request_context() and current_user.is_authenticated:
+        return current_user.username
+    return None
+
+
+def audit_event(action, entity, entity_id, student_id, changes, actor=None):
+    return {
+        "at": datetime.utcnow(), "actor": actor or _actor(), "action": action, "entity": entity,
+        "entity_id": entity_id, "student_id": student_id, "changes": changes,
+    }
+
+
+def _snapshot(obj, fields):
+    return {f: getattr(obj, f) for f in fields if getattr(obj, f) is not None}
+
+
+def _student_changes(obj):
+    """{alan: [eski, yeni]}; yalnızca bu flush'ta değişen izlenen alanlar."""
+    attrs = sa_inspect(obj).attrs
+    changes = {}
+    for field in STUDENT_FIELDS:
+        history = attrs[field].history
+        if not history.added:
+            continue
+        old = history.deleted[0] if history.deleted else None
+        new = history.added[0]
+        if old != new:
+            changes[field] = [old, new]
+    return changes
+
+
+def stage(session, events):
+    """Olayları session'ın transaction'ına ekler; commit'te kuyruğa gider."""
+    session.info.setdefault("audit_events", []).extend(events)
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_changes(session, flush_context, instances):
+    # Eski değerler ve silinen satırlar flush'tan önce okunur
+    events = []
+    for obj in session.dirty:
+        if isinstance(obj, Student) and obj not in session.deleted:
+            changes = _student_changes(obj)
+            if changes:
+                events.append(audit_event("update", "student", obj.id, obj.id, changes))
+    for obj in session.deleted:
+        if isinstance(obj, Student):
+            events.append(audit_event("delete", "student", obj.id, obj.id,
+                                       dict(_snapshot(obj, STUDENT_FIELDS), note_count=obj.note_count)))
+        elif isinstance(obj, StudentNote):
+            events.append(audit_event("delete", "note", obj.id, obj.student_id,
+                                       _snapshot(obj, NOTE_FIELDS)))
+    if events:
+        stage(session, events)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_inserts(session, flush_context):
+    # Yeni satırların id'si ancak flush'tan sonra belli
+    events = []
+    for obj in session.new:
+        if isinstance(obj, Student):
+            events.append(audit_event("create", "student", obj.id, obj.id,
+                                       _snapshot(obj, STUDENT_FIELDS)))
+        elif isinstance(obj, StudentNote):
+            events.append(audit_event("create", "note", obj.id, obj.student_id,
+                                       _snapshot(obj, NOTE_FIELDS)))
+    if events:
+        stage(session, events)
+
+
+@event.listens_for(Session, "after_commit")
+def _enqueue_committed(session):
+    events = session.info.pop("audit_events", None)
+    version = session.info.pop("students_version", None)
+    if not events:
+        return
+    writer = current_app.extensions.get("audit")
+    if writer is not None:
+        writer.enqueue(events)
+    changes_committed.send(current_app._get_current_object(), events=events, version=version)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back(session):
+    session.info.pop("audit_events", None)
+    session.info.pop("students_version", None)
+
+
+# -------------------------------
+# Arka plan yazıcısı
+# -------------------------------
+class AuditWriter:
+    """
+    Olay kuyruğunu toplu INSERT'lerle boşaltan daemon thread. Thread ilk
+    enqueue'da (ve fork'tan sonra yeni process'te) başlatılır. synchronous
+    ise thread / kuyruk yok: enqueue olayları hemen yazar.
+    """
+
+    def __init__(self, app, batch_size=200, flush_interval=1.0, max_queue=50000,
+                 synchronous=False):
+        self.app = app
+        self.synchronous = synchronous
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.written = 0
+        self.dropped = 0
+        self.failed_batches = 0
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self._closed = False
+
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive() or self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+                self._thread.start()
+
+    def enqueue(self, events):
+        if self._closed or self.synchronous:
+            self._write(events)
+            return
+        self._ensure_thread()
+        for e in events:
+            try:
+                self.queue.put_nowait(e)
+            except queue.Full:
+                self.dropped += 1
+
+    def flush(self, timeout=10.0):
+        """Kuyruktaki (bu çağrıdan önce eklenmiş) olaylar yazılana kadar bekler."""
+        if self._thread is None or not self._thread.is_alive():
+            return True
+        done = threading.Event()
+        self.queue.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout=10.0):
+        """Kuyruğu boşaltır (atexit); sonrasındaki olaylar doğrudan yazılır."""
+        if self._closed:
+            return
+        self.flush(timeout)
+        self._closed = True
+
+    def stats(self):
+        return {"queued": self.queue.qsize(), "written": self.written,
+                "dropped": self.dropped, "failed_batches": self.failed_batches}
+
+    def _run(self):
+        while True:
+            batch, markers = [], []
+            item = self.queue.get()
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if isinstance(item, threading.Event):
+                    markers.append(item)
+                    break  # flush() isteği: beklemeden yaz
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self.queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+            if batch:
+                self._write(batch)
+            for marker in markers:
+                marker.set()
+
+    def _write(self, batch):
+        try:
+            with self.app.app_context(), db.engine.begin() as connection:
+                connection.execute(insert(AuditEvent.__table__), batch)
+            self.written += len(batch)
+        except Exception as e:
+            # Geçmiş yazılamadı diye istekler etkilenmez; kayıp sayaçta görünür
+            self.failed_batches += 1
+            self.dropped += len(batch)
+            print("AUDIT WRITE ERROR:", e)
+
+
+def audit_mode(env=None):
+    """AUDIT_MODE; verilmemişse bulutta (Cloud Functions / Cloud Run) sync, yerelde thread."""
+    env = os.environ if env is None else env
+    return env.get("AUDIT_MODE") or ("sync" if serverless(env) else "thread")
+
+
+def init_app(app):
+    """Yazıcıyı app.extensions["audit"]'a koyar ve kapanışta boşaltılmasını sağlar."""
+    env = os.environ
+    if not env_flag(env, "AUDIT", "1"):
+        return
+    writer = AuditWriter(
+        app,
+        batch_size=max(1, env_int(env, "AUDIT_BATCH_SIZE", 200)),
+        flush_interval=env_int(env, "AUDIT_FLUSH_MS", 1000) / 1000,
+        max_queue=env_int(env, "AUDIT_QUEUE_MAX", 50000),
+        synchronous=audit_mode(env) == "sync",
+    )
+    app.extensions["audit"] = writer
+    if not writer.synchronous:
+        atexit.register(writer.close)
+
+
+# -------------------------------
+# Sorgu
+# -------------------------------
+def student_history(student_id, before_id=None, per_page=50):
+    """Öğrencinin olayları, yeniden eskiye; (olaylar, sonraki before_id) döner."""
+    query = db.session.query(AuditEvent).filter(AuditEvent.student_id == student_id)
+    if before_id:
+        query = query.filter(AuditEvent.id < before_id)
+    events = query.order_by(AuditEvent.id.desc()).limit(per_page + 1).all()
+    next_before_id = events[per_page - 1].id if len(events) > per_page else None
+    return events[:per_page], next_before_id
@@ -0,0 +1,153 @@
+"""
+Oturum (Flask-Login) ayarları, her istekte çağrılan user_loader, şifre
+doğrulama ve giriş denemesi sınırı.
+
+Ayarlar (ortam):
+  PASSWORD_HASH_METHOD   yeni hash'lerin yöntemi; eskiler girişte
+                         yeniden hash'lenir                    (scrypt:32768:8:1)
+  LOGIN_RATE_LIMIT       IP başına giriş denemesi              (10/minute;50/hour)
+  LOGIN_USER_RATE_LIMIT  kullanıcı adı başına hatalı giriş     (20/hour)
+  RATELIMIT_STORAGE_URI  sayaçların tutulduğu yer; instance'lar arasında
+                         paylaşmak için redis://host:6379 (redis paketi
+                         gerekir)                              (memory://)
+"""
+import os
+from functools import lru_cache
+
+from flask import g, request
+from flask_limiter import Limiter
+from flask_limiter.util import get_remote_address
+from flask_login import LoginManager, UserMixin
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from werkzeug.security import generate_password_hash, check_password_hash
+
+from caching import TTLCache
+from models import db, User
+
+login_manager = LoginManager()
+login_manager.login_view = "web.login"
+login_manager.session_protection = None  # 🔥 paranoid korumayı kapat
+
+
+class SessionUser(UserMixin):
+    """
+    load_user'ın döndürdüğü hafif kimlik. ORM session'ına bağlı olmadığı için
+    istekler arasında önbellekte tutulabilir; şifre hash'i taşımaz.
+    """
+    def __init__(self, id, username):
+        self.id = id
+        self.username = username
+
+    def __repr__(self):
+        return f"<SessionUser {self.id} {self.username}>"
+
+
+# Her istekte yapılan users sorgusu yerine: id -> SessionUser
+user_cache = TTLCache(
+    maxsize=int(os.getenv("USER_CACHE_SIZE", "1024")),
+    ttl=float(os.getenv("USER_CACHE_TTL", "300")),
+)
+
+
+# Flush anında silmek yetmez: commit'e kadar başka bir istek eski satırı yeniden
+# önbelleğe alabilir ya da yazım geri alınabilir. id'ler flush'ta toplanır,
+# önbellekten commit'ten sonra düşülür.
+@event.listens_for(Session, "after_flush")
+def _collect_changed_users(session, flush_context):
+    ids = {obj.id for obj in session.new | session.dirty | session.deleted
+           if isinstance(obj, User) and obj.id is not None}
+    if ids:
+        session.info.setdefault("changed_user_ids", set()).update(ids)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_cached_users(session):
+    for uid in session.info.pop("changed_user_ids", ()):
+        user_cache.invalidate(uid)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_users(session):
+    session.info.pop("changed_user_ids", None)
+
+
+@login_manager.user_loader
+def load_user(user_id):
+    try:
+        uid = int(user_id)
+        user = user_cache.get(uid)
+        if user is None:
+            row = db.session.query(User.id, User.username).filter(User.id == uid).first()
+            if row is None:
+                return None  # bulunamayanı önbelleğe alma; kullanıcı sonradan eklenebilir
+            user = SessionUser(row.id, row.username)
+            user_cache.set(uid, user)
+        return user
+    except Exception as e:
+        print("USER LOADER ERROR:", e)
+        return None
+
+
+# -------------------------------
+# ŞİFRE DOĞRULAMA
+# -------------------------------
+# Giriş başına CPU maliyeti bu yöntemle belirlenir (scrypt:32768:8:1 ~ 100 ms)
+PASSWORD_HASH_METHOD = os.getenv("PASSWORD_HASH_METHOD", "scrypt:32768:8:1")
+
+
+def hash_password(password):
+    return generate_password_hash(password, method=PASSWORD_HASH_METHOD)
+
+
+def needs_rehash(pwhash):
+    """Hash güncel yöntem / parametrelerle üretilmemişse True ("yöntem$tuz$hash")."""
+    return pwhash.split("$", 1)[0] != PASSWORD_HASH_METHOD
+
+
+@lru_cache(maxsize=1)
+def _dummy_hash():
+    # Bilinmeyen kullanıcıda da aynı maliyette doğrulama yapılsın diye
+    return hash_password(os.urandom(16).hex())
+
+
+def authenticate(username, password):
+    """
+    Kullanıcı adı / şifre doğruysa User, değilse None. Kullanıcı bulunamasa
+    da bir hash doğrulanır; yanıt süresi kullanıcının varlığını ele vermez.
+    Eski yöntemle hash'lenmiş şifre doğrulanınca güncel yöntemle yeniden yazılır.
+    """
+    user = User.query.filter_by(username=username).first()
+    if user is None:
+        check_password_hash(_dummy_hash(), password)
+        return None
+    if not check_password_hash(user.password, password):
+        return None
+    if needs_rehash(user.password):
+        user.password = hash_password(password)
+        db.session.commit()
+    return user
+
+
+# -------------------------------
+# GİRİŞ DENEMESİ SINIRI (Flask-Limiter)
+# -------------------------------
+LOGIN_RATE_LIMIT = os.getenv("LOGIN_RATE_LIMIT", "10/minute;50/hour")
+LOGIN_USER_RATE_LIMIT = os.getenv("LOGIN_USER_RATE_LIMIT", "20/hour")
+
+# Depolama ve başlıklar app.config'teki RATELIMIT_* ayarlarından (bkz. app.py).
+# Anahtar remote_addr: ProxyFix (x_for=1) onu X-Forwarded-For'daki güvenilen son
+# hop'tan alır. ProxyFix wsgi_app'in parçasıdır; bu yüzden main.serving isteği
+# full_dispatch_request ile değil wsgi_app üzerinden çalıştırır. Aksi hâlde
+# remote_addr Hosting / Functions proxy'si olur ve tüm personel tek sayacı
+# paylaşır.
+limiter = Limiter(get_remote_address)
+
+
+def login_username_key():
+    return "login-user:" + (request.form.get("username") or "").strip().lower()
+
+
+def login_failed(response):
+    """Kullanıcı adı sınırına yalnızca hatalı denemeler sayılır."""
+    return g.get("login_failed", False)
@@ -0,0 +1,392 @@
+"""
+Route benchmark'ı: tohumlanmış veritabanında dashboard filtreleri,
+view_student, add_note ve main_screen'in gecikmesini ölçer.
+
+    python benchmarks/routes.py                                  # 1k öğrenci, geçici SQLite
+    python benchmarks/routes.py --students 100000 --db /tmp/bench-100k.db
+    python benchmarks/routes.py --database-url postgresql://localhost/bench --students 100000
+    python benchmarks/routes.py --concurrency 8 --requests 400
+    python benchmarks/routes.py --json out.json --baseline routes-baseline.json
+
+Veri: --students öğrenci (FACULTY_DEPARTMENTS'e sırayla dağıtılır) ve
+öğrenci başına --notes not. Hedef veritabanında zaten o kadar öğrenci varsa
+tohumlama atlanır; büyük hacimler için --db ile dosya tekrar kullanılabilir.
+Tohumlama ayrı bir process'te yapılır, böylece tepe RSS yalnızca ölçümü gösterir.
+
+İki çalıştırma modu:
+  - varsayılan: Flask test client, tek thread (WSGI yığını, ağ yok)
+  - --concurrency N: werkzeug'un threaded sunucusu + N istemci thread'i
+
+İstek başına SQL ifadesi sayısı Server-Timing başlığından okunur (metrics.py).
+--baseline verilirse senaryo başına p95 `tolerance` oranından fazla artmışsa,
+SQL sayısı artmışsa ya da tepe RSS oranı aşmışsa çıkış kodu 1 olur.
+"""
+import argparse
+import http.client
+import json
+import logging
+import os
+import random
+import re
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from urllib.parse import urlencode
+
+FUNCTIONS_DIR = Path(__file__).resolve().parent.parent
+
+SEED_CHUNK = 5000
+STAFF = ("admin", "ayse", "mehmet", "zeynep", "can")
+ADMIN_PASSWORD = "Admin123!"
+
+_QUERIES = re.compile(r'desc="(\d+) queries"')
+
+
+# -------------------------------
+# Tohumlama (alt process'te)
+# -------------------------------
+def seed(students, notes_per_student, rng_seed=1):
+    """Eksik öğrencileri (ve notlarını) toplu INSERT'lerle ekler."""
+    from sqlalchemy import func, insert, text
+
+    import maintenance
+    import search
+    from faculties import FACULTY_DEPARTMENTS
+    from models import (
+        db, Student, StudentNote, STUDENTS_SCOPE, recount_student_stats, bump_data_version,
+        faculty_index,
+    )
+
+    maintenance.upgrade_database()
+    maintenance.ensure_admin()
+    existing = db.session.query(func.count(Student.id)).scalar()
+    if existing >= students:
+        return existing
+
+    pairs = [(f, d) for f, deps in FACULTY_DEPARTMENTS.items() for d in deps]
+    index = faculty_index()
+    rng = random.Random(rng_seed)
+    first_id = (db.session.query(func.max(Student.id)).scalar() or 0) + 1
+    first_note_id = (db.session.query(func.max(StudentNote.id)).scalar() or 0) + 1
+    base = datetime(2025, 1, 1)
+
+    note_id = first_note_id
+    for start in range(existing, students, SEED_CHUNK):
+        student_rows, note_rows = [], []
+        for i in range(start, min(start + SEED_CHUNK, students)):
+            sid = first_id + i - existing
+            faculty, department = pairs[i % len(pairs)]
+            name, phone, school_no = f"Öğrenci {i}", f"05{i:09d}", f"{i:09d}"
+            created = base + timedelta(seconds=i * 30)
+            note_times = [created + timedelta(hours=h + 1) for h in range(notes_per_student)]
+            student_rows.append({
+                "id": sid, "name": name, "phone": phone, "school_no": school_no,
+                "added_by": STAFF[i % len(STAFF)],
+                "status": "cozuldu" if rng.random() < 0.3 else "cozulmedi",
+                "faculty": faculty, "department": department,
+                "faculty_id": index.faculty_ids[faculty],
+                "department_id": index.department_ids[(faculty, department)],
+                "problem": f"Sorun {i}", "created_at": created,
+                "search_key": search.build_search_key(name, phone, school_no),
+                "note_count": notes_per_student,
+                "last_note_at": note_times[-1] if note_times else None,
+            })
+            for at in note_times:
+                note_rows.append({"id": note_id, "student_id": sid, "text": f"Not {note_id}",
+                                  "author": STAFF[note_id % len(STAFF)], "created_at": at})
+                note_id += 1
+        db.session.execute(insert(Student.__table__), student_rows)
+        if note_rows:
+            db.session.execute(insert(StudentNote.__table__), note_rows)
+        db.session.commit()
+
+    if db.engine.dialect.name == "postgresql":
+        # id'ler elle verildi; serial dizileri ileri alınır
+        for table in ("student", "student_note"):
+            db.session.execute(text(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                f"(SELECT max(id) FROM {table}))"
+            ))
+    bump_data_version(db.session.connection(), STUDENTS_SCOPE)
+    recount_student_stats()  # commit eder
+    return students
+
+
+# -------------------------------
+# Senaryolar
+# -------------------------------
+def scenarios(max_id, faculty, department):
+    """{ad: rng -> (method, path, form)}"""
+    def get(path, **args):
+        return lambda rng: ("GET", f"{path}?{urlencode(args)}" if args else path, None)
+
+    return {
+        "dashboard": get("/dashboard"),
+        "dashboard status": get("/dashboard", status="cozulmedi"),
+        "dashboard faculty": get("/dashboard", faculty=faculty),
+        "dashboard faculty+department": get("/dashboard", faculty=faculty, department=department),
+        "dashboard added_by+status": get("/dashboard", added_by="ayse", status="cozuldu"),
+        "dashboard q name": get("/dashboard", q=f"Öğrenci {max_id // 2}"),
+        "dashboard q phone": get("/dashboard", q=f"05{max_id // 3:09d}"),
+        "dashboard sort=active": get("/dashboard", sort="active"),
+        "dashboard page (before_id)": get("/dashboard", before_id=max_id // 2),
+        "view_student": lambda rng: ("GET", f"/student/{rng.randint(1, max_id)}", None),
+        "add_note": lambda rng: ("POST", f"/student/{rng.randint(1, max_id)}/note",
+                                 {"note": f"benchmark {rng.random():.6f}"}),
+        "main_screen": get("/main"),
+    }
+
+
+def _percentile(ordered, p):
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+
+def _summary(latencies, queries):
+    ordered = sorted(latencies)
+    return {
+        "n": len(ordered),
+        "p50": round(_percentile(ordered, 50), 2),
+        "p95": round(_percentile(ordered, 95), 2),
+        "p99": round(_percentile(ordered, 99), 2),
+        "max": round(ordered[-1], 2),
+        "queries": round(statistics.mean(queries), 2) if queries else None,
+    }
+
+
+def _queries(server_timing):
+    m = _QUERIES.search(server_timing or "")
+    return int(m.group(1)) if m else None
+
+
+class TestClientRunner:
+    """Tek thread; Flask test client."""
+
+    def __init__(self, app):
+        self.client = app.test_client()
+        resp = self.client.post("/", data={"username": "admin", "password": ADMIN_PASSWORD})
+        if resp.status_code != 302 or "dashboard" not in (resp.location or ""):
+            raise SystemExit("benchmark: admin girişi başarısız")
+
+    def run(self, make_request, count, rng):
+        latencies, queries = [], []
+        for _ in range(count):
+            method, path, form = make_request(rng)
+            t = time.perf_counter()
+            resp = self.client.open(path, method=method, data=form)
+            resp.get_data()
+            latencies.append((time.perf_counter() - t) * 1000)
+            if resp.status_code >= 400:
+                raise SystemExit(f"{method} {path}: HTTP {resp.status_code}")
+            q = _queries(resp.headers.get("Server-Timing"))
+            if q is not None:
+                queries.append(q)
+        return latencies, queries
+
+    def close(self):
+        pass
+
+
+class HttpRunner:
+    """werkzeug threaded sunucusu + N istemci thread'i (gerçek soket, eşzamanlı istek)."""
+
+    def __init__(self, app, concurrency):
+        from werkzeug.serving import make_server
+        logging.getLogger("werkzeug").setLevel(logging.WARNING)  # istek başına log satırı
+        self.concurrency = concurrency
+        self.server = make_server("127.0.0.1", 0, app, threaded=True)
+        self.port = self.server.server_port
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        status, headers, _ = self._request("POST", "/", {"username": "admin",
+                                                         "password": ADMIN_PASSWORD})
+        self.cookie = headers.get("Set-Cookie", "").split(";", 1)[0]
+        if status != 302 or not self.cookie:
+            raise SystemExit("benchmark: admin girişi başarısız")
+
+    def _request(self, method, path, form, cookie=None):
+        conn = http.client.HTTPConnection("127.0.0.1", self.port, timeout=60)
+        try:
+            headers = {"Cookie": cookie} if cookie else {}
+            body = None
+            if form is not None:
+                body = urlencode(form)
+                headers["Content-Type"] = "application/x-www-form-urlencoded"
+            conn.request(method, path, body=body, headers=headers)
+            resp = conn.getresponse()
+            resp.read()
+            return resp.status, resp.headers, None
+        finally:
+            conn.close()
+
+    def run(self, make_request, count, rng):
+        # İstekler önceden üretilir; rng thread'ler arasında paylaşılmaz
+        planned = [make_request(rng) for _ in range(count)]
+        latencies, queries, errors = [], [], []
+        lock = threading.Lock()
+
+        def one(request):
+            method, path, form = request
+            t = time.perf_counter()
+            status, headers, _ = self._request(method, path, form, self.cookie)
+            elapsed = (time.perf_counter() - t) * 1000
+            with lock:
+                latencies.append(elapsed)
+                if status >= 400:
+                    errors.append(f"{method} {path}: HTTP {status}")
+                q = _queries(headers.get("Server-Timing"))
+                if q is not None:
+                    queries.append(q)
+
+        with ThreadPoolExecutor(self.concurrency) as pool:
+            list(pool.map(one, planned))
+        if errors:
+            raise SystemExit(errors[0])
+        return latencies, queries
+
+    def close(self):
+        self.server.shutdown()
+
+
+def _peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux'ta KB, macOS'ta bayt
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def measure(args):
+    import app as app_module
+    from faculties import FACULTY_DEPARTMENTS
+    from models import db, Student
+    from sqlalchemy import func
+
+    app = app_module.app
+    with app.app_context():
+        max_id = db.session.query(func.max(Student.id)).scalar() or 1
+    faculty = next(iter(FACULTY_DEPARTMENTS))
+    department = FACULTY_DEPARTMENTS[faculty][0]
+
+    if args.concurrency > 1:
+        runner = HttpRunner(app, args.concurrency)
+    else:
+        runner = TestClientRunner(app)
+    results = {}
+    wall = {}
+    try:
+        for name, make_request in scenarios(max_id, faculty, department).items():
+            if args.only and not any(o in name for o in args.only):
+                continue
+            rng = random.Random(name)
+            runner.run(make_request, args.warmup, rng)
+            t = time.perf_counter()
+            latencies, queries = runner.run(make_request, args.requests, rng)
+            wall[name] = time.perf_counter() - t
+            results[name] = _summary(latencies, queries)
+            results[name]["rps"] = round(args.requests / wall[name], 1)
+    finally:
+        runner.close()
+    return {
+        "scenarios": results,
+        "peak_rss_mb": _peak_rss_mb(),
+        "meta": {"students": args.students, "notes": args.notes,
+                 "concurrency": args.concurrency, "requests": args.requests,
+                 "dialect": args.database_url.split(":", 1)[0]},
+    }
+
+
+def compare(results, baseline, tolerance):
+    """[(ölçüm, önceki, şimdiki)]: p95 / tepe RSS oranı aşmış ya da SQL sayısı artmış."""
+    regressions = []
+    base_scenarios = baseline.get("scenarios", {})
+    for name, stats in results["scenarios"].items():
+        base = base_scenarios.get(name)
+        if not base:
+            continue
+        if stats["p95"] > base["p95"] * (1 + tolerance):
+            regressions.append((f"{name} p95 ms", base["p95"], stats["p95"]))
+        if base.get("queries") is not None and (stats["queries"] or 0) > base["queries"]:
+            regressions.append((f"{name} queries", base["queries"], stats["queries"]))
+    base_rss = baseline.get("peak_rss_mb")
+    if base_rss and results["peak_rss_mb"] > base_rss * (1 + tolerance):
+        regressions.append(("peak_rss_mb", base_rss, results["peak_rss_mb"]))
+    return regressions
+
+
+def _print(results):
+    rows = results["scenarios"]
+    width = max(len(k) for k in rows)
+    print(f"{'senaryo':{width}s}      n     p50     p95     p99     max  sql/istek   istek/sn")
+    for name, s in rows.items():
+        queries = "-" if s["queries"] is None else f"{s['queries']:.1f}"
+        print(f"{name:{width}s} {s['n']:6d} {s['p50']:7.1f} {s['p95']:7.1f} {s['p99']:7.1f} "
+              f"{s['max']:7.1f} {queries:>10s} {s['rps']:10.1f}")
+    print(f"tepe RSS: {results['peak_rss_mb']} MB")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--students", type=int, default=1000)
+    parser.add_argument("--notes", type=int, default=10, help="öğrenci başına not")
+    parser.add_argument("--db", help="SQLite dosyası (yoksa oluşturulur, varsa tekrar kullanılır)")
+    parser.add_argument("--database-url", help="örn. postgresql://localhost/bench")
+    parser.add_argument("--requests", type=int, default=200, help="senaryo başına istek")
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=1,
+                        help="1: test client; >1: HTTP sunucusu + bu kadar istemci thread'i")
+    parser.add_argument("--only", action="append", help="adında bu metin geçen senaryolar")
+    parser.add_argument("--json", dest="json_path", help="sonuçları bu dosyaya yaz")
+    parser.add_argument("--baseline", help="karşılaştırılacak önceki --json çıktısı")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--seed-only", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="routes-bench-")
+    args.database_url = args.database_url or f"sqlite:///{args.db or workdir + '/bench.db'}"
+    os.environ.update(
+        DATABASE_URL=args.database_url,
+        TEMPLATE_CACHE_DIR=os.environ.get("TEMPLATE_CACHE_DIR", f"{workdir}/jinja"),
+        METRICS="1", SERVER_TIMING="1",
+    )
+    sys.path.insert(0, str(FUNCTIONS_DIR))
+
+    if args.seed_only:
+        import app as app_module
+        with app_module.app.app_context():
+            print(seed(args.students, args.notes))
+        return 0
+
+    t = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, __file__, "--seed-only", "--students", str(args.students),
+         "--notes", str(args.notes), "--database-url", args.database_url],
+        cwd=FUNCTIONS_DIR, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        sys.exit(proc.stderr.strip() or proc.stdout.strip())
+    print(f"veri hazır: {proc.stdout.strip().splitlines()[-1]} öğrenci "
+          f"({time.perf_counter() - t:.1f} sn)")
+
+    results = measure(args)
+    _print(results)
+
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(results, indent=2, ensure_ascii=False))
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        regressions = compare(results, baseline, args.tolerance)
+        for key, before, after in regressions:
+            print(f"REGRESYON {key}: {before} -> {after}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
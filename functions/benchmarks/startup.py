@@ -0,0 +1,135 @@
+"""
+Soğuk başlangıç ölçümü: her tur yeni bir Python process'i açar, `import app`
+süresini ve ardından her yolun ilk isteğinin süresini ölçer.
+
+    python benchmarks/startup.py                      # 10 tur, geçici SQLite
+    python benchmarks/startup.py --runs 20 --json out.json
+    python benchmarks/startup.py --baseline startup-baseline.json --tolerance 0.25
+
+--baseline verilirse medyanlar karşılaştırılır; izin verilen oranın üzerinde
+yavaşlayan ölçüm varsa çıkış kodu 1 olur (CI'da regresyon yakalamak için).
+Varsayılan yollar: /health (yalnızca Flask), / (şablon render), /dashboard
+(oturum + ilk sorgu, engine burada oluşturulur).
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+FUNCTIONS_DIR = Path(__file__).resolve().parent.parent
+
+DEFAULT_PATHS = ("/health", "/", "/dashboard")
+
+# Alt process'te çalışan ölçüm; sonucu stdout'a JSON olarak yazar
+_CHILD = r"""
+import json, sys, time
+t0 = time.perf_counter()
+import app as app_module
+result = {"import_ms": (time.perf_counter() - t0) * 1000}
+client = app_module.app.test_client()
+with client.session_transaction() as s:
+    s["_user_id"] = "1"
+for path in sys.argv[1:]:
+    t = time.perf_counter()
+    resp = client.get(path)
+    result[f"first {path}"] = (time.perf_counter() - t) * 1000
+    if resp.status_code >= 400:
+        raise SystemExit(f"{path}: HTTP {resp.status_code}")
+result["total_ms"] = (time.perf_counter() - t0) * 1000
+print(json.dumps(result))
+"""
+
+_SETUP = r"""
+import app as app_module, maintenance
+with app_module.app.app_context():
+    maintenance.upgrade_database()
+    maintenance.ensure_admin()
+"""
+
+
+def _run(code, env, args=()):
+    proc = subprocess.run(
+        [sys.executable, "-c", code, *args], cwd=FUNCTIONS_DIR, env=env,
+        capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        sys.exit(proc.stderr.strip() or proc.stdout.strip())
+    return proc.stdout
+
+
+def _summary(samples):
+    ordered = sorted(samples)
+    return {
+        "median": round(statistics.median(ordered), 1),
+        "min": round(ordered[0], 1),
+        "max": round(ordered[-1], 1),
+    }
+
+
+def measure(runs, paths, env):
+    samples = {}
+    for _ in range(runs):
+        line = _run(_CHILD, env, paths).strip().splitlines()[-1]
+        for key, value in json.loads(line).items():
+            samples.setdefault(key, []).append(value)
+    return {key: _summary(values) for key, values in samples.items()}
+
+
+def compare(results, baseline, tolerance):
+    """Baseline medyanından `tolerance` oranından fazla yavaşlayan ölçümler."""
+    regressions = []
+    for key, stats in results.items():
+        base = baseline.get(key)
+        if base and stats["median"] > base["median"] * (1 + tolerance):
+            regressions.append((key, base["median"], stats["median"]))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--path", action="append", dest="paths",
+                        help="ölçülecek yol (birden çok verilebilir)")
+    parser.add_argument("--database-url", help="varsayılan: geçici SQLite dosyası")
+    parser.add_argument("--no-template-cache", action="store_true",
+                        help="Jinja bytecode önbelleğini kapat")
+    parser.add_argument("--json", dest="json_path", help="sonuçları bu dosyaya yaz")
+    parser.add_argument("--baseline", help="karşılaştırılacak önceki --json çıktısı")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="startup-bench-")
+    env = dict(os.environ)
+    env["DATABASE_URL"] = args.database_url or f"sqlite:///{workdir}/bench.db"
+    env["TEMPLATE_CACHE_DIR"] = "" if args.no_template_cache else f"{workdir}/jinja"
+
+    _run(_SETUP, env)
+    # Bir ısınma turu: .pyc ve şablon önbelleği dolsun (deploy sonrası durum)
+    paths = args.paths or list(DEFAULT_PATHS)
+    _run(_CHILD, env, paths)
+    results = measure(args.runs, paths, env)
+
+    width = max(len(k) for k in results)
+    print(f"{'ölçüm (ms)':{width}s}   medyan      min      max")
+    for key, stats in results.items():
+        print(f"{key:{width}s} {stats['median']:8.1f} {stats['min']:8.1f} {stats['max']:8.1f}")
+
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(results, indent=2))
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        regressions = compare(results, baseline, args.tolerance)
+        for key, before, after in regressions:
+            print(f"REGRESYON {key}: {before:.1f} -> {after:.1f} ms")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
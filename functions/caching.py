@@ -0,0 +1,180 @@
+"""
+Küçük önbellek yardımcıları.
+
+TTLCache process içidir: her gunicorn worker'ı / Cloud Run instance'ı kendi
+kopyasını tutar; bir instance'taki invalidation diğerlerine ulaşmaz, bayatlık
+en fazla TTL kadardır. FragmentCache damgalı kayıt tutar (damga tutmazsa kayıt
+yok sayılır), bu yüzden paylaşılan bir backend'le (Redis) de kullanılabilir.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """Thread-safe LRU + TTL önbellek. hits / misses sayaçlarını tutar."""
+
+    def __init__(self, maxsize=1024, ttl=300.0, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None:
+                expires_at, value = item
+                if expires_at > self._clock():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (self._clock() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+# -------------------------------
+# Fragment önbelleği
+# -------------------------------
+class LocalBackend:
+    """Process içi backend (LRU + TTL)."""
+
+    def __init__(self, maxsize=5000, ttl=3600.0):
+        self.cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def get_many(self, keys):
+        return [self.cache.get(k) for k in keys]
+
+    def set_many(self, mapping):
+        for key, value in mapping.items():
+            self.cache.set(key, value)
+
+    def delete(self, key):
+        self.cache.invalidate(key)
+
+    def clear(self):
+        self.cache.clear()
+
+    def stats(self):
+        return self.cache.stats()
+
+
+class RedisBackend:
+    """Instance'lar arasında paylaşılan backend; `redis` paketi gerekir."""
+
+    def __init__(self, url, ttl=3600, prefix="frag:"):
+        import redis
+        self.client = redis.Redis.from_url(url)
+        self.ttl = int(ttl)
+        self.prefix = prefix
+
+    def get_many(self, keys):
+        if not keys:
+            return []
+        values = self.client.mget([f"{self.prefix}{k}" for k in keys])
+        return [v.decode("utf-8") if v is not None else None for v in values]
+
+    def set_many(self, mapping):
+        pipe = self.client.pipeline(transaction=False)
+        for key, value in mapping.items():
+            pipe.set(f"{self.prefix}{key}", value, ex=self.ttl)
+        pipe.execute()
+
+    def delete(self, key):
+        self.client.delete(f"{self.prefix}{key}")
+
+    def clear(self):
+        keys = list(self.client.scan_iter(f"{self.prefix}*"))
+        if keys:
+            self.client.delete(*keys)
+
+    def stats(self):
+        return {"backend": "redis", "ttl": self.ttl}
+
+
+def fragment_backend(url="", maxsize=5000, ttl=3600.0):
+    """Boş url: process içi LRU; redis://...: paylaşılan Redis."""
+    if url:
+        return RedisBackend(url, ttl=ttl)
+    return LocalBackend(maxsize=maxsize, ttl=ttl)
+
+
+class FragmentCache:
+    """
+    Anahtar -> (damga, HTML). Damga, parçanın girdilerinin sürümüdür (ör. satır
+    sürümü); değişen kayıt yeni damgayla okunacağı için eski parça hiç eşleşmez.
+    invalidate() yalnızca belleği erken boşaltmak içindir.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_many(self, stamps):
+        """{anahtar: damga} -> {anahtar: html}; yalnızca damgası tutan kayıtlar."""
+        keys = list(stamps)
+        found = {}
+        for key, value in zip(keys, self.backend.get_many(keys)):
+            if value is None:
+                continue
+            stamp, _, html = value.partition("\n")
+            if stamp == stamps[key]:
+                found[key] = html
+        with self._lock:
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def set_many(self, items):
+        """{anahtar: (damga, html)}"""
+        if items:
+            self.backend.set_many({k: f"{stamp}\n{html}" for k, (stamp, html) in items.items()})
+
+    def invalidate(self, key):
+        self.backend.delete(key)
+
+    def clear(self):
+        self.backend.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return dict(
+                self.backend.stats(),
+                fragment_hits=self.hits,
+                fragment_misses=self.misses,
+                fragment_hit_ratio=round(self.hits / lookups, 4) if lookups else 0.0,
+            )
@@ -0,0 +1,299 @@
+"""
+Engine / bağlantı havuzu ayarları.
+
+Tüm değerler ortam değişkenlerinden okunur (varsayılanlar Cloud Run'da
+instance başına küçük bir havuz için seçildi; max_instances x (DB_POOL_SIZE +
+DB_MAX_OVERFLOW) Postgres'in bağlantı limitinin altında kalmalı):
+
+  DB_POOL_SIZE        kalıcı bağlantı sayısı              (5)
+  DB_MAX_OVERFLOW     ani yükte açılabilecek ek bağlantı  (2)
+  DB_POOL_TIMEOUT     boş bağlantı bekleme süresi, sn     (10)
+  DB_POOL_RECYCLE     bağlantı en fazla kaç sn kullanılır (1800)
+  DB_POOL_PRE_PING    checkout'ta bağlantıyı yokla        (1)
+  DB_CONNECT_TIMEOUT  TCP/TLS bağlantı zaman aşımı, sn    (10)
+  DB_PGBOUNCER        PgBouncer (transaction pooling) modu (0)
+  SQLITE_BUSY_TIMEOUT kilitli veritabanında bekleme, ms   (5000)
+
+PgBouncer modunda havuzu PgBouncer tutar: istemci tarafında NullPool kullanılır
+ve sürücü hazırlanmış ifade (prepared statement) kullanmayacak şekilde ayarlanır.
+
+Engine'ler ilk kullanımda oluşturulur (LazyEngineSQLAlchemy): create_engine
+sürücüyü (psycopg2) import ettiği için bu iş soğuk başlangıçtan çıkarıldı.
+
+Okuma replikası (isteğe bağlı): DATABASE_READ_URL verilirse @read_replica ile
+işaretli route'ların GET istekleri SELECT'lerini replikaya gönderir
+(RoutingSession); yazımlar, FOR UPDATE ve ham SQL her zaman birincile gider.
+İstek içinde ilk yazımdan sonra session birincile sabitlenir. Yazım commit
+edilince kullanıcının oturumuna DB_READ_STICKY_SECONDS'lık bir işaret konur;
+bu sürede (ör. add_note'tan view_student'a yönlendirme) okumalar da
+birincilden yapılır, kullanıcı kendi yazdığını replika gecikmesine takılmadan
+görür. Havuz ayarları replika için de geçerlidir.
+
+  DATABASE_READ_URL       okuma replikası URL'i (boşsa kapalı)
+  DB_READ_STICKY_SECONDS  yazımdan sonra birincilden okuma, sn (10)
+
+Yerelde iki SQLite dosyasıyla denenebilir (replika kendiliğinden güncellenmez;
+kopya alınmalı):
+  sqlite3 instance/students.db ".backup instance/replica.db"
+  DATABASE_READ_URL=sqlite:///$PWD/instance/replica.db flask run
+"""
+import os
+import threading
+import time
+
+from flask import current_app, has_request_context, request, session
+from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session as FlaskSession
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import NullPool, QueuePool
+
+
+def env_int(env, name, default):
+    try:
+        return int(env.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def env_flag(env, name, default):
+    return str(env.get(name, default)).lower() in ("1", "true", "yes", "on")
+
+
+def serverless(env):
+    """
+    Cloud Functions / Cloud Run (FIREBASE_CONFIG ya da K_SERVICE tanımlı): CPU
+    istek dışında kısılır, instance SIGTERM ile (atexit çalışmadan) kapatılır;
+    arka plan thread'lerine güvenilemez.
+    """
+    return bool(env.get("FIREBASE_CONFIG") or env.get("K_SERVICE"))
+
+
+class PoolMetrics:
+    """Havuzdan bağlantı alma (checkout) bekleme süreleri ve sayaçları."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.checkouts = 0
+            self.wait_total = 0.0
+            self.wait_max = 0.0
+            self.timeouts = 0
+            self.connects = 0
+
+    def record_wait(self, seconds, timed_out=False):
+        with self._lock:
+            self.checkouts += 1
+            self.wait_total += seconds
+            if seconds > self.wait_max:
+                self.wait_max = seconds
+            if timed_out:
+                self.timeouts += 1
+
+    def record_connect(self):
+        with self._lock:
+            self.connects += 1
+
+    def snapshot(self, pool=None):
+        with self._lock:
+            data = {
+                "checkouts": self.checkouts,
+                "wait_total_ms": round(self.wait_total * 1000, 3),
+                "wait_avg_ms": round(self.wait_total * 1000 / self.checkouts, 3) if self.checkouts else 0.0,
+                "wait_max_ms": round(self.wait_max * 1000, 3),
+                "timeouts": self.timeouts,
+                "connects": self.connects,
+            }
+        if pool is not None:
+            data["pool"] = pool.status()
+            if isinstance(pool, QueuePool):
+                data.update(size=pool.size(), checked_out=pool.checkedout(),
+                            overflow=pool.overflow(), checked_in=pool.checkedin())
+        return data
+
+
+pool_metrics = PoolMetrics()
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool; her checkout'ta bağlantı için beklenen süreyi pool_metrics'e yazar."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except exc.TimeoutError:
+            pool_metrics.record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        pool_metrics.record_wait(time.perf_counter() - start)
+        return conn
+
+
+class _PendingEngine:
+    """init_app'te engine yerine tutulan yer tutucu."""
+    __slots__ = ("bind_key", "options")
+
+    def __init__(self, bind_key, options):
+        self.bind_key = bind_key
+        self.options = options
+
+    def dispose(self):
+        pass  # init_app tekrar çağrılırsa
+
+
+class LazyEngineSQLAlchemy(SQLAlchemy):
+    """
+    Flask-SQLAlchemy; engine'leri init_app'te değil, `engines` ilk kez
+    okunduğunda (ilk sorgu, db.engine, migration) oluşturur.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._engine_lock = threading.Lock()
+
+    def _make_engine(self, bind_key, options, app):
+        return _PendingEngine(bind_key, options)
+
+    @property
+    def engines(self):
+        engines = super().engines
+        if any(isinstance(e, _PendingEngine) for e in engines.values()):
+            with self._engine_lock:
+                app = current_app._get_current_object()
+                for key, pending in list(engines.items()):
+                    if isinstance(pending, _PendingEngine):
+                        engines[key] = super()._make_engine(pending.bind_key, pending.options, app)
+        return engines
+
+
+def is_sqlite(url):
+    return url.startswith("sqlite")
+
+
+def engine_options(url, env=None):
+    """SQLALCHEMY_ENGINE_OPTIONS için sözlük."""
+    env = os.environ if env is None else env
+
+    if is_sqlite(url):
+        # Her gunicorn worker'ı ayrı process; WAL + busy_timeout aşağıdaki connect hook'unda
+        options = {"connect_args": {"timeout": env_int(env, "SQLITE_BUSY_TIMEOUT", 5000) / 1000}}
+        if ":memory:" not in url and url.rstrip("/") != "sqlite:":
+            options.update(poolclass=TimedQueuePool,
+                           pool_size=env_int(env, "DB_POOL_SIZE", 5),
+                           max_overflow=env_int(env, "DB_MAX_OVERFLOW", 2),
+                           pool_timeout=env_int(env, "DB_POOL_TIMEOUT", 10))
+        return options
+
+    connect_args = {"connect_timeout": env_int(env, "DB_CONNECT_TIMEOUT", 10)}
+    if url.startswith("postgresql+psycopg2"):
+        # Cloud Run çıkışındaki NAT boştaki TCP bağlantılarını sessizce düşürebiliyor
+        connect_args.update(keepalives=1, keepalives_idle=30,
+                            keepalives_interval=10, keepalives_count=3)
+
+    if env_flag(env, "DB_PGBOUNCER", "0"):
+        if url.startswith("postgresql+psycopg:"):
+            connect_args["prepare_threshold"] = None  # psycopg 3
+        elif url.startswith("postgresql+asyncpg"):
+            connect_args["statement_cache_size"] = 0
+        # psycopg2 sunucu tarafı prepared statement kullanmaz; ek ayar gerekmez
+        return {"poolclass": NullPool, "connect_args": connect_args}
+
+    return {
+        "poolclass": TimedQueuePool,
+        "pool_size": env_int(env, "DB_POOL_SIZE", 5),
+        "max_overflow": env_int(env, "DB_MAX_OVERFLOW", 2),
+        "pool_timeout": env_int(env, "DB_POOL_TIMEOUT", 10),
+        "pool_recycle": env_int(env, "DB_POOL_RECYCLE", 1800),
+        "pool_pre_ping": env_flag(env, "DB_POOL_PRE_PING", "1"),
+        "connect_args": connect_args,
+    }
+
+
+@event.listens_for(Engine, "connect")
+def _on_connect(dbapi_conn, connection_record):
+    pool_metrics.record_connect()
+    if type(dbapi_conn).__module__.startswith("sqlite3"):
+        cursor = dbapi_conn.cursor()
+        try:
+            # WAL: okuyucular yazanı beklemez; yerel fallback'te birden çok worker için
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute(f"PRAGMA busy_timeout={env_int(os.environ, 'SQLITE_BUSY_TIMEOUT', 5000)}")
+        finally:
+            cursor.close()
+
+
+# -------------------------------
+# Okuma replikası
+# -------------------------------
+REPLICA_BIND = "replica"
+# Flask oturumunda: bu zamana (epoch sn) kadar okumalar birincilden
+STICKY_KEY = "_db_primary_until"
+
+
+def read_replica(view):
+    """Route'un GET / HEAD isteklerinde okumalar replikaya gidebilir."""
+    view.read_replica = True
+    return view
+
+
+def _read_only(clause):
+    return (clause is not None and getattr(clause, "is_select", False)
+            and getattr(clause, "_for_update_arg", None) is None)
+
+
+class RoutingSession(FlaskSession):
+    """
+    info["read_replica"] açıksa salt okuma SELECT'leri replika engine'ine
+    gider. Flush ya da DML görülünce session bu istek boyunca birincile
+    sabitlenir; commit'te info["wrote"] yapışkanlık işaretini tetikler.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None:
+            if self._flushing or getattr(clause, "is_dml", False):
+                self.info["wrote"] = True
+                self.info.pop("read_replica", None)
+            elif self.info.get("read_replica") and _read_only(clause):
+                return self._db.engines[REPLICA_BIND]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _stick_to_primary(db_session):
+    if not db_session.info.pop("wrote", False) or not has_request_context():
+        return
+    seconds = current_app.config.get("DB_READ_STICKY_SECONDS", 0)
+    if seconds and REPLICA_BIND in current_app.config.get("SQLALCHEMY_BINDS", {}):
+        session[STICKY_KEY] = int(time.time() + seconds) + 1
+
+
+@event.listens_for(RoutingSession, "after_rollback")
+def _discard_write(db_session):
+    db_session.info.pop("wrote", None)
+
+
+def init_read_replica(app, db, read_url, env=None):
+    """Replika bind'ini ve istek başına yönlendirmeyi kurar (read_url boşsa hiçbir şey)."""
+    if not read_url:
+        return
+    env = os.environ if env is None else env
+    app.config.setdefault("SQLALCHEMY_BINDS", {})[REPLICA_BIND] = \
+        dict(engine_options(read_url, env), url=read_url)
+    app.config.setdefault("DB_READ_STICKY_SECONDS", env_int(env, "DB_READ_STICKY_SECONDS", 10))
+
+    @app.before_request
+    def _route_reads():
+        if request.method not in ("GET", "HEAD"):
+            return
+        view = app.view_functions.get(request.endpoint)
+        if not getattr(view, "read_replica", False):
+            return
+        if STICKY_KEY in session:
+            if session[STICKY_KEY] > time.time():
+                return
+            session.pop(STICKY_KEY)
+        db.session.info["read_replica"] = True
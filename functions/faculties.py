@@ -0,0 +1,256 @@
+"""
+Fakülte -> bölüm listesi ve türetilmiş yapılar.
+
+Liste veritabanında `faculty` / `department` tablolarında da tutulur (öğrenci
+satırları küçük tam sayı id'lerle bağlanır). FacultyIndex bu tabloların
+process başına bir kez yüklenen, değiştirilemez bellek içi indeksidir
+(bkz. models.faculty_index).
+"""
+import hashlib
+import json
+from types import MappingProxyType
+
+from search import fold
+
+FACULTY_DEPARTMENTS = {
+    "Tıp Fakültesi": ["TIP"],
+    "Diş Hekimliği Fakültesi": ["DİŞ HEKİMLİĞİ"],
+    "İktisadi, İdari ve Sosyal Bilimler Fakültesi": [
+        "EKONOMİ",
+        "EKONOMİ VE FİNANS",
+        "FİNANS VE BANKACILIK",
+        "HALKLA İLİŞKİLER VE REKLAMCILIK",
+        "HAVACILIK YÖNETİMİ (TÜRKÇE-İNGİLİZCE)",
+        "İNGİLİZ DİLİ VE EDEBİYATI (İNGİLİZCE)",
+        "İNGİLİZCE MÜTERCİM TERCÜMANLIK",
+        "İŞLETME (TÜRKÇE - İNGİLİZCE)",
+        "PSİKOLOJİ (TÜRKÇE-İNGİLİZCE)",
+        "SİYASET BİLİMİ VE KAMU YÖNETİMİ",
+        "MUHASEBE VE FİNANS YÖNETİMİ",
+        "SERMAYE PİYASASI",
+        "SOSYAL HİZMET",
+        "SOSYOLOJİ",
+        "TURİZM İŞLETMECİLİĞİ",
+        "ULUSLARARASI İLİŞKİLER",
+        "ULUSLARARASI TİCARET VE LOJİSTİK",
+        "YENİ MEDYA VE İLETİŞİM",
+        "YÖNETİM BİLİŞİM SİSTEMLERİ (TÜRKÇE-İNGİLİZCE)",
+    ],
+    "Mühendislik Mimarlık Fakültesi": [
+        "BİLGİSAYAR MÜHENDİSLİĞİ (Türkçe)",
+        "ELEKTRİK - ELEKTRONİK MÜHENDİSLİĞİ (İngilizce)",
+        "ENDÜSTRİ MÜHENDİSLİĞİ",
+        "İNŞAAT MÜHENDİSLİĞİ",
+        "MEKATRONİK MÜHENDİSLİĞİ",
+        "MİMARLIK",
+        "YAZILIM MÜHENDİSLİĞİ (İngilizce)",
+        "MAKİNE MÜHENDİSLİĞİ (İNGİLİZCE)",
+    ],
+    "Sanat ve Tasarım Fakültesi": [
+        "DİJİTAL OYUN TASARIMI",
+        "ENDÜSTRİYEL TASARIM",
+        "GASTRONOMİ VE MUTFAK SANATLARI (TÜRKÇE - İNGİLİZCE)",
+        "GRAFİK TASARIMI",
+        "İLETİŞİM VE TASARIMI",
+        "RADYO, TELEVİZYON VE SİNEMA",
+        "Tekstil ve Moda Tasarımı",
+        "İÇ MİMARLIK (TÜRKÇE-İNGİLİZCE)",
+    ],
+    "Konservatuvar": ["MÜZİK", "SAHNE SANATLARI"],
+    "Beden Eğitimi ve Spor Yüksekokulu": [
+        "ANTRENÖRLÜK EĞİTİMİ",
+        "EGZERSİZ VE SPOR BİLİMLERİ",
+        "REKREASYON",
+        "SPOR YÖNETİCİLİĞİ",
+    ],
+    "Sivil Havacılık Yüksekokulu": [
+        "HAVA TRAFİK KONTROLÜ",
+        "HAVACILIK ELEKTRİK VE ELEKTRONİĞİ",
+        "PİLOTAJ (İNGİLİZCE)",
+        "UÇAK BAKIM VE ONARIM",
+    ],
+    "Uygulamalı Bilimler Yüksekokulu": [
+        "BİLİŞİM SİSTEMLERİ VE TEKNOLOJİLERİ",
+        "TURİZM REHBERLİĞİ",
+        "ULUSLARARASI TİCARET VE İŞLETMECİLİK",
+        "VERİ BİLİMİ VE ANALİTİĞİ",
+        "YAZILIM GELİŞTİRME",
+    ],
+    "Sağlık Bilimleri Fakültesi": [
+        "BESLENME VE DİYETETİK",
+        "DİL VE KONUŞMA TERAPİSİ",
+        "FİZYOTERAPİ VE REHABİLİTASYON",
+        "HEMŞİRELİK",
+        "EBELİK",
+    ],
+    "Meslek Yüksekokulu": [
+        "AŞÇILIK",
+        "BANKACILIK VE SİGORTACILIK",
+        "BİLGİSAYAR PROGRAMCILIĞI",
+        "DENİZ ULAŞTIRMA VE İŞLETME",
+        "DIŞ TİCARET",
+        "ELEKTRİK",
+        "FOTOĞRAFÇILIK VE KAMERAMANLIK",
+        "GRAFİK TASARIMI",
+        "HALKLA İLİŞKİLER VE TANITIM",
+        "İÇ MEKAN TASARIMI",
+        "İNŞAAT TEKNOLOJİSİ",
+        "İŞLETME YÖNETİMİ",
+        "LOJİSTİK PROGRAMI",
+        "MAKİNE",
+        "MEKATRONİK",
+        "Mobil Teknolojileri",
+        "MİMARİ RESTORASYON",
+        "MODA TASARIMI",
+        "MUHASEBE VE VERGİ UYGULAMALARI",
+        "Otomotiv Teknolojisi",
+        "RADYO VE TELEVİZYON PROGRAMCILIĞI",
+        "SİVİL HAVA ULAŞTIRMA İŞLETMECİLİĞİ",
+        "SİVİL HAVACILIK KABİN HİZMETLERİ",
+        "SPOR YÖNETİMİ",
+        "TURİST REHBERLİĞİ",
+        "TURİZM VE OTEL İŞLETMECİLİĞİ",
+        "Uçak Teknolojisi",
+        "ELEKTRONİK TEKNOLOJİSİ",
+        "İNSANSIZ ARAÇ TEKNİKERLİĞİ",
+        "MARINA VE YAT İŞLETMECİLİĞİ",
+        "WEB TASARIMI VE KODLAMA",
+        "YEŞİL VE EKOLOJİK BİNA TEKNİKERLİĞİ",
+        "MAHKEME BÜRO HİZMETLERİ",
+        "İNTERNET VE AĞ TEKNOLOJİLERİ",
+    ],
+    "Sağlık Hizmetleri Meslek Yüksekokulu": [
+        "AĞIZ VE DİŞ SAĞLIĞI",
+        "AMELİYATHANE HİZMETLERİ",
+        "ANESTEZİ",
+        "ÇOCUK GELİŞİMİ",
+        "DİŞ PROTEZ TEKNOLOJİSİ",
+        "DİYALİZ",
+        "ECZANE HİZMETLERİ",
+        "ELEKTRONÖROFİZYOLOJİ",
+        "FİZYOTERAPİ",
+        "İLK VE ACİL YARDIM",
+        "İŞ SAĞLIĞI VE GÜVENLİĞİ",
+        "ODYOMETRİ",
+        "OPTİSYENLİK",
+        "ORTOPEDİK PROTEZ VE ORTEZ",
+        "PATOLOJİ LABORATUVAR TEKNİKLERİ",
+        "RADYOTERAPİ",
+        "SOSYAL HİZMETLER",
+        "TIBBİ DOKÜMANTASYON VE SEKRETERLİK",
+        "TIBBİ GÖRÜNTÜLEME TEKNİKLERİ",
+        "TIBBİ LABORATUVAR TEKNİKLERİ",
+        "TIBBİ VERİ İŞLEME TEKNİKERLİĞİ",
+        "DİJİTAL SAĞLIK SİSTEMLERİ TEKNİKERLİĞİ",
+        "BİYOMEDİKAL CİHAZ TEKNOLOJİLERİ",
+    ],
+}
+
+DEPARTMENTS = frozenset(d for deps in FACULTY_DEPARTMENTS.values() for d in deps)
+
+# Form sayfalarındaki fakülte -> bölüm cascade'i için JSON; import anında bir kez
+# serialize edilir, içerik hash'li URL'den uzun süreli cache ile sunulur.
+FACULTIES_JSON = json.dumps(
+    FACULTY_DEPARTMENTS, ensure_ascii=False, separators=(",", ":")
+).encode("utf-8")
+FACULTIES_DIGEST = hashlib.sha256(FACULTIES_JSON).hexdigest()[:12]
+
+
+# Büyük/küçük harf ve İ/ı farkı gözetmeyen eşleme: fold(ad) -> kanonik ad
+_FACULTY_BY_FOLD = {fold(f): f for f in FACULTY_DEPARTMENTS}
+_DEPARTMENT_BY_FOLD = {
+    (fold(f), fold(d)): d for f, deps in FACULTY_DEPARTMENTS.items() for d in deps
+}
+# Bölüm -> onu içeren fakülteler (aynı bölüm adı birden çok fakültede olabilir)
+_FACULTIES_BY_DEPARTMENT = {}
+for _fac, _deps in FACULTY_DEPARTMENTS.items():
+    for _dep in _deps:
+        _FACULTIES_BY_DEPARTMENT.setdefault(fold(_dep), []).append(_fac)
+del _fac, _deps, _dep
+
+
+def resolve_faculty_department(faculty, department):
+    """
+    Serbest metin fakülte / bölümü listedeki kanonik adlara çevirir.
+    Fakülte boşsa ve bölüm tek bir fakülteye aitse fakülte oradan bulunur.
+    Eşleşmezse ValueError.
+    """
+    faculty = (faculty or "").strip()
+    department = (department or "").strip()
+    if not faculty and not department:
+        return None, None
+
+    if faculty:
+        canonical_faculty = _FACULTY_BY_FOLD.get(fold(faculty))
+        if canonical_faculty is None:
+            raise ValueError(f"Bilinmeyen fakülte: {faculty}")
+    else:
+        candidates = _FACULTIES_BY_DEPARTMENT.get(fold(department), [])
+        if len(candidates) != 1:
+            raise ValueError(f"Bölümün fakültesi belirlenemedi: {department}")
+        canonical_faculty = candidates[0]
+
+    if not department:
+        return canonical_faculty, None
+    canonical_department = _DEPARTMENT_BY_FOLD.get((fold(canonical_faculty), fold(department)))
+    if canonical_department is None:
+        raise ValueError(f"'{department}' bölümü '{canonical_faculty}' altında değil")
+    return canonical_faculty, canonical_department
+
+
+def lookup_faculty(name):
+    """Büyük/küçük harf / İ-ı farkı gözetmeden kanonik fakülte adı ya da None."""
+    return _FACULTY_BY_FOLD.get(fold((name or "").strip()))
+
+
+def lookup_departments(department, faculty=None):
+    """Bölüm adının kanonik (fakülte, bölüm) çiftleri; fakülte verilirse yalnızca o."""
+    folded = fold((department or "").strip())
+    faculties = [faculty] if faculty else _FACULTIES_BY_DEPARTMENT.get(folded, [])
+    pairs = []
+    for fac in faculties:
+        dep = _DEPARTMENT_BY_FOLD.get((fold(fac), folded))
+        if dep is not None:
+            pairs.append((fac, dep))
+    return pairs
+
+
+class FacultyIndex:
+    """
+    faculty / department tablolarının değiştirilemez indeksi: kanonik ad ->
+    id ve ters yönler (id -> ad, bölüm -> fakülte). Serbest metin önce
+    resolve_faculty_department / lookup_* ile kanonik ada çevrilir.
+    """
+    __slots__ = ("faculty_ids", "department_ids", "faculty_names",
+                 "department_names", "faculty_of_department")
+
+    def __init__(self, faculties, departments):
+        """faculties: [(id, ad)], departments: [(id, fakülte id, ad)]"""
+        faculty_names = dict(faculties)
+        self.faculty_names = MappingProxyType(faculty_names)
+        self.faculty_ids = MappingProxyType({name: fid for fid, name in faculties})
+        self.department_names = MappingProxyType({did: name for did, _, name in departments})
+        self.faculty_of_department = MappingProxyType({did: fid for did, fid, _ in departments})
+        self.department_ids = MappingProxyType({
+            (faculty_names[fid], name): did for did, fid, name in departments
+        })
+
+    def ids_for(self, faculty, department):
+        """
+        Kayıttaki serbest metinden (fakülte id, bölüm id); eşleşmeyen kısım None.
+        Bölüm fakülteye uymuyorsa yalnızca fakülte id'si döner.
+        """
+        try:
+            fac, dep = resolve_faculty_department(faculty, department)
+        except ValueError:
+            fac, dep = lookup_faculty(faculty), None
+        return self.faculty_ids.get(fac), self.department_ids.get((fac, dep))
+
+    def faculty_id(self, name):
+        return self.faculty_ids.get(lookup_faculty(name))
+
+    def department_id_set(self, department, faculty=None):
+        """Filtre için: bölüm adına (varsa fakülte içinde) uyan id'ler."""
+        fac = lookup_faculty(faculty) if faculty else None
+        return frozenset(self.department_ids[pair] for pair in lookup_departments(department, fac)
+                         if pair in self.department_ids)
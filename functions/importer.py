@@ -0,0 +1,239 @@
+"""
+CSV'den toplu öğrenci içe aktarma.
+
+Dosya satır satır okunur ve `chunk_size`'lık partiler hâlinde işlenir; her
+parti tek bir çok-satırlı INSERT (executemany / insertmanyvalues) ve tek commit
+ile yazılır. Bellekte aynı anda yalnızca bir parti bulunur, bu yüzden dosya
+boyutu sınırlayıcı değildir.
+
+Mükerrer kontrolü okul no ve telefon üzerinden yapılır: parti içinde yerel
+olarak, veritabanına karşı index'li IN sorgularıyla. Önceki partiler commit
+edildiği için sonraki partilerin veritabanı kontrolü onları da görür.
+"""
+import csv
+from collections import Counter
+from datetime import datetime
+from itertools import chain
+
+from sqlalchemy import insert
+
+import audit
+import search
+from faculties import resolve_faculty_department
+from models import (
+    db, STATUSES, ArchivedStudent, Student, StudentNote,
+    apply_stat_deltas, faculty_index, mark_students_changed,
+)
+
+DEFAULT_CHUNK_SIZE = 500
+
+# Web arayüzünde gösterilecek en fazla sorunlu satır
+MAX_REPORTED_ISSUES = 1000
+
+# Kabul edilen başlıklar (fold edilmiş hâlleriyle karşılaştırılır)
+HEADER_ALIASES = {
+    "name":       ("name", "ad soyad", "adi soyadi", "ad", "isim"),
+    "phone":      ("phone", "telefon", "tel"),
+    "school_no":  ("school_no", "okul no", "okul numarasi", "ogrenci no"),
+    "faculty":    ("faculty", "fakulte"),
+    "department": ("department", "bolum"),
+    "status":     ("status", "durum"),
+    "problem":    ("problem", "sorun"),
+    "note":       ("note", "not", "ilk not"),
+}
+_FIELD_BY_HEADER = {alias: field for field, aliases in HEADER_ALIASES.items() for alias in aliases}
+
+MAX_LENGTHS = {"name": 150, "phone": 30, "school_no": 30}
+
+
+class ImportFileError(ValueError):
+    """Dosyanın tamamını geçersiz kılan hata (ör. başlık satırı eksik)."""
+
+
+class ImportReport:
+    def __init__(self, max_issues=MAX_REPORTED_ISSUES, on_issue=None):
+        self.rows = 0
+        self.created = 0
+        self.duplicates = 0
+        self.errors = 0
+        self.issues = []
+        self.max_issues = max_issues
+        self.on_issue = on_issue
+
+    def add_issue(self, line, kind, message):
+        if kind == "duplicate":
+            self.duplicates += 1
+        else:
+            self.errors += 1
+        if self.on_issue is not None:
+            self.on_issue(line, kind, message)
+        if len(self.issues) < self.max_issues:
+            self.issues.append((line, kind, message))
+
+    @property
+    def truncated(self):
+        return self.duplicates + self.errors > len(self.issues)
+
+    def as_dict(self):
+        return {
+            "rows": self.rows, "created": self.created,
+            "duplicates": self.duplicates, "errors": self.errors,
+            "issues": [{"line": l, "kind": k, "message": m} for l, k, m in self.issues],
+            "truncated": self.truncated,
+        }
+
+
+def _read_header(lines):
+    try:
+        first = next(lines)
+    except StopIteration:
+        raise ImportFileError("Dosya boş.")
+    # Türkçe Excel CSV'yi ';' ile kaydeder
+    delimiter = ";" if first.count(";") > first.count(",") else ","
+    reader = csv.reader(chain([first], lines), delimiter=delimiter)
+    header = next(reader)
+    columns = {}
+    for index, title in enumerate(header):
+        field = _FIELD_BY_HEADER.get(search.fold(title))
+        if field and field not in columns:
+            columns[field] = index
+    if "name" not in columns:
+        raise ImportFileError("Başlık satırında 'Ad Soyad' / 'name' kolonu yok.")
+    return reader, columns
+
+
+def _validate(raw):
+    """Tek satırı doğrular -> (kolon değerleri, ilk not) ya da ValueError."""
+    name = raw.get("name")
+    if not name:
+        raise ValueError("İsim zorunlu.")
+    for field, max_len in MAX_LENGTHS.items():
+        if raw.get(field) and len(raw[field]) > max_len:
+            raise ValueError(f"{field} en fazla {max_len} karakter olabilir.")
+
+    faculty, department = resolve_faculty_department(raw.get("faculty"), raw.get("department"))
+
+    status = search.fold(raw.get("status") or "cozulmedi")
+    if status not in STATUSES:
+        raise ValueError(f"Geçersiz durum: {raw.get('status')}")
+
+    values = {
+        "name": name,
+        "phone": raw.get("phone"),
+        "school_no": raw.get("school_no"),
+        "faculty": faculty,
+        "department": department,
+        "status": status,
+        "problem": raw.get("problem"),
+    }
+    return values, raw.get("note")
+
+
+def _existing(field, values):
+    """Kayıtlı değerler; arşivdeki öğrenciler de sayılır (geri yüklenebilirler)."""
+    values = [v for v in values if v]
+    if not values:
+        return set()
+    taken = set()
+    for model in (Student, ArchivedStudent):
+        column = getattr(model, field)
+        taken.update(row[0] for row in db.session.query(column).filter(column.in_(values)))
+    return taken
+
+
+def _write_chunk(chunk, added_by, report):
+    """Bir partiyi mükerrer kontrolünden geçirip tek transaction'da yazar."""
+    taken_school = _existing("school_no", (v["school_no"] for _, v, _ in chunk))
+    taken_phone = _existing("phone", (v["phone"] for _, v, _ in chunk))
+
+    now = datetime.utcnow()
+    index = faculty_index()
+    students, notes = [], []
+    for line, values, note in chunk:
+        if values["school_no"] and values["school_no"] in taken_school:
+            report.add_issue(line, "duplicate", f"Okul no zaten kayıtlı: {values['school_no']}")
+            continue
+        if values["phone"] and values["phone"] in taken_phone:
+            report.add_issue(line, "duplicate", f"Telefon zaten kayıtlı: {values['phone']}")
+            continue
+        taken_school.add(values["school_no"])
+        taken_phone.add(values["phone"])
+        students.append(dict(
+            values, added_by=added_by,
+            search_key=search.build_search_key(values["name"], values["phone"], values["school_no"]),
+            # Core INSERT mapper hook'larından geçmez; id'ler burada (ad zaten kanonik)
+            faculty_id=index.faculty_ids.get(values["faculty"]),
+            department_id=index.department_ids.get((values["faculty"], values["department"])),
+            # not özet kolonları doğrudan yazılır (Core INSERT flush hook'larından geçmez)
+            note_count=1 if note else 0,
+            last_note_at=now if note else None,
+        ))
+        notes.append(note)
+
+    if not students:
+        return
+
+    # Core INSERT: ORM flush hook'ları çalışmaz; sayaçlar aşağıda elle güncellenir
+    table = Student.__table__
+    ids = db.session.execute(
+        insert(table).returning(table.c.id, sort_by_parameter_order=True), students
+    ).scalars().all()
+
+    note_rows = [
+        {"student_id": sid, "text": note, "author": added_by, "created_at": now}
+        for sid, note in zip(ids, notes) if note
+    ]
+    note_ids = []
+    if note_rows:
+        table = StudentNote.__table__
+        note_ids = db.session.execute(
+            insert(table).returning(table.c.id, sort_by_parameter_order=True), note_rows
+        ).scalars().all()
+
+    # Geçmiş olayları da commit'le birlikte kuyruğa gider (bkz. audit.stage)
+    audit.stage(db.session, chain(
+        (audit.audit_event("create", "student", sid, sid,
+                           {k: v for k, v in s.items() if k in audit.STUDENT_FIELDS and v},
+                           actor=added_by)
+         for sid, s in zip(ids, students)),
+        (audit.audit_event("create", "note", nid, row["student_id"], {"text": row["text"], "author": added_by}, actor=added_by)
+         for nid, row in zip(note_ids, note_rows)),
+    ))
+
+    connection = db.session.connection()
+    apply_stat_deltas(connection, Counter((added_by or "", s["status"]) for s in students))
+    mark_students_changed(db.session)
+    db.session.commit()
+    report.created += len(students)
+
+
+def import_students(lines, added_by, chunk_size=DEFAULT_CHUNK_SIZE, report=None):
+    """
+    `lines`: metin satırları veren herhangi bir iterable (açık dosya, TextIOWrapper).
+    Satır bazlı hatalar rapora yazılır; dosya genelindeki hatalar ImportFileError.
+    """
+    report = report or ImportReport()
+    reader, columns = _read_header(iter(lines))
+
+    chunk = []
+    for row in reader:
+        if not any(cell.strip() for cell in row):
+            continue
+        report.rows += 1
+        line = reader.line_num
+        raw = {
+            field: (row[index].strip() or None) if index < len(row) else None
+            for field, index in columns.items()
+        }
+        try:
+            values, note = _validate(raw)
+        except ValueError as e:
+            report.add_issue(line, "error", str(e))
+            continue
+        chunk.append((line, values, note))
+        if len(chunk) >= chunk_size:
+            _write_chunk(chunk, added_by, report)
+            chunk = []
+    if chunk:
+        _write_chunk(chunk, added_by, report)
+    return report
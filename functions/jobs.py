@@ -0,0 +1,551 @@
+"""
+Arka plan işleri: uzun bakım işleri (migration, sayaçları / arama
+anahtarlarını yeniden hesaplama, referans eşleme) istek thread'i yerine
+işçide, kaldığı yerden devam edebilen toplu adımlarla çalışır.
+
+- enqueue() işi `jobs` tablosuna `queued` olarak yazar. Aynı tür ve
+  parametrelerle bekleyen / çalışan bir iş varsa yenisi açılmaz, o döner.
+- İşçi sıradaki işi koşullu tek bir UPDATE ile sahiplenir; aynı işi iki işçi
+  alamaz (Postgres ve SQLite'ta aynı).
+- İş fonksiyonu her toplu adımdan sonra ctx.checkpoint(...) çağırır: ilerleme
+  (done / total) ve kaldığı yer adımın yazımlarıyla aynı transaction'da
+  commit edilir; iptal istenmişse iş orada durur.
+- İşçi çalıştırdığı işlerin heartbeat'ini tazeler. İşçi ölürse (deploy, OOM)
+  heartbeat JOB_STALE_SECONDS'tan eskir ve iş başka bir işçide checkpoint'ten
+  devam eder (en fazla JOB_MAX_ATTEMPTS deneme). İş fonksiyonunun attığı
+  hata işi `failed` yapar; yeniden denenmez.
+
+İşçi (JOB_WORKER):
+  thread   web process'i içinde JOB_THREADS thread'lik havuz; ilk istekte
+           başlar. Yerel geliştirme (flask run / gunicorn) için.
+  inline   işi sıraya ekleyen istek, yanıt dönmeden çalıştırır (bakım
+           endpoint'leri iş bitince döner). Cloud Functions / Cloud Run'da
+           (FIREBASE_CONFIG ya da K_SERVICE tanımlı) varsayılan budur: orada
+           CPU istek dışında kısılır, thread'deki işler durur / sürünür; ayrı
+           bir işçi de dağıtılmıyor. İş fonksiyonun timeout'unu aşarsa aynı
+           istek tekrarlandığında (heartbeat JOB_STALE_SECONDS'tan eskiyince)
+           checkpoint'ten devam eder.
+  process  web process'i iş çalıştırmaz; işleri ayrı bir process çalıştırır:
+           `flask jobs worker` (ayrı bir Cloud Run servisi / job ya da VM).
+           Böyle bir işçi dağıtıldıysa bulutta JOB_WORKER=process verilir.
+  off      yalnızca sıraya eklenir.
+
+Ayarlar (ortam):
+  JOB_WORKER          thread / inline / process / off  (yerelde thread, bulutta inline)
+  JOB_THREADS         thread havuzu boyutu                    (1)
+  JOB_POLL_SECONDS    boştayken sıra kontrol aralığı, sn      (5)
+  JOB_STALE_SECONDS   heartbeat bu kadar eskiyse iş sahipsiz  (300)
+  JOB_MAX_ATTEMPTS    sahipsiz kalan işin en fazla denemesi   (3)
+  JOB_BATCH_SIZE      toplu işlerde adım başına satır         (500)
+"""
+import os
+import socket
+import threading
+import time
+import traceback
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import and_, bindparam, func, or_, select, update
+
+from database import env_int, serverless
+from models import (
+    db, Job, Student, StudentNote, mark_students_changed,
+    recount_student_stats, sync_reference_tables,
+)
+
+# Tamamlanmamış işler; enqueue bunlar arasında aynısını arar
+ACTIVE_STATUSES = ("queued", "running")
+
+JOB_FIELDS = (
+    "id", "kind", "status", "params", "done", "total", "message", "attempts",
+    "cancel_requested", "created_by", "worker", "created_at", "started_at",
+    "finished_at", "heartbeat_at",
+)
+
+# tür -> iş fonksiyonu; açıklama fonksiyonun docstring'i
+JOBS = {}
+
+
+def job(kind):
+    """İş türünü kaydeder. Fonksiyon JobContext alır, sonuç mesajı döndürebilir."""
+    def register(fn):
+        JOBS[kind] = fn
+        return fn
+    return register
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class JobLost(Exception):
+    """İş bu işçinin elinden çıktı (sahipsiz sayılıp başka işçiye geçti)."""
+
+
+def job_to_dict(j):
+    body = {f: getattr(j, f) for f in JOB_FIELDS}
+    for f in ("created_at", "started_at", "finished_at", "heartbeat_at"):
+        if body[f] is not None:
+            body[f] = body[f].isoformat()
+    body["percent"] = round(100 * j.done / j.total, 1) if j.total else None
+    return body
+
+
+# -------------------------------
+# Sıra
+# -------------------------------
+def enqueue(kind, params=None, created_by=None):
+    """İşi sıraya ekler (ya da aynı bekleyen / çalışan işi döndürür)."""
+    if kind not in JOBS:
+        raise ValueError(f"Bilinmeyen iş türü: {kind}")
+    params = params or {}
+    for existing in Job.query.filter(Job.kind == kind, Job.status.in_(ACTIVE_STATUSES)):
+        if (existing.params or {}) == params:
+            return existing
+    j = Job(kind=kind, params=params, status="queued", created_by=created_by)
+    db.session.add(j)
+    db.session.commit()
+    worker = current_app.extensions.get("jobs")
+    if worker is not None:
+        worker.submit(j)
+    return j
+
+
+def request_cancel(job_id):
+    """Bekleyen iş hemen iptal edilir; çalışan iş sonraki checkpoint'te durur."""
+    j = db.session.get(Job, job_id)
+    if j is None:
+        return None
+    if j.status == "queued":
+        j.status, j.finished_at = "cancelled", datetime.utcnow()
+    elif j.status == "running":
+        j.cancel_requested = True
+    db.session.commit()
+    return j
+
+
+def recent_jobs(limit=50):
+    return Job.query.order_by(Job.id.desc()).limit(limit).all()
+
+
+def job_counts():
+    return dict(db.session.query(Job.status, func.count(Job.id)).group_by(Job.status).all())
+
+
+def _fail_abandoned(stale_before, max_attempts):
+    # Çok kez sahipsiz kalan iş (her denemede işçiyi düşürüyor olabilir) bırakılır
+    db.session.execute(
+        update(Job)
+        .where(Job.status == "running", Job.heartbeat_at < stale_before,
+               Job.attempts >= max_attempts)
+        .values(status="failed", finished_at=datetime.utcnow(),
+                message="İşçi yanıt vermedi; deneme sınırı aşıldı.")
+    )
+
+
+def claim_next(worker_id, stale_seconds=300, max_attempts=3):
+    """Sıradaki işi (ya da sahipsiz kalmış çalışan işi) sahiplenir; id ya da None."""
+    now = datetime.utcnow()
+    stale_before = now - timedelta(seconds=stale_seconds)
+    _fail_abandoned(stale_before, max_attempts)
+    candidates = db.session.execute(
+        select(Job.id, Job.status)
+        .where(or_(Job.status == "queued",
+                   and_(Job.status == "running", Job.heartbeat_at < stale_before)))
+        .order_by(Job.id).limit(5)
+    ).all()
+    for job_id, status in candidates:
+        if _claim(job_id, status, worker_id, now, stale_before):
+            db.session.commit()
+            return job_id
+    db.session.commit()
+    return None
+
+
+def claim_job(job_id, worker_id, stale_seconds=300, max_attempts=3):
+    """Belirli işi (bekliyorsa ya da sahipsiz kalmışsa) sahiplenir; True / False."""
+    now = datetime.utcnow()
+    stale_before = now - timedelta(seconds=stale_seconds)
+    _fail_abandoned(stale_before, max_attempts)
+    claimed = any(_claim(job_id, status, worker_id, now, stale_before)
+                  for status in ("queued", "running"))
+    db.session.commit()
+    return claimed
+
+
+def _claim(job_id, status, worker_id, now, stale_before):
+    condition = [Job.id == job_id, Job.status == status]
+    if status == "running":
+        condition.append(Job.heartbeat_at < stale_before)
+    return db.session.execute(
+        update(Job).where(*condition).values(
+            status="running", worker=worker_id, heartbeat_at=now,
+            started_at=func.coalesce(Job.started_at, now), attempts=Job.attempts + 1,
+        )
+    ).rowcount
+
+
+# -------------------------------
+# Çalıştırma
+# -------------------------------
+class JobContext:
+    """İş fonksiyonunun gördüğü arayüz: parametreler, kaldığı yer, ilerleme."""
+
+    def __init__(self, j, worker_id, batch_size):
+        self.id = j.id
+        self.params = dict(j.params or {})
+        self.saved = dict(j.checkpoint or {})  # önceki denemeden kalan yer
+        self.done = j.done
+        self.total = j.total
+        self.worker_id = worker_id
+        self.batch_size = batch_size
+
+    def checkpoint(self, saved, done, total=None):
+        """
+        Kaldığı yeri ve ilerlemeyi session'daki yazımlarla birlikte commit eder.
+        İptal istendiyse JobCancelled, iş başka işçiye geçtiyse JobLost.
+        """
+        self.saved, self.done = saved, done
+        values = {"checkpoint": saved, "done": done, "heartbeat_at": datetime.utcnow()}
+        if total is not None:
+            self.total = values["total"] = total
+        row = db.session.execute(
+            update(Job)
+            .where(Job.id == self.id, Job.worker == self.worker_id, Job.status == "running")
+            .values(**values)
+            .returning(Job.cancel_requested)
+        ).first()
+        if row is None:
+            db.session.rollback()
+            raise JobLost()
+        db.session.commit()
+        if row.cancel_requested:
+            raise JobCancelled()
+
+
+def _finish(job_id, worker_id, status, message=None):
+    db.session.execute(
+        update(Job).where(Job.id == job_id, Job.worker == worker_id)
+        .values(status=status, message=message, finished_at=datetime.utcnow())
+    )
+    db.session.commit()
+
+
+def run_job(job_id, worker_id, batch_size=500):
+    """Sahiplenilmiş işi çalıştırır ve sonucunu yazar."""
+    j = db.session.get(Job, job_id)
+    fn = JOBS.get(j.kind)
+    if fn is None:
+        _finish(job_id, worker_id, "failed", f"Bilinmeyen iş türü: {j.kind}")
+        return
+    ctx = JobContext(j, worker_id, batch_size)
+    db.session.commit()
+    try:
+        message = fn(ctx)
+    except JobCancelled:
+        db.session.rollback()
+        _finish(job_id, worker_id, "cancelled", "İptal edildi.")
+    except JobLost:
+        db.session.rollback()
+        print(f"JOB {job_id} LOST: başka işçiye geçti")
+    except Exception as e:
+        db.session.rollback()
+        traceback.print_exc()
+        _finish(job_id, worker_id, "failed", f"{type(e).__name__}: {e}")
+    else:
+        _finish(job_id, worker_id, "done", message)
+
+
+class JobWorker:
+    """
+    İşleri sıradan alıp çalıştıran thread'ler ve çalışan işlerin heartbeat'ini
+    tazeleyen bir thread. Thread'ler ilk ensure_started()'ta (ve fork'tan sonra
+    yeni process'te) başlatılır.
+    """
+
+    def __init__(self, app, threads=1, poll_seconds=5, stale_seconds=300,
+                 max_attempts=3, batch_size=500):
+        self.app = app
+        self.threads = max(1, threads)
+        self.poll_seconds = poll_seconds
+        self.stale_seconds = stale_seconds
+        self.max_attempts = max_attempts
+        self.batch_size = batch_size
+        self.completed = 0
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._running = {}  # job id -> worker id
+        self._pid = None
+        self._threads = ()
+
+    def ensure_started(self):
+        if self._pid == os.getpid() and all(t.is_alive() for t in self._threads):
+            return
+        with self._lock:
+            if self._pid != os.getpid() or not all(t.is_alive() for t in self._threads):
+                self._pid = os.getpid()
+                self._threads = tuple(
+                    threading.Thread(target=self._loop, args=(i,), name=f"job-worker-{i}",
+                                     daemon=True)
+                    for i in range(self.threads)
+                ) + (threading.Thread(target=self._heartbeat, name="job-heartbeat",
+                                      daemon=True),)
+                for t in self._threads:
+                    t.start()
+
+    def wake(self):
+        self._wake.set()
+
+    def submit(self, j):
+        self.wake()
+
+    def run(self, once=False):
+        """`flask jobs worker`: ön planda çalışır; once ise sıra boşalınca döner."""
+        if once:
+            threading.Thread(target=self._heartbeat, name="job-heartbeat", daemon=True).start()
+            self._loop(0, once=True)
+            return
+        self.ensure_started()
+        for t in self._threads:
+            t.join()
+
+    def stats(self):
+        with self._lock:
+            return {"threads": self.threads, "running": sorted(self._running),
+                    "completed": self.completed}
+
+    def _worker_id(self, index):
+        return f"{socket.gethostname()}:{os.getpid()}:{index}"
+
+    def _run_next(self, worker_id):
+        with self.app.app_context():
+            try:
+                job_id = claim_next(worker_id, self.stale_seconds, self.max_attempts)
+                if job_id is None:
+                    return False
+                with self._lock:
+                    self._running[job_id] = worker_id
+                try:
+                    run_job(job_id, worker_id, self.batch_size)
+                finally:
+                    with self._lock:
+                        self._running.pop(job_id, None)
+                        self.completed += 1
+                return True
+            finally:
+                db.session.remove()
+
+    def _loop(self, index, once=False):
+        worker_id = self._worker_id(index)
+        while True:
+            try:
+                if self._run_next(worker_id):
+                    continue
+            except Exception as e:
+                # ör. jobs tablosu henüz yok (migration öncesi)
+                print("JOB WORKER ERROR:", e)
+            if once:
+                return
+            self._wake.wait(self.poll_seconds)
+            self._wake.clear()
+
+    def _heartbeat(self):
+        interval = max(1, self.stale_seconds / 3)
+        while True:
+            time.sleep(interval)
+            with self._lock:
+                running = dict(self._running)
+            if not running:
+                continue
+            try:
+                with self.app.app_context(), db.engine.begin() as connection:
+                    connection.execute(
+                        update(Job.__table__)
+                        .where(Job.__table__.c.id == bindparam("jid"),
+                               Job.__table__.c.worker == bindparam("wid"))
+                        .values(heartbeat_at=datetime.utcnow()),
+                        [{"jid": jid, "wid": wid} for jid, wid in running.items()],
+                    )
+            except Exception as e:
+                print("JOB HEARTBEAT ERROR:", e)
+
+
+class InlineRunner:
+    """JOB_WORKER=inline: sıraya eklenen işi ekleyen istekte çalıştırır."""
+
+    def __init__(self, stale_seconds=300, max_attempts=3, batch_size=500):
+        self.stale_seconds = stale_seconds
+        self.max_attempts = max_attempts
+        self.batch_size = batch_size
+        self.completed = 0
+
+    def submit(self, j):
+        worker_id = f"{socket.gethostname()}:{os.getpid()}:inline"
+        if claim_job(j.id, worker_id, self.stale_seconds, self.max_attempts):
+            run_job(j.id, worker_id, self.batch_size)
+            self.completed += 1
+
+    def stats(self):
+        return {"mode": "inline", "completed": self.completed}
+
+
+def worker_from_env(app, env=None):
+    env = os.environ if env is None else env
+    return JobWorker(
+        app,
+        threads=env_int(env, "JOB_THREADS", 1),
+        poll_seconds=env_int(env, "JOB_POLL_SECONDS", 5),
+        stale_seconds=env_int(env, "JOB_STALE_SECONDS", 300),
+        max_attempts=env_int(env, "JOB_MAX_ATTEMPTS", 3),
+        batch_size=max(1, env_int(env, "JOB_BATCH_SIZE", 500)),
+    )
+
+
+def worker_mode(env=None):
+    """JOB_WORKER; verilmemişse bulutta (Cloud Functions / Cloud Run) inline, yerelde thread."""
+    env = os.environ if env is None else env
+    return env.get("JOB_WORKER") or ("inline" if serverless(env) else "thread")
+
+
+def init_app(app):
+    """JOB_WORKER=thread / inline ise işleri çalıştıranı app.extensions["jobs"]'a koyar."""
+    env = os.environ
+    mode = worker_mode(env)
+    if mode == "inline":
+        app.extensions["jobs"] = InlineRunner(
+            stale_seconds=env_int(env, "JOB_STALE_SECONDS", 300),
+            max_attempts=env_int(env, "JOB_MAX_ATTEMPTS", 3),
+            batch_size=max(1, env_int(env, "JOB_BATCH_SIZE", 500)),
+        )
+    elif mode == "thread":
+        worker = worker_from_env(app, env)
+        app.extensions["jobs"] = worker
+        app.before_request(worker.ensure_started)
+
+
+# -------------------------------
+# İşler
+# -------------------------------
+def run_in_batches(ctx, id_column, process, *criteria):
+    """
+    id_column sırasıyla (criteria'ya uyan satırlarda) ctx.batch_size'lık
+    adımlar; process(ids) adımın yazımlarını session'a yapar, değişen satır
+    sayısını döndürür. Kaldığı yerden devam eder. Dönen değer: değişen
+    toplam satır.
+    """
+    last_id = ctx.saved.get("last_id", 0)
+    changed = ctx.saved.get("changed", 0)
+    total = ctx.total
+    if total is None:
+        total = db.session.query(func.count(id_column)).filter(*criteria).scalar()
+    while True:
+        ids = [row[0] for row in db.session.query(id_column)
+               .filter(id_column > last_id, *criteria)
+               .order_by(id_column).limit(ctx.batch_size)]
+        if not ids:
+            return changed
+        batch_changed = process(ids)
+        if batch_changed:
+            # Liste sayfalarının ETag'leri eskisin
+            mark_students_changed(db.session)
+        changed += batch_changed
+        last_id = ids[-1]
+        ctx.checkpoint({"last_id": last_id, "changed": changed}, ctx.done + len(ids), total)
+
+
+@job("migrate")
+def migrate_job(ctx):
+    """Tüm migration'ları uygular (flask db upgrade)."""
+    import maintenance
+    maintenance.upgrade_database()
+    return "Migration'lar uygulandı."
+
+
+@job("seed-admin")
+def seed_admin_job(ctx):
+    """Admin hesabı yoksa oluşturur."""
+    import maintenance
+    return "Admin oluşturuldu." if maintenance.ensure_admin() else "Admin zaten var."
+
+
+@job("recount-stats")
+def recount_stats_job(ctx):
+    """student_stats sayaçlarını yeniden hesaplar."""
+    recount_student_stats()
+    return "Sayaçlar yeniden hesaplandı."
+
+
+@job("sync-faculties")
+def sync_faculties_job(ctx):
+    """FACULTY_DEPARTMENTS'teki yeni fakülte / bölümleri tablolara ekler."""
+    added, updated = sync_reference_tables()
+    return f"{added} fakülte/bölüm eklendi, {updated} öğrenci eşlendi."
+
+
+@job("reindex-search")
+def reindex_search_job(ctx):
+    """Öğrencilerin search_key'ini yeniden hesaplar (search.py kuralları değişince)."""
+    import search
+    table = Student.__table__
+
+    def process(ids):
+        rows = db.session.execute(
+            select(table.c.id, table.c.name, table.c.phone, table.c.school_no, table.c.search_key)
+            .where(table.c.id.in_(ids))
+        ).all()
+        changes = []
+        for r in rows:
+            key = search.build_search_key(r.name, r.phone, r.school_no)
+            if key != r.search_key:
+                changes.append({"sid": r.id, "key": key})
+        if changes:
+            db.session.execute(
+                update(table).where(table.c.id == bindparam("sid"))
+                .values(search_key=bindparam("key")),
+                changes,
+            )
+        return len(changes)
+
+    changed = run_in_batches(ctx, Student.id, process)
+    return f"{changed} öğrencinin arama anahtarı güncellendi."
+
+
+@job("recount-notes")
+def recount_notes_job(ctx):
+    """note_count / last_note_at'i notlardan yeniden hesaplar."""
+    table = Student.__table__
+    notes = StudentNote.__table__
+    count = select(func.count(notes.c.id)).where(notes.c.student_id == table.c.id)\
+        .scalar_subquery()
+    last = select(func.max(notes.c.created_at)).where(notes.c.student_id == table.c.id)\
+        .scalar_subquery()
+
+    def process(ids):
+        return db.session.execute(
+            update(table)
+            .where(table.c.id.in_(ids),
+                   or_(table.c.note_count != count,
+                       table.c.last_note_at.is_distinct_from(last)))
+            .values(note_count=count, last_note_at=last)
+        ).rowcount
+
+    changed = run_in_batches(ctx, Student.id, process)
+    return f"{changed} öğrencinin not özeti düzeltildi."
+
+
+@job("archive-students")
+def archive_students_job(ctx):
+    """
+    Çözülmüş ve ARCHIVE_AFTER_DAYS (ya da ?days=) gündür hareketsiz
+    öğrencileri notlarıyla arşiv tablolarına taşır.
+    """
+    import archive
+    days = int(ctx.params.get("days") or archive.archive_after_days())
+    cutoff = archive.archive_cutoff(days)
+
+    def process(ids):
+        return len(archive.archive_students(ids, cutoff))
+
+    moved = run_in_batches(ctx, Student.id, process, archive.archivable(cutoff))
+    return f"{moved} öğrenci arşive taşındı ({days} günden eski)."
@@ -0,0 +1,256 @@
+"""
+Dashboard canlı güncellemeleri (Server-Sent Events).
+
+Commit edilen öğrenci / not değişiklikleri (audit.changes_committed) commit
+başına tek bir kompakt mesaja indirgenir:
+
+    {"version": 42, "created": [id, ...], "updated": [...], "deleted": [...]}
+
+ve broker üzerinden /events akışına abone olan sayfalara iletilir. Sayfa
+yalnızca etkilenen satırları /dashboard/rows ile ister ve yerinde değiştirir;
+`version` students veri sürümüdür, sayfa kaçırdığı mesajı bununla fark eder.
+
+Broker'lar (LIVE_BROKER):
+  local     process içi (varsayılan). Başka worker / instance'taki yazımlar
+            bu process'in abonelerine ulaşmaz.
+  postgres  LISTEN/NOTIFY: her process bir dinleyici bağlantısı açar, yazımlar
+            NOTIFY ile bütün instance'lara dağılır (psycopg2; PgBouncer
+            transaction modunda LISTEN çalışmaz, doğrudan bağlantı gerekir).
+
+Her açık akış bir worker thread'ini tutar; gunicorn'da gthread işçileri
+(ör. `--worker-class gthread --threads 16`) kullanılmalı. Akış
+LIVE_STREAM_SECONDS sonra kapanır ve tarayıcı kendiliğinden yeniden bağlanır.
+
+Cloud Functions / Cloud Run'da (FIREBASE_CONFIG ya da K_SERVICE tanımlı)
+varsayılan kapalıdır. Orada açık her akış bir istek olarak LIVE_STREAM_SECONDS
+boyunca instance'ın eşzamanlılık payını (ve faturalanan CPU süresini) tutar:
+main.py'deki max_instances=10 ile açık birkaç dashboard tüm dağıtımı doldurup
+diğer istekleri bekletebilir. local broker da yalnızca aynı instance'taki
+yazımları gördüğü için bulutta LIVE=1 ancak LIVE_BROKER=postgres ile kabul
+edilir; aksi hâlde canlı güncelleme kapalı kalır, sayfa normal çalışır.
+
+Ayarlar (ortam):
+  LIVE                 canlı güncelleme açık/kapalı    (yerelde 1, bulutta 0)
+  LIVE_BROKER          local / postgres                           (local)
+  LIVE_STREAM_SECONDS  tek bağlantının en uzun süresi, sn         (55)
+  LIVE_MAX_IDS         mesajdaki en fazla id; fazlası "bulk" olur (200)
+"""
+import json
+import os
+import queue
+import select
+import threading
+import time
+
+from sqlalchemy import text
+
+from audit import changes_committed
+from database import env_flag, env_int, serverless
+from models import db
+
+CHANNEL = "hts_changes"
+KEEPALIVE_SECONDS = 15
+# Tarayıcının yeniden bağlanmadan önce beklediği süre (ms)
+RETRY_MS = 3000
+
+
+def compact(events, version, max_ids=200):
+    """audit olaylarından sayfaya gidecek mesaj; çok büyükse yalnızca "bulk"."""
+    created, updated, deleted = set(), set(), set()
+    for e in events:
+        sid = e["student_id"]
+        # arşive taşınan listeden çıkar, geri yüklenen yeniden girer
+        if e["entity"] == "student" and e["action"] in ("create", "restore"):
+            created.add(sid)
+        elif e["entity"] == "student" and e["action"] in ("delete", "archive"):
+            deleted.add(sid)
+        else:
+            updated.add(sid)  # alan / durum değişikliği ya da not ekleme / silme
+    updated -= created | deleted
+    created -= deleted
+    if len(created) + len(updated) + len(deleted) > max_ids:
+        return {"version": version, "bulk": True}
+    return {"version": version, "created": sorted(created),
+            "updated": sorted(updated), "deleted": sorted(deleted)}
+
+
+# -------------------------------
+# Broker'lar
+# -------------------------------
+class Subscription:
+    """Tek bir akışın mesaj kuyruğu. Kuyruk taşarsa sayfaya "bulk" gider."""
+
+    def __init__(self, maxsize=100):
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.overflowed = False
+
+    def put(self, message):
+        try:
+            self.queue.put_nowait(message)
+        except queue.Full:
+            self.overflowed = True
+
+    def get(self, timeout):
+        if self.overflowed:
+            self.overflowed = False
+            return {"bulk": True}
+        return self.queue.get(timeout=timeout)
+
+
+class LocalBroker:
+    """Process içi yayın: publish edilen mesaj bu process'teki her aboneye gider."""
+
+    def __init__(self):
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self.published = 0
+
+    def subscribe(self):
+        sub = Subscription()
+        with self._lock:
+            self._subscribers.add(sub)
+        return sub
+
+    def unsubscribe(self, sub):
+        with self._lock:
+            self._subscribers.discard(sub)
+
+    def publish(self, message):
+        self._fan_out(message)
+
+    def _fan_out(self, message):
+        with self._lock:
+            subscribers = list(self._subscribers)
+            self.published += 1
+        for sub in subscribers:
+            sub.put(message)
+
+    def stats(self):
+        with self._lock:
+            return {"broker": type(self).__name__, "subscribers": len(self._subscribers),
+                    "published": self.published}
+
+
+class PostgresBroker(LocalBroker):
+    """
+    publish() mesajı kuyruğa koyar; bir thread NOTIFY ile gönderir (istek
+    yolunda DB'ye gidilmez). Dinleyici thread'i havuz dışı ayrı bir bağlantıda
+    LISTEN eder ve gelen bildirimleri (kendi gönderdikleri dahil) yerel
+    abonelere dağıtır.
+    """
+
+    def __init__(self, app):
+        super().__init__()
+        self.app = app
+        self._outbox = queue.Queue()
+        self._pid = None
+        self._threads = ()
+
+    def _ensure_threads(self):
+        if self._pid == os.getpid() and all(t.is_alive() for t in self._threads):
+            return
+        with self._lock:
+            if self._pid != os.getpid() or not all(t.is_alive() for t in self._threads):
+                self._pid = os.getpid()
+                self._threads = (
+                    threading.Thread(target=self._listen, name="live-listen", daemon=True),
+                    threading.Thread(target=self._notify, name="live-notify", daemon=True),
+                )
+                for t in self._threads:
+                    t.start()
+
+    def subscribe(self):
+        self._ensure_threads()
+        return super().subscribe()
+
+    def publish(self, message):
+        self._ensure_threads()
+        self._outbox.put(message)
+
+    def _notify(self):
+        while True:
+            message = self._outbox.get()
+            try:
+                with self.app.app_context(), db.engine.begin() as connection:
+                    connection.execute(text("SELECT pg_notify(:channel, :payload)"),
+                                       {"channel": CHANNEL, "payload": json.dumps(message)})
+            except Exception as e:
+                print("LIVE NOTIFY ERROR:", e)
+
+    def _listen(self):
+        while True:
+            try:
+                with self.app.app_context():
+                    engine = db.engine
+                cargs, cparams = engine.dialect.create_connect_args(engine.url)
+                conn = engine.dialect.connect(*cargs, **cparams)
+                conn.autocommit = True
+                conn.cursor().execute(f"LISTEN {CHANNEL}")
+                while True:
+                    if select.select([conn], [], [], KEEPALIVE_SECONDS) == ([], [], []):
+                        conn.cursor().execute("SELECT 1")  # bağlantı kopmuş mu
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        self._fan_out(json.loads(conn.notifies.pop(0).payload))
+            except Exception as e:
+                print("LIVE LISTEN ERROR:", e)
+                # kopuk bağlantıda kaçan mesajlar: sayfalar sürüm farkından yakalar
+                self._fan_out({"bulk": True})
+                time.sleep(5)
+
+
+# -------------------------------
+# Akış
+# -------------------------------
+def _sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def stream(broker, version, seconds=55):
+    """text/event-stream gövdesi; `version` bağlantı anındaki students sürümü."""
+    sub = broker.subscribe()
+    try:
+        yield f"retry: {RETRY_MS}\n" + _sse("ready", {"version": version})
+        deadline = time.monotonic() + seconds
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            try:
+                message = sub.get(timeout=min(KEEPALIVE_SECONDS, remaining))
+            except queue.Empty:
+                yield ": ping\n\n"
+                continue
+            yield _sse("change", message)
+    finally:
+        broker.unsubscribe(sub)
+
+
+def live_enabled(env=None):
+    """LIVE; bulutta varsayılan kapalı ve yalnızca postgres broker'ıyla açılabilir."""
+    env = os.environ if env is None else env
+    cloud = serverless(env)
+    if not env_flag(env, "LIVE", "0" if cloud else "1"):
+        return False
+    if cloud and env.get("LIVE_BROKER") != "postgres":
+        print("LIVE: bulutta LIVE_BROKER=postgres gerekli; canlı güncelleme kapalı")
+        return False
+    return True
+
+
+def init_app(app):
+    """Broker'ı app.extensions["live"]'a koyar ve commit sinyaline bağlar."""
+    env = os.environ
+    if not live_enabled(env):
+        return
+    broker = PostgresBroker(app) if env.get("LIVE_BROKER") == "postgres" else LocalBroker()
+    app.extensions["live"] = broker
+    app.config.setdefault("LIVE_STREAM_SECONDS", env_int(env, "LIVE_STREAM_SECONDS", 55))
+    max_ids = env_int(env, "LIVE_MAX_IDS", 200)
+
+    def _publish(sender, events, version, **extra):
+        if sender is app:
+            broker.publish(compact(events, version, max_ids))
+
+    changes_committed.connect(_publish, weak=False)
@@ -1,14 +1,30 @@
 from firebase_functions import https_fn
 from firebase_functions.options import set_global_options
-from app import app as flask_app  # app.py içindeki Flask app
 
 set_global_options(max_instances=10)
 
+_flask_app = None
+
+
+def flask_app():
+    """
+    app.py içindeki Flask app; ilk istekte import edilir. Firebase main.py'yi
+    fonksiyonları keşfetmek için de yükler: Flask / SQLAlchemy / şablon
+    import'ları bu aşamadan çıkarıldı.
+    """
+    global _flask_app
+    if _flask_app is None:
+        from app import app  # import kilidi aynı anda iki kez kurulmasını engeller
+        _flask_app = app
+    return _flask_app
+
+
 @https_fn.on_request()
 def serving(req: https_fn.Request) -> https_fn.Response:
     """
     Firebase Hosting'ten gelen tüm HTTP istekleri buraya düşecek.
     Biz de isteği Flask app'ine forward edip cevabı geri döndürüyoruz.
     """
-    with flask_app.request_context(req.environ):
-        return flask_app.full_dispatch_request()
+    # full_dispatch_request değil wsgi_app: ProxyFix (istemci IP'si, bkz. auth.limiter)
+    # ve ölçüm middleware'i (Server-Timing, /metrics; bkz. metrics.py) de çalışır
+    return https_fn.Response.from_app(flask_app().wsgi_app, req.environ)
@@ -0,0 +1,272 @@
+"""
+Migration / bakım endpoint'leri ve `flask` CLI komutları.
+
+Bu modül normal isteklerde import edilmez: endpoint'ler create_app() içinde
+LazyView ile kaydedilir ve ilk çağrıldıklarında yüklenir; CLI komutları yalnızca
+uygulama `flask ...` komutuyla açıldığında eklenir. Flask-Migrate / Alembic
+importu (soğuk başlangıcın en pahalı kısmı) da bu yüzden burada.
+
+Uzun süren işler (migration, admin oluşturma, yeniden hesaplamalar) istekte
+çalışmaz; jobs.py kuyruğuna eklenir ve /__jobs/<id> ile izlenir.
+"""
+import csv
+from pathlib import Path
+
+import click
+from flask import current_app, request, abort, jsonify, url_for
+from flask.cli import with_appcontext
+from sqlalchemy import inspect as sa_inspect
+
+import assets
+import database
+import importer
+import jobs
+from auth import hash_password, user_cache
+from models import (
+    db, User, recount_student_stats, reset_faculty_index, sync_reference_tables,
+)
+from views import row_cache
+
+# Şema değişiklikleri migrations/versions altında (flask db upgrade)
+MIGRATIONS_DIR = str(Path(__file__).resolve().parent / "migrations")
+
+
+def init_migrate(app):
+    """Flask-Migrate'i (ve `flask db` komut grubunu) uygulamaya bağlar."""
+    if "migrate" not in app.extensions:
+        from flask_migrate import Migrate
+        Migrate(app, db, directory=MIGRATIONS_DIR, render_as_batch=True)
+
+
+def upgrade_database():
+    """Tüm sürümlü migration'ları uygular; zaten güncel şemada hiçbir şey yapmaz."""
+    from flask_migrate import upgrade
+    init_migrate(current_app)
+    upgrade(directory=MIGRATIONS_DIR)
+    reset_faculty_index()  # referans tabloları migration'la dolmuş olabilir
+
+
+def ensure_admin():
+    """Admin hesabı yoksa oluşturur; oluşturulduysa True."""
+    if User.query.filter_by(username="admin").first():
+        return False
+    db.session.add(User(username="admin", password=hash_password("Admin123!")))
+    db.session.commit()
+    return True
+
+
+def _check_token():
+    if request.args.get("token") != current_app.config["INIT_TOKEN"]:
+        abort(403)
+
+
+# -------------------------------
+# Endpoint'ler (app.create_app içinde LazyView ile kaydedilir)
+# -------------------------------
+def list_routes():
+    lines = []
+    for r in current_app.url_map.iter_rules():
+        methods = ",".join(sorted(m for m in r.methods if m not in ("HEAD","OPTIONS")))
+        lines.append(f"{r.rule:35s} -> {methods}  ({r.endpoint})")
+    return "<pre>" + "\n".join(sorted(lines)) + "</pre>"
+
+
+def _job_accepted(j):
+    resp = jsonify(jobs.job_to_dict(j))
+    # JOB_WORKER=inline: iş bu istekte bitti
+    resp.status_code = 202 if j.status in jobs.ACTIVE_STATUSES else 200
+    resp.headers["Location"] = url_for("job_status", id=j.id, token=request.args.get("token"))
+    return resp
+
+
+def seed_admin():
+    _check_token()
+    return _job_accepted(jobs.enqueue("seed-admin", created_by="http"))
+
+
+def cache_stats():
+    _check_token()
+    return {"user_cache": user_cache.stats(), "row_cache": row_cache.stats()}
+
+
+def db_stats():
+    _check_token()
+    writer = current_app.extensions.get("audit")
+    replica = db.engines.get(database.REPLICA_BIND)
+    return {
+        "pool": database.pool_metrics.snapshot(db.engine.pool),
+        # bekleme sayaçları iki engine için ortak; replikanın yalnızca havuz durumu
+        "replica_pool": replica.pool.status() if replica is not None else None,
+        "audit": writer.stats() if writer else None,
+        "jobs": jobs.job_counts(),
+    }
+
+
+def migrate_all():
+    _check_token()
+    if not sa_inspect(db.engine).has_table(jobs.Job.__tablename__):
+        # İlk kurulum: iş kuyruğunun tablosu da bu migration'larla gelir
+        upgrade_database()
+        return "OK: migrate_all", 200
+    return _job_accepted(jobs.enqueue("migrate", created_by="http"))
+
+
+def list_jobs():
+    """GET: son işler ve işçi durumu; POST ?kind=...: işi kuyruğa ekler."""
+    _check_token()
+    if request.method == "POST":
+        kind = request.values.get("kind", "")
+        if kind not in jobs.JOBS:
+            abort(400, f"kind şunlardan biri olmalı: {', '.join(sorted(jobs.JOBS))}")
+        params = request.get_json(silent=True) or {}
+        return _job_accepted(jobs.enqueue(kind, params, created_by="http"))
+    worker = current_app.extensions.get("jobs")
+    return {
+        "kinds": {kind: fn.__doc__ for kind, fn in sorted(jobs.JOBS.items())},
+        "counts": jobs.job_counts(),
+        "worker": worker.stats() if worker else None,
+        "jobs": [jobs.job_to_dict(j) for j in jobs.recent_jobs()],
+    }
+
+
+def job_status(id):
+    _check_token()
+    j = db.session.get(jobs.Job, id)
+    if j is None:
+        abort(404)
+    return jobs.job_to_dict(j)
+
+
+def cancel_job(id):
+    _check_token()
+    j = jobs.request_cancel(id)
+    if j is None:
+        abort(404)
+    return jobs.job_to_dict(j)
+
+
+# -------------------------------
+# CLI
+# -------------------------------
+@click.command("recount-stats")
+@with_appcontext
+def recount_stats_command():
+    """student_stats sayaçlarını yeniden hesaplar."""
+    recount_student_stats()
+    print("OK: recount-stats")
+
+
+@click.command("sync-faculties")
+@with_appcontext
+def sync_faculties_command():
+    """FACULTY_DEPARTMENTS'teki yeni fakülte / bölümleri tablolara ekler."""
+    added, updated = sync_reference_tables()
+    print(f"OK: {added} fakülte/bölüm eklendi, {updated} öğrenci eşlendi")
+
+
+@click.command("import-students")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--added-by", default="admin", show_default=True, help="Kayıtların ekleyeni")
+@click.option("--chunk-size", default=importer.DEFAULT_CHUNK_SIZE, show_default=True)
+@click.option("--report", "report_path", type=click.Path(dir_okay=False),
+              help="Sorunlu satırların yazılacağı CSV")
+@with_appcontext
+def import_students_command(path, added_by, chunk_size, report_path):
+    """CSV dosyasından toplu öğrenci ekler."""
+    report = importer.ImportReport(max_issues=0)
+    report_file = open(report_path, "w", newline="", encoding="utf-8") if report_path else None
+    try:
+        if report_file:
+            report_writer = csv.writer(report_file)
+            report_writer.writerow(["satir", "tur", "aciklama"])
+            report.on_issue = lambda line, kind, message: report_writer.writerow([line, kind, message])
+        with open(path, encoding="utf-8-sig", newline="") as f:
+            importer.import_students(f, added_by=added_by, chunk_size=chunk_size, report=report)
+    finally:
+        if report_file:
+            report_file.close()
+    print(f"OK: {report.rows} satır, {report.created} eklendi, "
+          f"{report.duplicates} mükerrer, {report.errors} hatalı")
+
+
+@click.command("compile-templates")
+@with_appcontext
+def compile_templates_command():
+    """Tüm şablonları derleyip bytecode önbelleğine yazar (deploy öncesi)."""
+    env = current_app.jinja_env
+    if env.bytecode_cache is None:
+        raise click.ClickException("TEMPLATE_CACHE_DIR kapalı; bytecode önbelleği yok.")
+    names = env.list_templates(extensions=["html"])
+    for name in names:
+        env.get_template(name)
+    print(f"OK: {len(names)} şablon -> {env.bytecode_cache.directory}")
+
+
+@click.command("build-assets")
+def build_assets_command():
+    """CSS / JS paketlerini ve .gz / .br sürümlerini static/dist'e yazar (deploy öncesi)."""
+    written = assets.bundles.build()
+    if assets.brotli is None:
+        print("UYARI: brotli kurulu değil; yalnızca .gz üretildi")
+    for filename in written:
+        print(" ", filename)
+    print(f"OK: {len(written)} dosya -> {assets.DIST_DIR}")
+
+
+@click.group("jobs")
+def jobs_cli():
+    """Arka plan işleri (bkz. jobs.py)."""
+
+
+@jobs_cli.command("enqueue")
+@click.argument("kind", type=click.Choice(sorted(jobs.JOBS)))
+@click.option("--param", "params", multiple=True, metavar="AD=DEĞER", help="İş parametresi")
+@with_appcontext
+def enqueue_job_command(kind, params):
+    """İşi kuyruğa ekler; işçi (thread, inline ya da `flask jobs worker`) çalıştırır."""
+    j = jobs.enqueue(kind, dict(p.split("=", 1) for p in params), created_by="cli")
+    print(f"OK: iş #{j.id} ({j.kind}) {j.status}")
+
+
+@jobs_cli.command("worker")
+@click.option("--threads", type=int, help="Thread sayısı (varsayılan JOB_THREADS)")
+@click.option("--once", is_flag=True, help="Sıra boşalınca çık (cron / tek seferlik)")
+@with_appcontext
+def job_worker_command(threads, once):
+    """İşçiyi ön planda çalıştırır (JOB_WORKER=process)."""
+    worker = jobs.worker_from_env(current_app._get_current_object())
+    if threads:
+        worker.threads = threads
+    print(f"İşçi başladı: {worker.threads} thread" + (" (--once)" if once else ""))
+    worker.run(once=once)
+
+
+@jobs_cli.command("list")
+@click.option("--limit", default=20, show_default=True)
+@with_appcontext
+def list_jobs_command(limit):
+    """Son işler."""
+    for j in jobs.recent_jobs(limit):
+        progress = f"{j.done}/{j.total}" if j.total else str(j.done)
+        print(f"#{j.id:<5} {j.kind:16s} {j.status:10s} {progress:>12s}  {j.message or ''}")
+
+
+@jobs_cli.command("cancel")
+@click.argument("job_id", type=int)
+@with_appcontext
+def cancel_job_command(job_id):
+    """Bekleyen işi iptal eder; çalışan iş sonraki adımında durur."""
+    j = jobs.request_cancel(job_id)
+    if j is None:
+        raise click.ClickException(f"İş bulunamadı: {job_id}")
+    print(f"OK: iş #{j.id} {j.status}" + (" (iptal istendi)" if j.cancel_requested else ""))
+
+
+def init_cli(app):
+    init_migrate(app)
+    app.cli.add_command(recount_stats_command)
+    app.cli.add_command(sync_faculties_command)
+    app.cli.add_command(import_students_command)
+    app.cli.add_command(compile_templates_command)
+    app.cli.add_command(build_assets_command)
+    app.cli.add_command(jobs_cli)
@@ -0,0 +1,385 @@
+"""
+İstek düzeyinde ölçüm: WSGI middleware'i (ProxyFix'in dışında) her istek için
+süre, SQL ifade sayısı / süresi, şablon render süresi ve yanıt boyutunu toplar.
+
+- Server-Timing başlığı (tarayıcı DevTools > Network > Timing) SQL sayısı /
+  süresi gibi iç ayrıntılar taşır: varsayılan olarak yalnızca X-Metrics-Token
+  başlığı INIT_TOKEN'la eşleşen isteklere eklenir (/metrics ile aynı token).
+- Toplamlar endpoint bazında bellekte tutulur ve /metrics'te Prometheus metin
+  biçiminde verilir. Her process'in (gunicorn worker'ı) kendi sayaçları vardır.
+- PROFILE_SLOW_MS verilirse örnekleyici profiler açılır: istek süresince
+  çalışan thread'in yığını PROFILE_INTERVAL_MS'de bir örneklenir; istek eşikten
+  uzun sürerse örnekler PROFILE_DIR altına "folded" biçimde yazılır
+  (flamegraph.pl / speedscope doğrudan açar).
+
+Ayarlar (ortam):
+  METRICS             middleware açık/kapalı          (1)
+  SERVER_TIMING       Server-Timing her yanıtta; 0 = yalnızca
+                      token'lı isteklerde               (0)
+  PROFILE_SLOW_MS     profil eşiği, ms; 0 = kapalı    (0)
+  PROFILE_INTERVAL_MS örnekleme aralığı, ms           (5)
+  PROFILE_DIR         profil dosyaları                (<tmp>/hts-profiles)
+"""
+import hmac
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+from flask import (
+    Response, current_app, request, abort,
+    request_started, before_render_template, template_rendered,
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from database import env_flag, env_int, pool_metrics
+from models import db
+
+# İstek süresi histogramının sınırları (saniye)
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Eşleşmeyen URL'ler tek etikette toplanır (etiket sayısı sınırsız büyümesin)
+UNMATCHED = "<unmatched>"
+
+_current = ContextVar("request_stats", default=None)
+
+
+class RequestStats:
+    """Tek isteğin ölçümleri."""
+    __slots__ = ("start", "endpoint", "sql_count", "sql_time", "template_time",
+                 "_template_starts", "bytes", "status", "app_time")
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.endpoint = UNMATCHED
+        self.sql_count = 0
+        self.sql_time = 0.0
+        self.template_time = 0.0
+        self._template_starts = []
+        self.bytes = 0
+        self.status = 0
+        self.app_time = 0.0
+
+    def server_timing(self):
+        return (f'app;dur={self.app_time * 1000:.1f}, '
+                f'db;dur={self.sql_time * 1000:.1f};desc="{self.sql_count} queries", '
+                f'tpl;dur={self.template_time * 1000:.1f}')
+
+
+# -------------------------------
+# Endpoint / SQL / şablon olayları
+# -------------------------------
+def _request_started(sender, **extra):
+    stats = _current.get()
+    if stats is not None and request.url_rule is not None:
+        stats.endpoint = request.url_rule.endpoint
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    starts = conn.info.get("query_start")
+    if stats is not None and starts:
+        stats.sql_count += 1
+        stats.sql_time += time.perf_counter() - starts.pop()
+
+
+def _before_render(sender, template, context, **extra):
+    stats = _current.get()
+    if stats is not None:
+        stats._template_starts.append(time.perf_counter())
+
+
+def _after_render(sender, template, context, **extra):
+    stats = _current.get()
+    if stats is not None and stats._template_starts:
+        stats.template_time += time.perf_counter() - stats._template_starts.pop()
+
+
+request_started.connect(_request_started)
+before_render_template.connect(_before_render)
+template_rendered.connect(_after_render)
+
+
+# -------------------------------
+# Toplamlar
+# -------------------------------
+class MetricsRegistry:
+    """Endpoint / method / status bazında toplamlar (thread-safe)."""
+
+    def __init__(self, buckets=DURATION_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._series = {}
+
+    def observe(self, endpoint, method, status, duration, stats):
+        key = (endpoint, method, str(status))
+        with self._lock:
+            s = self._series.get(key)
+            if s is None:
+                s = self._series[key] = {
+                    "count": 0, "sum": 0.0, "buckets": [0] * len(self.buckets),
+                    "sql_count": 0, "sql_time": 0.0, "template_time": 0.0, "bytes": 0,
+                }
+            s["count"] += 1
+            s["sum"] += duration
+            for i, bound in enumerate(self.buckets):
+                if duration <= bound:
+                    s["buckets"][i] += 1
+            s["sql_count"] += stats.sql_count
+            s["sql_time"] += stats.sql_time
+            s["template_time"] += stats.template_time
+            s["bytes"] += stats.bytes
+
+    def render(self, pool_snapshot=None):
+        """Prometheus metin biçimi (text/plain; version=0.0.4)."""
+        with self._lock:
+            series = sorted((k, dict(v, buckets=list(v["buckets"]))) for k, v in self._series.items())
+
+        out = []
+
+        def metric(name, kind, help_text, rows):
+            out.append(f"# HELP {name} {help_text}")
+            out.append(f"# TYPE {name} {kind}")
+            out.extend(rows)
+
+        def labels(key, **extra):
+            pairs = dict(zip(("endpoint", "method", "status"), key), **extra)
+            return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs.items()) + "}"
+
+        hist = []
+        for key, s in series:
+            for bound, n in zip(self.buckets, s["buckets"]):
+                hist.append(f"hts_http_request_duration_seconds_bucket{labels(key, le=repr(bound))} {n}")
+            hist.append(f"hts_http_request_duration_seconds_bucket{labels(key, le='+Inf')} {s['count']}")
+            hist.append(f"hts_http_request_duration_seconds_sum{labels(key)} {s['sum']:.6f}")
+            hist.append(f"hts_http_request_duration_seconds_count{labels(key)} {s['count']}")
+        metric("hts_http_request_duration_seconds", "histogram", "İstek süresi.", hist)
+
+        for name, field, help_text, fmt in (
+            ("hts_db_statements_total", "sql_count", "Çalıştırılan SQL ifadesi.", "d"),
+            ("hts_db_duration_seconds_total", "sql_time", "SQL ifadelerinde geçen süre.", ".6f"),
+            ("hts_template_render_seconds_total", "template_time", "Şablon render süresi.", ".6f"),
+            ("hts_http_response_bytes_total", "bytes", "Gönderilen yanıt gövdesi.", "d"),
+        ):
+            metric(name, "counter", help_text,
+                   [f"{name}{labels(key)} {s[field]:{fmt}}" for key, s in series])
+
+        if pool_snapshot:
+            for name, field, kind, help_text in (
+                ("hts_db_pool_checkouts_total", "checkouts", "counter", "Havuzdan alınan bağlantı."),
+                ("hts_db_pool_wait_seconds_total", "wait_total_ms", "counter", "Bağlantı bekleme süresi."),
+                ("hts_db_pool_timeouts_total", "timeouts", "counter", "Bağlantı bekleme zaman aşımı."),
+                ("hts_db_connects_total", "connects", "counter", "Açılan DB bağlantısı."),
+                ("hts_db_pool_checked_out", "checked_out", "gauge", "Kullanımdaki bağlantı."),
+            ):
+                if field in pool_snapshot:
+                    value = pool_snapshot[field]
+                    if field.endswith("_ms"):
+                        value = value / 1000
+                    metric(name, kind, help_text, [f"{name} {value}"])
+        return "\n".join(out) + "\n"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+registry = MetricsRegistry()
+
+
+# -------------------------------
+# Örnekleyici profiler
+# -------------------------------
+class SamplingProfiler:
+    """
+    Aktif isteklerin thread'lerini arka plan thread'inden örnekler. Yalnızca
+    PROFILE_SLOW_MS'den uzun süren isteklerin örnekleri diske yazılır.
+    """
+
+    def __init__(self, interval, directory):
+        self.interval = interval
+        self.directory = directory
+        self._active = {}  # thread id -> Counter(folded stack)
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+            self._thread.start()
+
+    def start(self):
+        samples = Counter()
+        with self._lock:
+            self._active[threading.get_ident()] = samples
+            self._ensure_thread()
+        return samples
+
+    def stop(self):
+        with self._lock:
+            return self._active.pop(threading.get_ident(), None)
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                active = list(self._active.items())
+            if not active:
+                continue
+            frames = sys._current_frames()
+            for ident, samples in active:
+                frame = frames.get(ident)
+                if frame is not None:
+                    samples[_fold(frame)] += 1
+
+    def dump(self, samples, endpoint, duration):
+        os.makedirs(self.directory, exist_ok=True)
+        name = re.sub(r"[^\w.-]", "_", endpoint)
+        path = os.path.join(self.directory,
+                            f"{time.strftime('%Y%m%d-%H%M%S')}-{name}-{duration * 1000:.0f}ms.folded")
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in samples.most_common():
+                f.write(f"{stack} {count}\n")
+        return path
+
+
+def _fold(frame):
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+        frame = frame.f_back
+    return ";".join(reversed(stack))
+
+
+# -------------------------------
+# WSGI middleware
+# -------------------------------
+class MetricsMiddleware:
+    def __init__(self, wsgi_app, registry=registry, server_timing=False, config=None,
+                 profile_slow_ms=0, profile_interval_ms=5, profile_dir=None):
+        self.wsgi_app = wsgi_app
+        self.registry = registry
+        self.server_timing = server_timing
+        # INIT_TOKEN istek anında okunur (create_app config'i middleware'den sonra kurar)
+        self.config = config if config is not None else {}
+        self.profile_slow = profile_slow_ms / 1000
+        self.profiler = None
+        if profile_slow_ms > 0:
+            self.profiler = SamplingProfiler(
+                profile_interval_ms / 1000,
+                profile_dir or os.path.join(tempfile.gettempdir(), "hts-profiles"),
+            )
+
+    def __call__(self, environ, start_response):
+        stats = RequestStats()
+        token = _current.set(stats)
+        samples = self.profiler.start() if self.profiler else None
+        server_timing = self.server_timing or self._has_token(environ)
+
+        def _start_response(status, headers, exc_info=None):
+            stats.status = int(status.split(" ", 1)[0])
+            stats.app_time = time.perf_counter() - stats.start
+            if server_timing:
+                headers = list(headers) + [("Server-Timing", stats.server_timing())]
+            return start_response(status, headers, exc_info)
+
+        try:
+            body = self.wsgi_app(environ, _start_response)
+        except BaseException:
+            self._finish(environ, stats, token, samples)
+            raise
+        return _ClosingIterator(body, stats, lambda: self._finish(environ, stats, token, samples))
+
+    def _has_token(self, environ):
+        token = self.config.get("INIT_TOKEN")
+        sent = environ.get("HTTP_X_METRICS_TOKEN")
+        return bool(token and sent) and hmac.compare_digest(sent.encode(), token.encode())
+
+    def _finish(self, environ, stats, token, samples):
+        duration = time.perf_counter() - stats.start
+        try:
+            _current.reset(token)
+        except ValueError:
+            _current.set(None)  # akış başka bir context'te bitti
+        endpoint = stats.endpoint
+        self.registry.observe(endpoint, environ.get("REQUEST_METHOD", ""),
+                              stats.status or 500, duration, stats)
+        if self.profiler:
+            self.profiler.stop()
+            if samples and duration >= self.profile_slow:
+                path = self.profiler.dump(samples, endpoint, duration)
+                print(f"SLOW REQUEST {endpoint} {duration * 1000:.0f}ms -> {path}")
+
+
+class _ClosingIterator:
+    """Gövde boyutunu sayar; gövde bitince ya da close()'da ölçümü bir kez tamamlar."""
+
+    def __init__(self, body, stats, on_finish):
+        self._body = body
+        self._iter = iter(body)
+        self._stats = stats
+        self._on_finish = on_finish
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            chunk = next(self._iter)
+        except StopIteration:
+            self._finish()
+            raise
+        self._stats.bytes += len(chunk)
+        return chunk
+
+    def _finish(self):
+        on_finish, self._on_finish = self._on_finish, None
+        if on_finish is not None:
+            on_finish()
+
+    def close(self):
+        try:
+            if hasattr(self._body, "close"):
+                self._body.close()
+        finally:
+            self._finish()
+
+
+def init_app(app):
+    """Middleware'i (ortam ayarlarıyla) ve /metrics endpoint'ini ekler."""
+    env = os.environ
+    if not env_flag(env, "METRICS", "1"):
+        return
+    app.wsgi_app = MetricsMiddleware(
+        app.wsgi_app,
+        server_timing=env_flag(env, "SERVER_TIMING", "0"),
+        config=app.config,
+        profile_slow_ms=env_int(env, "PROFILE_SLOW_MS", 0),
+        profile_interval_ms=env_int(env, "PROFILE_INTERVAL_MS", 5),
+        profile_dir=env.get("PROFILE_DIR"),
+    )
+    app.add_url_rule("/metrics", "metrics", metrics_view)
+
+
+def metrics_view():
+    if request.args.get("token") != current_app.config["INIT_TOKEN"]:
+        abort(403)
+    body = registry.render(pool_metrics.snapshot(db.engine.pool))
+    return Response(body, mimetype="text/plain; version=0.0.4")
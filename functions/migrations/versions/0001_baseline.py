@@ -0,0 +1,89 @@
+"""baseline: users, student, student_note
+
+Eski __migrate_all endpoint'inin ALTER listesinin yerini alır. Tablolar
+create_all ile ya da eski ALTER'larla kurulmuş veritabanlarında da
+güvenle çalışır: var olan tablo / kolonlara dokunmaz.
+
+Revision ID: 0001_baseline
+Revises:
+Create Date: 2026-10-18 10:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001_baseline'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+# Sonradan eklenmiş (eski migrate_all'un eklediği) student kolonları
+LEGACY_STUDENT_COLUMNS = [
+    ('status', lambda: sa.Column('status', sa.String(20), server_default='cozulmedi')),
+    ('department', lambda: sa.Column('department', sa.String(200))),
+    ('faculty', lambda: sa.Column('faculty', sa.String(200))),
+    ('problem', lambda: sa.Column('problem', sa.Text())),
+    ('created_at', lambda: sa.Column('created_at', sa.DateTime(),
+                                     server_default=sa.func.current_timestamp())),
+]
+
+
+def upgrade():
+    bind = op.get_bind()
+    insp = sa.inspect(bind)
+    tables = set(insp.get_table_names())
+
+    if 'users' not in tables:
+        op.create_table(
+            'users',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('username', sa.String(80), nullable=False, unique=True),
+            sa.Column('password', sa.Text(), nullable=False),
+        )
+    elif bind.dialect.name == 'postgresql':
+        # eski şemalarda password VARCHAR(…) idi; uzun hash'ler sığmıyordu
+        op.alter_column('users', 'password', type_=sa.Text(), existing_nullable=False)
+
+    if 'student' not in tables:
+        op.create_table(
+            'student',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('name', sa.String(150), nullable=False),
+            sa.Column('phone', sa.String(30)),
+            sa.Column('school_no', sa.String(30)),
+            sa.Column('added_by', sa.String(80)),
+            *[make() for _, make in LEGACY_STUDENT_COLUMNS],
+        )
+    else:
+        existing = {c['name'] for c in insp.get_columns('student')}
+        for name, make in LEGACY_STUDENT_COLUMNS:
+            if name in existing:
+                continue
+            column = make()
+            if name == 'created_at' and bind.dialect.name == 'sqlite':
+                # SQLite ADD COLUMN sabit olmayan default kabul etmiyor
+                column.server_default = None
+                op.add_column('student', column)
+                op.execute('UPDATE student SET created_at = CURRENT_TIMESTAMP '
+                           'WHERE created_at IS NULL')
+            else:
+                op.add_column('student', column)
+
+    if 'student_note' not in tables:
+        op.create_table(
+            'student_note',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('student_id', sa.Integer(), sa.ForeignKey('student.id'), nullable=False),
+            sa.Column('text', sa.Text(), nullable=False),
+            sa.Column('author', sa.String(80)),
+            sa.Column('created_at', sa.DateTime()),
+        )
+
+
+def downgrade():
+    op.drop_table('student_note')
+    op.drop_table('student')
+    op.drop_table('users')
@@ -0,0 +1,140 @@
+"""search: normalized search_key, faculty/department indexes, trigram / FTS5
+
+Revision ID: 0002_search
+Revises: 0001_baseline
+Create Date: 2026-10-18 10:05:00
+
+"""
+from alembic import op
+import re
+
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002_search'
+down_revision = '0001_baseline'
+branch_labels = None
+depends_on = None
+
+
+BACKFILL_BATCH = 500
+
+
+# -------------------------------
+# Bu revizyonun yazıldığı andaki search.py kuralları (donmuş kopya): sonradan
+# search.py değişirse bu revizyonun boş veritabanında yaptığı iş değişmesin.
+# Anahtarları güncel kurallarla yeniden hesaplamak için: `reindex-search` işi.
+# -------------------------------
+_TR_LOWER = str.maketrans({'İ': 'i', 'I': 'ı'})
+_FOLD = str.maketrans('ıçğöşüâîû', 'icgosuaiu')
+_NON_DIGIT = re.compile(r'\D')
+
+
+def _fold(value):
+    if not value:
+        return ''
+    return ' '.join(value.translate(_TR_LOWER).lower().translate(_FOLD).split())
+
+
+def _build_search_key(name, phone, school_no):
+    return '|'.join((_fold(name), _NON_DIGIT.sub('', phone or ''), _fold(school_no)))
+
+
+POSTGRES_DDL = [
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+    'CREATE INDEX IF NOT EXISTS ix_student_search_key_trgm '
+    'ON student USING gin (search_key gin_trgm_ops)',
+]
+
+SQLITE_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS student_fts USING fts5("
+    "search_key, content='student', content_rowid='id', tokenize='trigram')",
+    'CREATE TRIGGER IF NOT EXISTS student_fts_ai AFTER INSERT ON student BEGIN '
+    'INSERT INTO student_fts(rowid, search_key) VALUES (new.id, new.search_key); END',
+    'CREATE TRIGGER IF NOT EXISTS student_fts_ad AFTER DELETE ON student BEGIN '
+    'INSERT INTO student_fts(student_fts, rowid, search_key) '
+    "VALUES ('delete', old.id, old.search_key); END",
+    'CREATE TRIGGER IF NOT EXISTS student_fts_au AFTER UPDATE OF search_key ON student BEGIN '
+    'INSERT INTO student_fts(student_fts, rowid, search_key) '
+    "VALUES ('delete', old.id, old.search_key); "
+    'INSERT INTO student_fts(rowid, search_key) VALUES (new.id, new.search_key); END',
+]
+
+SQLITE_REBUILD = "INSERT INTO student_fts(student_fts) VALUES ('rebuild')"
+
+
+def _schema_statements(dialect):
+    if dialect.startswith('postgresql'):
+        return POSTGRES_DDL
+    if dialect == 'sqlite':
+        return SQLITE_DDL
+    return []
+
+
+def _backfill_search_keys(bind):
+    student = sa.table(
+        'student',
+        sa.column('id'), sa.column('name'), sa.column('phone'),
+        sa.column('school_no'), sa.column('search_key'),
+    )
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(student.c.id, student.c.name, student.c.phone, student.c.school_no)
+            .where(student.c.search_key.is_(None), student.c.id > last_id)
+            .order_by(student.c.id).limit(BACKFILL_BATCH)
+        ).all()
+        if not rows:
+            break
+        bind.execute(
+            student.update()
+            .where(student.c.id == sa.bindparam('sid'))
+            .values(search_key=sa.bindparam('key')),
+            [{'sid': r.id, 'key': _build_search_key(r.name, r.phone, r.school_no)}
+             for r in rows],
+        )
+        last_id = rows[-1].id
+
+
+def upgrade():
+    bind = op.get_bind()
+    insp = sa.inspect(bind)
+
+    if 'search_key' not in {c['name'] for c in insp.get_columns('student')}:
+        op.add_column('student', sa.Column('search_key', sa.String(300)))
+
+    indexes = {ix['name'] for ix in insp.get_indexes('student')}
+    for column in ('department', 'faculty'):
+        if f'ix_student_{column}' not in indexes:
+            op.create_index(f'ix_student_{column}', 'student', [column])
+
+    _backfill_search_keys(bind)
+
+    for stmt in _schema_statements(bind.dialect.name):
+        if stmt.startswith('CREATE EXTENSION'):
+            # eklenti DBA tarafından kurulmuş ama CREATE yetkimiz yoksa devam et;
+            # eklenti gerçekten yoksa bir sonraki GIN index adımı hata verir
+            try:
+                with bind.begin_nested():
+                    op.execute(stmt)
+            except Exception as e:
+                print(f'[0002_search] {stmt} -> {e}')
+        else:
+            op.execute(stmt)
+    if bind.dialect.name == 'sqlite':
+        op.execute(SQLITE_REBUILD)
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name == 'sqlite':
+        for trigger in ('student_fts_ai', 'student_fts_ad', 'student_fts_au'):
+            op.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+        op.execute('DROP TABLE IF EXISTS student_fts')
+    elif bind.dialect.name == 'postgresql':
+        op.execute('DROP INDEX IF EXISTS ix_student_search_key_trgm')
+    op.drop_index('ix_student_faculty', table_name='student')
+    op.drop_index('ix_student_department', table_name='student')
+    with op.batch_alter_table('student') as batch_op:
+        batch_op.drop_column('search_key')
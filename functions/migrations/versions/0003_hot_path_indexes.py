@@ -0,0 +1,42 @@
+"""hot path indexes for dashboard / main / view_student
+
+- (status, id): dashboard durum filtresi + id'ye göre keyset sayfalama
+- (added_by): dashboard ekleyen filtresi, main ekrandaki gruplama
+- (created_at): tarih aralığı sorguları
+- student_note (student_id, created_at DESC): öğrenci detayındaki not listesi
+
+Revision ID: 0003_hot_path_indexes
+Revises: 0002_search
+Create Date: 2026-10-18 10:10:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003_hot_path_indexes'
+down_revision = '0002_search'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ('ix_student_status_id', 'student', ['status', 'id']),
+    ('ix_student_added_by', 'student', ['added_by']),
+    ('ix_student_created_at', 'student', ['created_at']),
+    ('ix_student_note_student_created', 'student_note',
+     ['student_id', sa.text('created_at DESC')]),
+]
+
+
+def upgrade():
+    insp = sa.inspect(op.get_bind())
+    for name, table, columns in INDEXES:
+        if name not in {ix['name'] for ix in insp.get_indexes(table)}:
+            op.create_index(name, table, columns)
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
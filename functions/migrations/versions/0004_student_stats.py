@@ -0,0 +1,39 @@
+"""student_stats: per added_by / status counters for /main and dashboard
+
+Revision ID: 0004_student_stats
+Revises: 0003_hot_path_indexes
+Create Date: 2026-10-18 11:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004_student_stats'
+down_revision = '0003_hot_path_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if 'student_stats' not in sa.inspect(op.get_bind()).get_table_names():
+        op.create_table(
+            'student_stats',
+            sa.Column('added_by', sa.String(80), nullable=False),
+            sa.Column('status', sa.String(20), nullable=False),
+            sa.Column('count', sa.Integer(), nullable=False),
+            sa.PrimaryKeyConstraint('added_by', 'status'),
+        )
+
+    # Tekrar çalıştırıldığında da doğru sonuç için baştan say
+    op.execute('DELETE FROM student_stats')
+    op.execute(
+        "INSERT INTO student_stats (added_by, status, count) "
+        "SELECT COALESCE(added_by, ''), COALESCE(status, ''), COUNT(*) "
+        "FROM student GROUP BY COALESCE(added_by, ''), COALESCE(status, '')"
+    )
+
+
+def downgrade():
+    op.drop_table('student_stats')
@@ -0,0 +1,42 @@
+"""page versions: student.row_version / updated_at and data_versions counters
+
+Revision ID: 0005_page_versions
+Revises: 0004_student_stats
+Create Date: 2026-10-18 11:30:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005_page_versions'
+down_revision = '0004_student_stats'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    insp = sa.inspect(op.get_bind())
+
+    columns = {c['name'] for c in insp.get_columns('student')}
+    if 'row_version' not in columns:
+        op.add_column('student', sa.Column('row_version', sa.Integer(), nullable=False,
+                                           server_default='0'))
+    if 'updated_at' not in columns:
+        op.add_column('student', sa.Column('updated_at', sa.DateTime()))
+
+    if 'data_versions' not in insp.get_table_names():
+        op.create_table(
+            'data_versions',
+            sa.Column('scope', sa.String(40), primary_key=True),
+            sa.Column('version', sa.BigInteger(), nullable=False),
+            sa.Column('updated_at', sa.DateTime()),
+        )
+
+
+def downgrade():
+    op.drop_table('data_versions')
+    with op.batch_alter_table('student') as batch_op:
+        batch_op.drop_column('updated_at')
+        batch_op.drop_column('row_version')
@@ -0,0 +1,34 @@
+"""indexes on student.school_no / phone for import de-duplication
+
+Revision ID: 0006_import_dedup_indexes
+Revises: 0005_page_versions
+Create Date: 2026-10-18 12:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006_import_dedup_indexes'
+down_revision = '0005_page_versions'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ('ix_student_school_no', 'student', ['school_no']),
+    ('ix_student_phone', 'student', ['phone']),
+]
+
+
+def upgrade():
+    insp = sa.inspect(op.get_bind())
+    for name, table, columns in INDEXES:
+        if name not in {ix['name'] for ix in insp.get_indexes(table)}:
+            op.create_index(name, table, columns)
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,92 @@
+"""note summaries: student.note_count / last_note_at, activity index, cascading note FK
+
+Revision ID: 0007_note_summaries
+Revises: 0006_import_dedup_indexes
+Create Date: 2026-10-18 13:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0007_note_summaries'
+down_revision = '0006_import_dedup_indexes'
+branch_labels = None
+depends_on = None
+
+
+FK_NAME = 'fk_student_note_student_id_student'
+# SQLite'taki isimsiz FK'yı batch modunda bu adla bulabilmek için
+NAMING_CONVENTION = {'fk': 'fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s'}
+
+
+def _student_fk(insp):
+    for fk in insp.get_foreign_keys('student_note'):
+        if fk['referred_table'] == 'student':
+            return fk
+    return None
+
+
+def _index_names(bind, table):
+    # SQLite ifade index'lerini (ix_student_activity) yansıtamaz ve SAWarning
+    # verir; varlık kontrolü için adlar sqlite_master'dan okunur
+    if bind.dialect.name == 'sqlite':
+        return set(bind.execute(
+            sa.text("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = :t"),
+            {'t': table},
+        ).scalars())
+    return {ix['name'] for ix in sa.inspect(bind).get_indexes(table)}
+
+
+def _restore_note_index():
+    # SQLite'ta batch tabloyu yeniden kurar; yansıtılan index DESC'i kaybeder
+    if op.get_bind().dialect.name == 'sqlite':
+        op.drop_index('ix_student_note_student_created', table_name='student_note')
+        op.create_index('ix_student_note_student_created', 'student_note',
+                        ['student_id', sa.text('created_at DESC')])
+
+
+def upgrade():
+    insp = sa.inspect(op.get_bind())
+
+    # Silinen öğrencilerden kalan notlar (eski delete_student cascade yapmıyordu)
+    op.execute('DELETE FROM student_note WHERE student_id NOT IN (SELECT id FROM student)')
+
+    fk = _student_fk(insp)
+    if fk is None or (fk.get('options') or {}).get('ondelete', '').upper() != 'CASCADE':
+        with op.batch_alter_table('student_note', naming_convention=NAMING_CONVENTION) as batch_op:
+            if fk is not None:
+                batch_op.drop_constraint(fk['name'] or FK_NAME, type_='foreignkey')
+            batch_op.create_foreign_key(FK_NAME, 'student', ['student_id'], ['id'],
+                                        ondelete='CASCADE')
+        _restore_note_index()
+
+    columns = {c['name'] for c in insp.get_columns('student')}
+    if 'note_count' not in columns:
+        op.add_column('student', sa.Column('note_count', sa.Integer(), nullable=False,
+                                           server_default='0'))
+    if 'last_note_at' not in columns:
+        op.add_column('student', sa.Column('last_note_at', sa.DateTime()))
+
+    # (student_id, created_at) index'i üzerinden öğrenci başına tek aralık taraması
+    op.execute(
+        'UPDATE student SET '
+        'note_count = (SELECT count(*) FROM student_note n WHERE n.student_id = student.id), '
+        'last_note_at = (SELECT max(n.created_at) FROM student_note n WHERE n.student_id = student.id)'
+    )
+
+    if 'ix_student_activity' not in _index_names(op.get_bind(), 'student'):
+        op.create_index('ix_student_activity', 'student',
+                        [sa.text('coalesce(last_note_at, created_at)'), 'id'])
+
+
+def downgrade():
+    op.drop_index('ix_student_activity', table_name='student')
+    with op.batch_alter_table('student') as batch_op:
+        batch_op.drop_column('last_note_at')
+        batch_op.drop_column('note_count')
+    with op.batch_alter_table('student_note', naming_convention=NAMING_CONVENTION) as batch_op:
+        batch_op.drop_constraint(FK_NAME, type_='foreignkey')
+        batch_op.create_foreign_key(FK_NAME, 'student', ['student_id'], ['id'])
+    _restore_note_index()
@@ -0,0 +1,39 @@
+"""audit events: append-only student / note change history
+
+Revision ID: 0008_audit_events
+Revises: 0007_note_summaries
+Create Date: 2026-10-18 14:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0008_audit_events'
+down_revision = '0007_note_summaries'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    insp = sa.inspect(op.get_bind())
+    if 'audit_events' in insp.get_table_names():
+        return
+    op.create_table(
+        'audit_events',
+        sa.Column('id', sa.BigInteger().with_variant(sa.Integer(), 'sqlite'), primary_key=True),
+        sa.Column('at', sa.DateTime(), nullable=False),
+        sa.Column('actor', sa.String(80)),
+        sa.Column('action', sa.String(20), nullable=False),
+        sa.Column('entity', sa.String(20), nullable=False),
+        sa.Column('entity_id', sa.Integer(), nullable=False),
+        sa.Column('student_id', sa.Integer(), nullable=False),
+        sa.Column('changes', sa.JSON()),
+    )
+    op.create_index('ix_audit_events_student_id', 'audit_events', ['student_id', 'id'])
+
+
+def downgrade():
+    op.drop_index('ix_audit_events_student_id', table_name='audit_events')
+    op.drop_table('audit_events')
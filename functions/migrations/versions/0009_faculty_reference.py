@@ -0,0 +1,339 @@
+"""faculty / department reference tables, integer student FKs
+
+Revision ID: 0009_faculty_reference
+Revises: 0008_audit_events
+Create Date: 2026-10-18 15:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0009_faculty_reference'
+down_revision = '0008_audit_events'
+branch_labels = None
+depends_on = None
+
+
+FK_FACULTY = 'fk_student_faculty_id_faculty'
+FK_DEPARTMENT = 'fk_student_department_id_department'
+NAMING_CONVENTION = {'fk': 'fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s'}
+
+
+# -------------------------------
+# Bu revizyonun yazıldığı andaki veri ve kurallar (donmuş kopya): faculties.py /
+# search.py sonradan değişse de bu revizyonun boş veritabanında yaptığı iş
+# değişmez. Listeye sonradan eklenenler için: `flask sync-faculties`.
+# -------------------------------
+FACULTY_DEPARTMENTS = {
+    "Tıp Fakültesi": ["TIP"],
+    "Diş Hekimliği Fakültesi": ["DİŞ HEKİMLİĞİ"],
+    "İktisadi, İdari ve Sosyal Bilimler Fakültesi": [
+        "EKONOMİ",
+        "EKONOMİ VE FİNANS",
+        "FİNANS VE BANKACILIK",
+        "HALKLA İLİŞKİLER VE REKLAMCILIK",
+        "HAVACILIK YÖNETİMİ (TÜRKÇE-İNGİLİZCE)",
+        "İNGİLİZ DİLİ VE EDEBİYATI (İNGİLİZCE)",
+        "İNGİLİZCE MÜTERCİM TERCÜMANLIK",
+        "İŞLETME (TÜRKÇE - İNGİLİZCE)",
+        "PSİKOLOJİ (TÜRKÇE-İNGİLİZCE)",
+        "SİYASET BİLİMİ VE KAMU YÖNETİMİ",
+        "MUHASEBE VE FİNANS YÖNETİMİ",
+        "SERMAYE PİYASASI",
+        "SOSYAL HİZMET",
+        "SOSYOLOJİ",
+        "TURİZM İŞLETMECİLİĞİ",
+        "ULUSLARARASI İLİŞKİLER",
+        "ULUSLARARASI TİCARET VE LOJİSTİK",
+        "YENİ MEDYA VE İLETİŞİM",
+        "YÖNETİM BİLİŞİM SİSTEMLERİ (TÜRKÇE-İNGİLİZCE)",
+    ],
+    "Mühendislik Mimarlık Fakültesi": [
+        "BİLGİSAYAR MÜHENDİSLİĞİ (Türkçe)",
+        "ELEKTRİK - ELEKTRONİK MÜHENDİSLİĞİ (İngilizce)",
+        "ENDÜSTRİ MÜHENDİSLİĞİ",
+        "İNŞAAT MÜHENDİSLİĞİ",
+        "MEKATRONİK MÜHENDİSLİĞİ",
+        "MİMARLIK",
+        "YAZILIM MÜHENDİSLİĞİ (İngilizce)",
+        "MAKİNE MÜHENDİSLİĞİ (İNGİLİZCE)",
+    ],
+    "Sanat ve Tasarım Fakültesi": [
+        "DİJİTAL OYUN TASARIMI",
+        "ENDÜSTRİYEL TASARIM",
+        "GASTRONOMİ VE MUTFAK SANATLARI (TÜRKÇE - İNGİLİZCE)",
+        "GRAFİK TASARIMI",
+        "İLETİŞİM VE TASARIMI",
+        "RADYO, TELEVİZYON VE SİNEMA",
+        "Tekstil ve Moda Tasarımı",
+        "İÇ MİMARLIK (TÜRKÇE-İNGİLİZCE)",
+    ],
+    "Konservatuvar": ["MÜZİK", "SAHNE SANATLARI"],
+    "Beden Eğitimi ve Spor Yüksekokulu": [
+        "ANTRENÖRLÜK EĞİTİMİ",
+        "EGZERSİZ VE SPOR BİLİMLERİ",
+        "REKREASYON",
+        "SPOR YÖNETİCİLİĞİ",
+    ],
+    "Sivil Havacılık Yüksekokulu": [
+        "HAVA TRAFİK KONTROLÜ",
+        "HAVACILIK ELEKTRİK VE ELEKTRONİĞİ",
+        "PİLOTAJ (İNGİLİZCE)",
+        "UÇAK BAKIM VE ONARIM",
+    ],
+    "Uygulamalı Bilimler Yüksekokulu": [
+        "BİLİŞİM SİSTEMLERİ VE TEKNOLOJİLERİ",
+        "TURİZM REHBERLİĞİ",
+        "ULUSLARARASI TİCARET VE İŞLETMECİLİK",
+        "VERİ BİLİMİ VE ANALİTİĞİ",
+        "YAZILIM GELİŞTİRME",
+    ],
+    "Sağlık Bilimleri Fakültesi": [
+        "BESLENME VE DİYETETİK",
+        "DİL VE KONUŞMA TERAPİSİ",
+        "FİZYOTERAPİ VE REHABİLİTASYON",
+        "HEMŞİRELİK",
+        "EBELİK",
+    ],
+    "Meslek Yüksekokulu": [
+        "AŞÇILIK",
+        "BANKACILIK VE SİGORTACILIK",
+        "BİLGİSAYAR PROGRAMCILIĞI",
+        "DENİZ ULAŞTIRMA VE İŞLETME",
+        "DIŞ TİCARET",
+        "ELEKTRİK",
+        "FOTOĞRAFÇILIK VE KAMERAMANLIK",
+        "GRAFİK TASARIMI",
+        "HALKLA İLİŞKİLER VE TANITIM",
+        "İÇ MEKAN TASARIMI",
+        "İNŞAAT TEKNOLOJİSİ",
+        "İŞLETME YÖNETİMİ",
+        "LOJİSTİK PROGRAMI",
+        "MAKİNE",
+        "MEKATRONİK",
+        "Mobil Teknolojileri",
+        "MİMARİ RESTORASYON",
+        "MODA TASARIMI",
+        "MUHASEBE VE VERGİ UYGULAMALARI",
+        "Otomotiv Teknolojisi",
+        "RADYO VE TELEVİZYON PROGRAMCILIĞI",
+        "SİVİL HAVA ULAŞTIRMA İŞLETMECİLİĞİ",
+        "SİVİL HAVACILIK KABİN HİZMETLERİ",
+        "SPOR YÖNETİMİ",
+        "TURİST REHBERLİĞİ",
+        "TURİZM VE OTEL İŞLETMECİLİĞİ",
+        "Uçak Teknolojisi",
+        "ELEKTRONİK TEKNOLOJİSİ",
+        "İNSANSIZ ARAÇ TEKNİKERLİĞİ",
+        "MARINA VE YAT İŞLETMECİLİĞİ",
+        "WEB TASARIMI VE KODLAMA",
+        "YEŞİL VE EKOLOJİK BİNA TEKNİKERLİĞİ",
+        "MAHKEME BÜRO HİZMETLERİ",
+        "İNTERNET VE AĞ TEKNOLOJİLERİ",
+    ],
+    "Sağlık Hizmetleri Meslek Yüksekokulu": [
+        "AĞIZ VE DİŞ SAĞLIĞI",
+        "AMELİYATHANE HİZMETLERİ",
+        "ANESTEZİ",
+        "ÇOCUK GELİŞİMİ",
+        "DİŞ PROTEZ TEKNOLOJİSİ",
+        "DİYALİZ",
+        "ECZANE HİZMETLERİ",
+        "ELEKTRONÖROFİZYOLOJİ",
+        "FİZYOTERAPİ",
+        "İLK VE ACİL YARDIM",
+        "İŞ SAĞLIĞI VE GÜVENLİĞİ",
+        "ODYOMETRİ",
+        "OPTİSYENLİK",
+        "ORTOPEDİK PROTEZ VE ORTEZ",
+        "PATOLOJİ LABORATUVAR TEKNİKLERİ",
+        "RADYOTERAPİ",
+        "SOSYAL HİZMETLER",
+        "TIBBİ DOKÜMANTASYON VE SEKRETERLİK",
+        "TIBBİ GÖRÜNTÜLEME TEKNİKLERİ",
+        "TIBBİ LABORATUVAR TEKNİKLERİ",
+        "TIBBİ VERİ İŞLEME TEKNİKERLİĞİ",
+        "DİJİTAL SAĞLIK SİSTEMLERİ TEKNİKERLİĞİ",
+        "BİYOMEDİKAL CİHAZ TEKNOLOJİLERİ",
+    ],
+}
+
+_TR_LOWER = str.maketrans({'İ': 'i', 'I': 'ı'})
+_FOLD = str.maketrans('ıçğöşüâîû', 'icgosuaiu')
+
+
+def _fold(value):
+    if not value:
+        return ''
+    return ' '.join(value.translate(_TR_LOWER).lower().translate(_FOLD).split())
+
+
+# student tablosu batch ile yeniden kurulunca düşen FTS trigger'ları (0002_search)
+SQLITE_FTS_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS student_fts USING fts5("
+    "search_key, content='student', content_rowid='id', tokenize='trigram')",
+    'CREATE TRIGGER IF NOT EXISTS student_fts_ai AFTER INSERT ON student BEGIN '
+    'INSERT INTO student_fts(rowid, search_key) VALUES (new.id, new.search_key); END',
+    'CREATE TRIGGER IF NOT EXISTS student_fts_ad AFTER DELETE ON student BEGIN '
+    'INSERT INTO student_fts(student_fts, rowid, search_key) '
+    "VALUES ('delete', old.id, old.search_key); END",
+    'CREATE TRIGGER IF NOT EXISTS student_fts_au AFTER UPDATE OF search_key ON student BEGIN '
+    'INSERT INTO student_fts(student_fts, rowid, search_key) '
+    "VALUES ('delete', old.id, old.search_key); "
+    'INSERT INTO student_fts(rowid, search_key) VALUES (new.id, new.search_key); END',
+]
+
+
+def _index_names(bind, table):
+    # SQLite ifade index'lerini (ix_student_activity) yansıtamaz ve SAWarning
+    # verir; varlık kontrolü için adlar sqlite_master'dan okunur
+    if bind.dialect.name == 'sqlite':
+        return set(bind.execute(
+            sa.text("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = :t"),
+            {'t': table},
+        ).scalars())
+    return {ix['name'] for ix in sa.inspect(bind).get_indexes(table)}
+
+
+def _restore_sqlite_student_schema():
+    # SQLite'ta batch tabloyu yeniden kurunca FTS trigger'ları ve ifade index'i düşer
+    bind = op.get_bind()
+    if bind.dialect.name != 'sqlite':
+        return
+    for stmt in SQLITE_FTS_DDL:
+        op.execute(stmt)
+    if 'ix_student_activity' not in _index_names(bind, 'student'):
+        op.create_index('ix_student_activity', 'student',
+                        [sa.text('coalesce(last_note_at, created_at)'), 'id'])
+
+
+def _seed_reference_rows(bind):
+    faculty = sa.table('faculty', sa.column('id'), sa.column('name'))
+    department = sa.table('department', sa.column('id'), sa.column('faculty_id'),
+                          sa.column('name'))
+    existing = {name for (name,) in bind.execute(sa.select(faculty.c.name))}
+    missing = [{'name': n} for n in FACULTY_DEPARTMENTS if n not in existing]
+    if missing:
+        bind.execute(faculty.insert(), missing)
+    faculty_ids = dict(bind.execute(sa.select(faculty.c.name, faculty.c.id)).all())
+
+    existing = set(bind.execute(sa.select(department.c.faculty_id, department.c.name)).all())
+    missing = [{'faculty_id': faculty_ids[fac], 'name': dep}
+               for fac, deps in FACULTY_DEPARTMENTS.items() for dep in deps
+               if (faculty_ids[fac], dep) not in existing]
+    if missing:
+        bind.execute(department.insert(), missing)
+
+    return (
+        bind.execute(sa.select(faculty.c.id, faculty.c.name)).all(),
+        bind.execute(sa.select(department.c.id, department.c.faculty_id, department.c.name)).all(),
+    )
+
+
+def _ids_resolver(faculty_rows, department_rows):
+    """
+    (fakülte, bölüm) serbest metni -> (fakülte id, bölüm id); o günkü
+    faculties.FacultyIndex.ids_for ile aynı kural: eşleşmeyen kısım None,
+    fakülte boşsa ve bölüm tek bir fakülteye aitse fakülte oradan.
+    """
+    faculty_by_fold = {_fold(name): fid for fid, name in faculty_rows}
+    department_by_fold = {(fid, _fold(name)): did for did, fid, name in department_rows}
+    faculties_of = {}
+    for did, fid, name in department_rows:
+        faculties_of.setdefault(_fold(name), []).append(fid)
+
+    def ids_for(fac, dep):
+        fac, dep = _fold((fac or '').strip()), _fold((dep or '').strip())
+        if fac:
+            faculty_id = faculty_by_fold.get(fac)
+        else:
+            candidates = faculties_of.get(dep, []) if dep else []
+            faculty_id = candidates[0] if len(candidates) == 1 else None
+        if faculty_id is None or not dep:
+            return faculty_id, None
+        return faculty_id, department_by_fold.get((faculty_id, dep))
+    return ids_for
+
+
+def _backfill_student_ids(bind, ids_for):
+    # Farklı (fakülte, bölüm) çifti az; her çift için tek UPDATE
+    student = sa.table('student', sa.column('faculty'), sa.column('department'),
+                       sa.column('faculty_id'), sa.column('department_id'))
+    pairs = bind.execute(
+        sa.select(student.c.faculty, student.c.department).distinct()
+        .where(student.c.faculty.isnot(None) | student.c.department.isnot(None))
+    ).all()
+    for fac, dep in pairs:
+        faculty_id, department_id = ids_for(fac, dep)
+        if faculty_id is None and department_id is None:
+            continue
+        bind.execute(
+            student.update()
+            .where(student.c.faculty.is_not_distinct_from(fac),
+                   student.c.department.is_not_distinct_from(dep))
+            .values(faculty_id=faculty_id, department_id=department_id)
+        )
+
+
+def upgrade():
+    bind = op.get_bind()
+    insp = sa.inspect(bind)
+    tables = set(insp.get_table_names())
+
+    if 'faculty' not in tables:
+        op.create_table(
+            'faculty',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('name', sa.String(200), nullable=False, unique=True),
+        )
+    if 'department' not in tables:
+        op.create_table(
+            'department',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('faculty_id', sa.Integer(), sa.ForeignKey('faculty.id'), nullable=False),
+            sa.Column('name', sa.String(200), nullable=False),
+            sa.UniqueConstraint('faculty_id', 'name', name='uq_department_faculty_name'),
+        )
+
+    columns = {c['name'] for c in insp.get_columns('student')}
+    sqlite = bind.dialect.name == 'sqlite'
+    for column, target, fk_name in (('faculty_id', 'faculty.id', FK_FACULTY),
+                                    ('department_id', 'department.id', FK_DEPARTMENT)):
+        if column in columns:
+            continue
+        table = target.split('.')[0]
+        if sqlite:
+            # SQLite ADD COLUMN ... REFERENCES destekler; batch ile tabloyu (FTS
+            # trigger'ları ve ifade index'iyle birlikte) yeniden kurmaya gerek yok
+            op.execute(f'ALTER TABLE student ADD COLUMN {column} INTEGER '
+                       f'CONSTRAINT {fk_name} REFERENCES {table} (id)')
+        else:
+            op.add_column('student', sa.Column(column, sa.Integer()))
+            op.create_foreign_key(fk_name, 'student', table, [column], ['id'])
+
+    _backfill_student_ids(bind, _ids_resolver(*_seed_reference_rows(bind)))
+
+    indexes = _index_names(bind, 'student')
+    for column in ('faculty', 'department'):
+        # metin index'lerinin yerini id + keyset index'leri alır
+        if f'ix_student_{column}' in indexes:
+            op.drop_index(f'ix_student_{column}', table_name='student')
+        if f'ix_student_{column}_id' not in indexes:
+            op.create_index(f'ix_student_{column}_id', 'student', [f'{column}_id', 'id'])
+
+
+def downgrade():
+    for column in ('faculty', 'department'):
+        op.drop_index(f'ix_student_{column}_id', table_name='student')
+        op.create_index(f'ix_student_{column}', 'student', [column])
+    # SQLite FK'lı kolonu DROP COLUMN ile düşüremez; batch tabloyu yeniden kurar
+    with op.batch_alter_table('student', naming_convention=NAMING_CONVENTION) as batch_op:
+        batch_op.drop_constraint(FK_DEPARTMENT, type_='foreignkey')
+        batch_op.drop_constraint(FK_FACULTY, type_='foreignkey')
+        batch_op.drop_column('department_id')
+        batch_op.drop_column('faculty_id')
+    _restore_sqlite_student_schema()
+    op.drop_table('department')
+    op.drop_table('faculty')
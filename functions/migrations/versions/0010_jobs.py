@@ -0,0 +1,47 @@
+"""jobs: persistent background job queue with progress / checkpoint
+
+Revision ID: 0010_jobs
+Revises: 0009_faculty_reference
+Create Date: 2026-10-18 16:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0010_jobs'
+down_revision = '0009_faculty_reference'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    insp = sa.inspect(op.get_bind())
+    if 'jobs' in insp.get_table_names():
+        return
+    op.create_table(
+        'jobs',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('kind', sa.String(50), nullable=False),
+        sa.Column('status', sa.String(20), nullable=False),
+        sa.Column('params', sa.JSON()),
+        sa.Column('checkpoint', sa.JSON()),
+        sa.Column('done', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('total', sa.Integer()),
+        sa.Column('message', sa.Text()),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('cancel_requested', sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column('created_by', sa.String(80)),
+        sa.Column('worker', sa.String(120)),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('started_at', sa.DateTime()),
+        sa.Column('finished_at', sa.DateTime()),
+        sa.Column('heartbeat_at', sa.DateTime()),
+    )
+    op.create_index('ix_jobs_status_id', 'jobs', ['status', 'id'])
+
+
+def downgrade():
+    op.drop_index('ix_jobs_status_id', table_name='jobs')
+    op.drop_table('jobs')
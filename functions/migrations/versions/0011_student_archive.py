@@ -0,0 +1,65 @@
+"""student_archive / student_note_archive: resolved cases moved out of the hot tables
+
+Revision ID: 0011_student_archive
+Revises: 0010_jobs
+Create Date: 2026-10-18 17:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0011_student_archive'
+down_revision = '0010_jobs'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    tables = set(sa.inspect(op.get_bind()).get_table_names())
+    if 'student_archive' not in tables:
+        op.create_table(
+            'student_archive',
+            sa.Column('id', sa.Integer(), primary_key=True, autoincrement=False),
+            sa.Column('name', sa.String(150), nullable=False),
+            sa.Column('phone', sa.String(30)),
+            sa.Column('school_no', sa.String(30)),
+            sa.Column('added_by', sa.String(80)),
+            sa.Column('status', sa.String(20)),
+            sa.Column('department', sa.String(200)),
+            sa.Column('faculty', sa.String(200)),
+            sa.Column('faculty_id', sa.Integer()),
+            sa.Column('department_id', sa.Integer()),
+            sa.Column('problem', sa.Text()),
+            sa.Column('created_at', sa.DateTime()),
+            sa.Column('search_key', sa.String(300)),
+            sa.Column('row_version', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('updated_at', sa.DateTime()),
+            sa.Column('note_count', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('last_note_at', sa.DateTime()),
+            sa.Column('archived_at', sa.DateTime(), nullable=False),
+        )
+        # içe aktarmadaki mükerrer kontrolü arşive de bakar
+        op.create_index('ix_student_archive_phone', 'student_archive', ['phone'])
+        op.create_index('ix_student_archive_school_no', 'student_archive', ['school_no'])
+    if 'student_note_archive' not in tables:
+        op.create_table(
+            'student_note_archive',
+            sa.Column('id', sa.Integer(), primary_key=True, autoincrement=False),
+            sa.Column('student_id', sa.Integer(), nullable=False),
+            sa.Column('text', sa.Text(), nullable=False),
+            sa.Column('author', sa.String(80)),
+            sa.Column('created_at', sa.DateTime()),
+        )
+        op.create_index('ix_student_note_archive_student_created', 'student_note_archive',
+                        ['student_id', 'created_at'])
+
+
+def downgrade():
+    # Arşivdeki satırlar tablolarla birlikte düşer; gerekiyorsa önce geri yüklenmeli
+    op.drop_index('ix_student_note_archive_student_created', table_name='student_note_archive')
+    op.drop_table('student_note_archive')
+    op.drop_index('ix_student_archive_school_no', table_name='student_archive')
+    op.drop_index('ix_student_archive_phone', table_name='student_archive')
+    op.drop_table('student_archive')
@@ -0,0 +1,89 @@
+"""student / student_note: AUTOINCREMENT on SQLite so archived ids are never reused
+
+Revision ID: 0012_sqlite_autoincrement
+Revises: 0011_student_archive
+Create Date: 2026-10-18 18:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0012_sqlite_autoincrement'
+down_revision = '0011_student_archive'
+branch_labels = None
+depends_on = None
+
+
+# tablo -> arşivdeki karşılığı; ikisinde de id korunur (bkz. archive.py)
+TABLES = {'student': 'student_archive', 'student_note': 'student_note_archive'}
+
+# student tablosu batch ile yeniden kurulunca düşen FTS trigger'ları (0002_search)
+SQLITE_FTS_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS student_fts USING fts5("
+    "search_key, content='student', content_rowid='id', tokenize='trigram')",
+    'CREATE TRIGGER IF NOT EXISTS student_fts_ai AFTER INSERT ON student BEGIN '
+    'INSERT INTO student_fts(rowid, search_key) VALUES (new.id, new.search_key); END',
+    'CREATE TRIGGER IF NOT EXISTS student_fts_ad AFTER DELETE ON student BEGIN '
+    'INSERT INTO student_fts(student_fts, rowid, search_key) '
+    "VALUES ('delete', old.id, old.search_key); END",
+    'CREATE TRIGGER IF NOT EXISTS student_fts_au AFTER UPDATE OF search_key ON student BEGIN '
+    'INSERT INTO student_fts(student_fts, rowid, search_key) '
+    "VALUES ('delete', old.id, old.search_key); "
+    'INSERT INTO student_fts(rowid, search_key) VALUES (new.id, new.search_key); END',
+]
+
+
+def _has_autoincrement(bind, table):
+    sql = bind.execute(
+        sa.text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = :t"),
+        {'t': table},
+    ).scalar()
+    return 'AUTOINCREMENT' in (sql or '').upper()
+
+
+def _rebuild(tables, autoincrement):
+    # SQLite AUTOINCREMENT'ı ALTER ile eklemez; batch tabloyu yeniden kurar.
+    # ifade index'i yansıtılamaz (student_note'un FK'sı student'ı da yansıtır):
+    # önce düşürülür, FTS trigger'larıyla birlikte sonra geri kurulur
+    op.drop_index('ix_student_activity', table_name='student')
+    for table in tables:
+        with op.batch_alter_table(table, recreate='always',
+                                  table_kwargs={'sqlite_autoincrement': autoincrement}):
+            pass
+    for stmt in SQLITE_FTS_DDL:
+        op.execute(stmt)
+    op.create_index('ix_student_activity', 'student',
+                    [sa.text('coalesce(last_note_at, created_at)'), 'id'])
+    if 'student_note' in tables:
+        # yansıtılan index DESC'i kaybeder
+        op.drop_index('ix_student_note_student_created', table_name='student_note')
+        op.create_index('ix_student_note_student_created', 'student_note',
+                        ['student_id', sa.text('created_at DESC')])
+
+
+def upgrade():
+    # Postgres'te serial sequence'ı id'yi zaten yeniden vermez
+    bind = op.get_bind()
+    if bind.dialect.name != 'sqlite':
+        return
+    tables = [t for t in TABLES if not _has_autoincrement(bind, t)]
+    if tables:
+        _rebuild(tables, True)
+    for table, archive in TABLES.items():
+        # sayaç arşivdeki en büyük id'den de devam etmeli
+        op.execute(sa.text('DELETE FROM sqlite_sequence WHERE name = :t').bindparams(t=table))
+        op.execute(sa.text(
+            'INSERT INTO sqlite_sequence (name, seq) SELECT :t, coalesce(max(id), 0) FROM '
+            f'(SELECT id FROM {table} UNION ALL SELECT id FROM {archive})'
+        ).bindparams(t=table))
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != 'sqlite':
+        return
+    tables = [t for t in TABLES if _has_autoincrement(bind, t)]
+    if tables:
+        _rebuild(tables, False)
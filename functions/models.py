@@ -0,0 +1,737 @@
+"""
+Veritabanı modelleri, flush hook'ları (arama anahtarı, özet sayaçlar, sürüm
+damgaları) ve öğrenci liste sorguları. Route'lar views.py / api.py içinde.
+"""
+import os
+import threading
+from datetime import datetime
+
+from flask_login import UserMixin
+from sqlalchemy import (
+    func, event, select, update, bindparam, tuple_, union_all, inspect as sa_inspect,
+)
+from sqlalchemy.orm import Session, aliased, mapped_column
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+import search
+from database import LazyEngineSQLAlchemy, RoutingSession
+from faculties import FACULTY_DEPARTMENTS, FacultyIndex
+
+db = LazyEngineSQLAlchemy(session_options={"class_": RoutingSession})
+
+STATUSES = ("cozuldu", "cozulmedi")
+
+class User(UserMixin, db.Model):
+    __tablename__ = "users"
+    id       = db.Column(db.Integer, primary_key=True)
+    username = db.Column(db.String(80), unique=True, nullable=False)
+    password = db.Column(db.Text, nullable=False)
+
+class Faculty(db.Model):
+    """FACULTY_DEPARTMENTS'in fakülteleri (bkz. sync_reference_tables)."""
+    __tablename__ = "faculty"
+    id   = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(200), unique=True, nullable=False)
+
+class Department(db.Model):
+    __tablename__ = "department"
+    id         = db.Column(db.Integer, primary_key=True)
+    faculty_id = db.Column(db.Integer, db.ForeignKey("faculty.id"), nullable=False)
+    name       = db.Column(db.String(200), nullable=False)
+
+    __table_args__ = (
+        db.UniqueConstraint("faculty_id", "name", name="uq_department_faculty_name"),
+    )
+
+class Student(db.Model):
+    __tablename__ = "student"
+    id         = db.Column(db.Integer, primary_key=True)
+    name       = db.Column(db.String(150), nullable=False)
+    phone      = db.Column(db.String(30), index=True)
+    school_no  = db.Column(db.String(30), index=True)
+    # active_history: student_stats sayaçları için eski değer de gerekli
+    added_by   = mapped_column(db.String(80), index=True, active_history=True)
+    status     = mapped_column(db.String(20), default="cozulmedi", active_history=True)
+    # serbest metin (görüntülenen değer); listedeyse id'leri aşağıda
+    department = db.Column(db.String(200))
+    faculty    = db.Column(db.String(200))
+    # faculty / department metninden flush hook'uyla türetilir (bkz. _refresh_reference_ids)
+    faculty_id    = db.Column(db.Integer, db.ForeignKey("faculty.id"))
+    department_id = db.Column(db.Integer, db.ForeignKey("department.id"))
+    problem    = db.Column(db.Text)  # öğrencinin ana sorunu
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    # isim / telefon / okul no'nun normalize hâli (bkz. search.py)
+    search_key = db.Column(db.String(300))
+    # her UPDATE'te artar; detay sayfasının ETag'i buna dayanır
+    row_version = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    updated_at  = db.Column(db.DateTime)
+    # not ekleme / silmede flush hook'uyla güncellenir (bkz. apply_note_deltas)
+    note_count   = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    last_note_at = db.Column(db.DateTime)
+
+    # öğrenci silinince notları da silinir
+    notes = db.relationship(
+        "StudentNote", back_populates="student",
+        cascade="all, delete-orphan", order_by="StudentNote.created_at.desc()",
+    )
+
+    __table_args__ = (
+        db.Index("ix_student_status_id", "status", "id"),
+        # filtre + keyset (id DESC) sayfalama tek index aralığından
+        db.Index("ix_student_faculty_id", "faculty_id", "id"),
+        db.Index("ix_student_department_id", "department_id", "id"),
+        # arşive taşınan id'ler SQLite'ta yeniden verilmesin (bkz. archive.py)
+        {"sqlite_autoincrement": True},
+    )
+
+@event.listens_for(Student, "before_insert")
+@event.listens_for(Student, "before_update")
+def _refresh_search_key(mapper, connection, target):
+    target.search_key = search.build_search_key(target.name, target.phone, target.school_no)
+
+@event.listens_for(Student, "before_insert")
+@event.listens_for(Student, "before_update")
+def _refresh_reference_ids(mapper, connection, target):
+    target.faculty_id, target.department_id = \
+        faculty_index(connection).ids_for(target.faculty, target.department)
+
+class StudentNote(db.Model):
+    __tablename__ = "student_note"
+    id         = db.Column(db.Integer, primary_key=True)
+    student_id = db.Column(db.Integer, db.ForeignKey("student.id", ondelete="CASCADE"), nullable=False)
+    text       = db.Column(db.Text, nullable=False)
+    author     = db.Column(db.String(80))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    student = db.relationship("Student", back_populates="notes")
+
+    __table_args__ = (
+        {"sqlite_autoincrement": True},
+    )
+
+db.Index(
+    "ix_student_note_student_created",
+    StudentNote.student_id, StudentNote.created_at.desc(),
+)
+
+# Son aktivite: son not, not yoksa kayıt zamanı. Dashboard'daki "son hareket"
+# sıralaması ve sayfalaması bu ifadenin index'i üzerinden gider.
+STUDENT_ACTIVITY = func.coalesce(Student.last_note_at, Student.created_at)
+
+db.Index("ix_student_activity", STUDENT_ACTIVITY, Student.id)
+
+class StudentStat(db.Model):
+    """
+    (added_by, status) başına öğrenci sayısı. Student yazımlarıyla aynı
+    transaction'da güncellenir; /main ve dashboard tabloyu taramak yerine bunu okur.
+    NULL added_by / status '' olarak tutulur (PK parçası).
+    """
+    __tablename__ = "student_stats"
+    added_by = db.Column(db.String(80), primary_key=True)
+    status   = db.Column(db.String(20), primary_key=True)
+    count    = db.Column(db.Integer, nullable=False, default=0)
+
+
+class DataVersion(db.Model):
+    """Kapsam başına yazma sayacı; liste sayfalarının ETag'i için ucuz sürüm damgası."""
+    __tablename__ = "data_versions"
+    scope      = db.Column(db.String(40), primary_key=True)
+    version    = db.Column(db.BigInteger, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime)
+
+# Student / StudentNote yazımlarında artan kapsam
+STUDENTS_SCOPE = "students"
+
+
+class AuditEvent(db.Model):
+    """
+    Öğrenci / not değişikliklerinin salt-ekleme geçmişi. Satırları audit.py'deki
+    yazıcı toplu INSERT'le yazar (arka plan thread'i ya da bulutta commit'te).
+    Öğrenci silinince geçmişi kalsın diye student_id'de FK yok.
+    """
+    __tablename__ = "audit_events"
+    id         = db.Column(db.BigInteger().with_variant(db.Integer, "sqlite"), primary_key=True)
+    at         = db.Column(db.DateTime, nullable=False)
+    actor      = db.Column(db.String(80))
+    action     = db.Column(db.String(20), nullable=False)   # create / update / delete
+    entity     = db.Column(db.String(20), nullable=False)   # student / note
+    entity_id  = db.Column(db.Integer, nullable=False)
+    student_id = db.Column(db.Integer, nullable=False)
+    changes    = db.Column(db.JSON)  # update: {alan: [eski, yeni]}, diğerleri: alanlar
+
+    __table_args__ = (
+        db.Index("ix_audit_events_student_id", "student_id", "id"),
+    )
+
+
+class ArchivedStudent(db.Model):
+    """
+    Arşive taşınmış öğrenci (bkz. archive.py): student'ın kolonları + archived_at,
+    id korunur. Satırlar yalnızca Core INSERT ... SELECT ile taşınır; Student'ın
+    flush hook'ları burada çalışmaz.
+    """
+    __tablename__ = "student_archive"
+    id            = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    name          = db.Column(db.String(150), nullable=False)
+    phone         = db.Column(db.String(30), index=True)
+    school_no     = db.Column(db.String(30), index=True)
+    added_by      = db.Column(db.String(80))
+    status        = db.Column(db.String(20))
+    department    = db.Column(db.String(200))
+    faculty       = db.Column(db.String(200))
+    faculty_id    = db.Column(db.Integer)
+    department_id = db.Column(db.Integer)
+    problem       = db.Column(db.Text)
+    created_at    = db.Column(db.DateTime)
+    search_key    = db.Column(db.String(300))
+    row_version   = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    updated_at    = db.Column(db.DateTime)
+    note_count    = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    last_note_at  = db.Column(db.DateTime)
+    archived_at   = db.Column(db.DateTime, nullable=False)
+
+class ArchivedNote(db.Model):
+    __tablename__ = "student_note_archive"
+    id         = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    student_id = db.Column(db.Integer, nullable=False)
+    text       = db.Column(db.Text, nullable=False)
+    author     = db.Column(db.String(80))
+    created_at = db.Column(db.DateTime)
+
+    __table_args__ = (
+        db.Index("ix_student_note_archive_student_created", "student_id", "created_at"),
+    )
+
+def _with_archive(model, archive_model, name):
+    """model'in tablosu UNION ALL arşivi; aynı kolon adlarıyla model gibi sorgulanır."""
+    columns = [c.name for c in model.__table__.columns]
+    hot = select(*(model.__table__.c[n] for n in columns))
+    cold = select(*(archive_model.__table__.c[n] for n in columns))
+    return aliased(model, union_all(hot, cold).subquery(name), adapt_on_names=True)
+
+# include_archived filtresinde sorgulanan kaynaklar
+ALL_STUDENTS = _with_archive(Student, ArchivedStudent, "all_students")
+ALL_NOTES = _with_archive(StudentNote, ArchivedNote, "all_notes")
+
+
+JOB_STATUSES = ("queued", "running", "done", "failed", "cancelled")
+
+class Job(db.Model):
+    """
+    Arka plan işi (bkz. jobs.py). İşçi satırı koşullu UPDATE ile `running`
+    yapıp sahiplenir; ilerleme ve kaldığı yer (checkpoint) her toplu adımda
+    adımın kendi transaction'ında yazılır.
+    """
+    __tablename__ = "jobs"
+    id           = db.Column(db.Integer, primary_key=True)
+    kind         = db.Column(db.String(50), nullable=False)
+    status       = db.Column(db.String(20), nullable=False, default="queued")
+    params       = db.Column(db.JSON)
+    checkpoint   = db.Column(db.JSON)  # iş fonksiyonunun devam noktası, ör. {"last_id": 500}
+    done         = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    total        = db.Column(db.Integer)
+    message      = db.Column(db.Text)  # sonuç ya da hata
+    attempts     = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    cancel_requested = db.Column(db.Boolean, nullable=False, default=False,
+                                 server_default=db.false())
+    created_by   = db.Column(db.String(80))
+    worker       = db.Column(db.String(120))
+    created_at   = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    started_at   = db.Column(db.DateTime)
+    finished_at  = db.Column(db.DateTime)
+    heartbeat_at = db.Column(db.DateTime)
+
+    __table_args__ = (
+        db.Index("ix_jobs_status_id", "status", "id"),
+    )
+
+
+# -------------------------------
+# FAKÜLTE / BÖLÜM İNDEKSİ
+# -------------------------------
+_faculty_index = None
+_faculty_index_lock = threading.Lock()
+
+def faculty_index(connection=None):
+    """Referans tablolarının FacultyIndex'i; process başına bir kez yüklenir."""
+    global _faculty_index
+    if _faculty_index is None:
+        with _faculty_index_lock:
+            if _faculty_index is None:
+                connection = connection if connection is not None else db.session.connection()
+                faculties = connection.execute(select(Faculty.id, Faculty.name)).all()
+                departments = connection.execute(
+                    select(Department.id, Department.faculty_id, Department.name)).all()
+                _faculty_index = FacultyIndex(
+                    [tuple(r) for r in faculties], [tuple(r) for r in departments])
+    return _faculty_index
+
+def reset_faculty_index():
+    global _faculty_index
+    _faculty_index = None
+
+def sync_reference_tables():
+    """
+    FACULTY_DEPARTMENTS'te olup tablolarda olmayan fakülte / bölümleri ekler ve
+    id'si boş kalmış öğrencileri yeniden eşler. Listeden çıkarılan adlar silinmez.
+    Dönen değer: (eklenen referans satırı, güncellenen öğrenci)
+    """
+    faculty_ids = dict(db.session.query(Faculty.name, Faculty.id).all())
+    added = 0
+    for name in FACULTY_DEPARTMENTS:
+        if name not in faculty_ids:
+            faculty = Faculty(name=name)
+            db.session.add(faculty)
+            db.session.flush()
+            faculty_ids[name] = faculty.id
+            added += 1
+    existing = set(db.session.query(Department.faculty_id, Department.name).all())
+    for faculty, departments in FACULTY_DEPARTMENTS.items():
+        for name in departments:
+            if (faculty_ids[faculty], name) not in existing:
+                db.session.add(Department(faculty_id=faculty_ids[faculty], name=name))
+                added += 1
+    db.session.flush()
+    reset_faculty_index()
+
+    index = faculty_index()
+    updated = 0
+    pairs = db.session.query(Student.faculty, Student.department).filter(
+        (Student.faculty.isnot(None) & Student.faculty_id.is_(None))
+        | (Student.department.isnot(None) & Student.department_id.is_(None))
+    ).distinct().all()
+    for faculty, department in pairs:
+        faculty_id, department_id = index.ids_for(faculty, department)
+        if faculty_id is None and department_id is None:
+            continue
+        updated += db.session.execute(
+            update(Student.__table__)
+            .where(Student.__table__.c.faculty.is_not_distinct_from(faculty),
+                   Student.__table__.c.department.is_not_distinct_from(department),
+                   Student.__table__.c.faculty_id.is_distinct_from(faculty_id)
+                   | Student.__table__.c.department_id.is_distinct_from(department_id))
+            .values(faculty_id=faculty_id, department_id=department_id)
+        ).rowcount
+    db.session.commit()
+    return added, updated
+
+
+# -------------------------------
+# ÖZET SAYAÇLAR (student_stats)
+# -------------------------------
+def _committed_value(obj, key):
+    """Veritabanındaki değer (bu flush'ta değiştiyse eski hâli)."""
+    getattr(obj, key)  # expire edilmişse yükle
+    state = sa_inspect(obj)
+    history = state.attrs[key].history
+    if history.deleted:
+        return history.deleted[0]
+    if history.unchanged:
+        return history.unchanged[0]
+    return state.dict.get(key)
+
+def _stat_key(added_by, status):
+    return (added_by or "", status or "")
+
+def collect_stat_deltas(session):
+    deltas = {}
+
+    def bump(key, delta):
+        deltas[key] = deltas.get(key, 0) + delta
+
+    for obj in session.new:
+        if isinstance(obj, Student):
+            # status boşsa INSERT'te kolon default'u yazılacak
+            status = obj.status if obj.status is not None else Student.status.default.arg
+            bump(_stat_key(obj.added_by, status), +1)
+    for obj in session.deleted:
+        if isinstance(obj, Student):
+            bump(_stat_key(_committed_value(obj, "added_by"),
+                           _committed_value(obj, "status")), -1)
+    for obj in session.dirty:
+        if not isinstance(obj, Student) or obj in session.deleted:
+            continue
+        state = sa_inspect(obj)
+        if not (state.attrs.added_by.history.has_changes()
+                or state.attrs.status.history.has_changes()):
+            continue
+        before = _stat_key(_committed_value(obj, "added_by"), _committed_value(obj, "status"))
+        after  = _stat_key(obj.added_by, obj.status)
+        if before != after:
+            bump(before, -1)
+            bump(after, +1)
+
+    return {key: delta for key, delta in deltas.items() if delta}
+
+def apply_stat_deltas(connection, deltas):
+    """count = count + delta upsert'i; eşzamanlı yazımlarda satır kilidiyle tutarlı kalır."""
+    if not deltas:
+        return
+    table = StudentStat.__table__
+    stmt = _upsert(connection, table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.added_by, table.c.status],
+        set_={"count": table.c.count + stmt.excluded.count},
+    )
+    connection.execute(stmt, [
+        {"added_by": added_by, "status": status, "count": delta}
+        for (added_by, status), delta in sorted(deltas.items())
+    ])
+
+def _upsert(connection, table):
+    insert = pg_insert if connection.dialect.name == "postgresql" else sqlite_insert
+    return insert(table)
+
+def bump_data_version(connection, scope):
+    """
+    Kapsamın sayacını artırır ve yeni değeri döndürür. Satır kilidi
+    connection'ın transaction'ı boyunca tutulur: yazımlar bunu kendi
+    transaction'larında çağırmaz, mark_students_changed ile işaretler.
+    """
+    table = DataVersion.__table__
+    stmt = _upsert(connection, table).values(scope=scope, version=1, updated_at=datetime.utcnow())
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.scope],
+        set_={"version": table.c.version + 1, "updated_at": stmt.excluded.updated_at},
+    )
+    return connection.execute(stmt.returning(table.c.version)).scalar()
+
+def mark_students_changed(session):
+    """Commit'ten sonra students sürümü artırılır (bkz. _bump_students_version)."""
+    session.info["students_changed"] = True
+
+def _touches_students(session):
+    for obj in session.new | session.deleted:
+        if isinstance(obj, (Student, StudentNote)):
+            return True
+    return any(isinstance(obj, (Student, StudentNote)) and session.is_modified(obj)
+               for obj in session.dirty)
+
+# -------------------------------
+# NOT ÖZETLERİ (student.note_count / last_note_at)
+# -------------------------------
+def apply_note_deltas(connection, deltas):
+    """
+    {student_id: not sayısı değişimi}. Sayı delta ile artırılır; son not
+    zamanı (student_id, created_at) index'inden yeniden okunur, böylece en son
+    not silindiğinde de doğru kalır.
+    """
+    if not deltas:
+        return
+    student, note = Student.__table__, StudentNote.__table__
+    last_note = select(func.max(note.c.created_at))\
+        .where(note.c.student_id == student.c.id).scalar_subquery()
+    connection.execute(
+        update(student)
+        .where(student.c.id == bindparam("sid"))
+        .values(note_count=student.c.note_count + bindparam("delta"), last_note_at=last_note),
+        [{"sid": sid, "delta": delta} for sid, delta in sorted(deltas.items())],
+    )
+
+def _note_deltas(notes, sign, deltas):
+    for obj in notes:
+        if isinstance(obj, StudentNote):
+            sid = obj.student_id if obj.student_id is not None else obj.student.id
+            deltas[sid] = deltas.get(sid, 0) + sign
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_student_stats(session, flush_context, instances):
+    # Eski değerler flush'tan önce okunur (silinen satır sonra yüklenemez)
+    session.info["stat_deltas"] = collect_stat_deltas(session)
+    session.info["students_touched"] = _touches_students(session)
+    note_deltas = {}
+    _note_deltas(session.deleted, -1, note_deltas)
+    session.info["note_deltas"] = note_deltas
+
+    now = datetime.utcnow()
+    for obj in session.dirty:
+        if isinstance(obj, Student) and obj not in session.deleted and session.is_modified(obj):
+            obj.row_version = (obj.row_version or 0) + 1
+            obj.updated_at = now
+
+@event.listens_for(Session, "after_flush")
+def _maintain_student_stats(session, flush_context):
+    connection = session.connection()
+    apply_stat_deltas(connection, session.info.pop("stat_deltas", {}))
+    # yeni notların student_id'si (ilişki üzerinden eklendiyse) ancak flush'tan sonra belli
+    note_deltas = session.info.pop("note_deltas", {})
+    _note_deltas(session.new, +1, note_deltas)
+    apply_note_deltas(connection, {sid: d for sid, d in note_deltas.items() if d})
+    if session.info.pop("students_touched", False):
+        mark_students_changed(session)
+
+@event.listens_for(Session, "after_commit")
+def _bump_students_version(session):
+    """
+    data_versions satırı yazarın transaction'ında güncellenseydi Postgres'te
+    satır kilidi commit'e kadar tüm eşzamanlı yazarları sıraya dizerdi. Sayaç
+    commit'ten sonra birincilde tek ifadelik kendi transaction'ında artırılır.
+    Yeni sürüm info["students_version"]'a konur; audit'in after_commit'i (bu
+    hook'tan sonra kaydedilir) onu canlı akışa (live.py) iletir.
+    """
+    if not session.info.pop("students_changed", False):
+        return
+    try:
+        with db.engine.begin() as connection:
+            session.info["students_version"] = bump_data_version(connection, STUDENTS_SCOPE)
+    except Exception as e:
+        # Yazım commit edildi; sayaç bir sonraki yazımda ilerler
+        print("DATA VERSION BUMP ERROR:", e)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_students_changed(session):
+    session.info.pop("students_changed", None)
+
+def recount_student_stats():
+    """
+    Sayaçları baştan hesaplar (elle yapılan DB değişikliklerinden sonra).
+    Arşivdeki öğrenciler de sayılır: arşive taşımak toplamları değiştirmez.
+    """
+    added_by = func.coalesce(ALL_STUDENTS.added_by, "")
+    status   = func.coalesce(ALL_STUDENTS.status, "")
+    rows = db.session.query(added_by, status, func.count(ALL_STUDENTS.id))\
+        .group_by(added_by, status).all()
+    db.session.query(StudentStat).delete()
+    db.session.add_all(StudentStat(added_by=a, status=st, count=n) for a, st, n in rows)
+    db.session.commit()
+
+def staff_counts():
+    """[(added_by, öğrenci sayısı)] çoktan aza; O(personel) satır okur."""
+    total = func.sum(StudentStat.count)
+    rows = db.session.query(StudentStat.added_by, total)\
+        .group_by(StudentStat.added_by)\
+        .having(total > 0)\
+        .order_by(total.desc())\
+        .all()
+    return [(added_by or None, int(n)) for added_by, n in rows]
+
+def added_by_options():
+    return [
+        row[0] for row in db.session.query(StudentStat.added_by)
+        .filter(StudentStat.count > 0, StudentStat.added_by != "")
+        .distinct().order_by(StudentStat.added_by.asc()).all()
+    ]
+
+def students_version():
+    row = db.session.query(DataVersion.version, DataVersion.updated_at)\
+        .filter(DataVersion.scope == STUDENTS_SCOPE).first()
+    return (row.version, row.updated_at) if row else (0, None)
+
+def student_page_stamp(id):
+    """Öğrenci satır sürümü + not sayısı / son not zamanı; tek satır PK okuması."""
+    return db.session.query(
+        Student.row_version, Student.updated_at, Student.created_at,
+        Student.note_count, Student.last_note_at,
+    ).filter(Student.id == id).first()
+
+
+# -------------------------------
+# NOT ZAMAN ÇİZELGESİ
+# -------------------------------
+NOTES_PAGE_SIZE = int(os.getenv("NOTES_PAGE_SIZE", "20"))
+NOTES_MAX_PAGE_SIZE = 100
+
+def _note_order(note=StudentNote):
+    return (note.created_at.desc(), note.id.desc())
+
+def _note_page(notes, per_page):
+    """per_page + 1 satırdan (sayfa, sonraki sayfanın query parametreleri ya da None)."""
+    if len(notes) <= per_page or notes[per_page - 1].created_at is None:
+        return notes[:per_page], None
+    last = notes[per_page - 1]
+    return notes[:per_page], {"before_at": last.created_at.isoformat(), "before_id": last.id}
+
+def fetch_note_page(student_id, before_at=None, before_id=None, per_page=NOTES_PAGE_SIZE):
+    """Keyset (created_at, id) ile azalan sırada bir sayfa not: (notlar, imleç)."""
+    query = StudentNote.query.filter(StudentNote.student_id == student_id)
+    if before_at is not None and before_id is not None:
+        query = query.filter(
+            tuple_(StudentNote.created_at, StudentNote.id) < tuple_(before_at, before_id)
+        )
+    notes = query.order_by(*_note_order()).limit(per_page + 1).all()
+    return _note_page(notes, per_page)
+
+def fetch_student_with_notes(student_id, per_page=NOTES_PAGE_SIZE):
+    """
+    Öğrenci satırı + ilk not sayfası tek sorguda (öğrenci LEFT JOIN en yeni
+    per_page + 1 not). Dönen değer: (öğrenci, notlar, imleç) ya da None.
+    """
+    first_page = db.session.query(StudentNote)\
+        .filter(StudentNote.student_id == student_id)\
+        .order_by(*_note_order()).limit(per_page + 1).subquery()
+    note = aliased(StudentNote, first_page)
+    rows = db.session.query(Student, note)\
+        .outerjoin(note, note.student_id == Student.id)\
+        .filter(Student.id == student_id)\
+        .order_by(*_note_order(note)).all()
+    if not rows:
+        return None
+    notes, cursor = _note_page([n for _, n in rows if n is not None], per_page)
+    return rows[0][0], notes, cursor
+
+
+# -------------------------------
+# ÖĞRENCİ LİSTE SORGULARI
+# -------------------------------
+DASHBOARD_PAGE_SIZE = int(os.getenv("DASHBOARD_PAGE_SIZE", "50"))
+DASHBOARD_MAX_PAGE_SIZE = 200
+
+def student_activity(model=Student):
+    return func.coalesce(model.last_note_at, model.created_at)
+
+def dashboard_columns(model=Student):
+    """Tabloda gösterilen kolonlar; problem / created_at gibi alanlar listede yüklenmez."""
+    return (
+        model.id, model.name, model.phone, model.school_no,
+        model.faculty, model.department, model.status, model.added_by,
+        model.note_count, student_activity(model).label("last_activity"),
+        model.row_version,  # satır parçası önbelleğinin damgası için
+    )
+
+# Dashboard sıralamaları: "new" en yeni kayıtlar (id), "active" son hareket
+DASHBOARD_SORTS = ("new", "active")
+
+def read_student_filters(args):
+    """Dashboard filtrelerini query string'den okur."""
+    return {
+        "q":          args.get("q", "").strip(),
+        "status":     args.get("status", "").strip(),
+        "department": args.get("department", "").strip(),
+        "faculty":    args.get("faculty", "").strip(),
+        "added_by":   args.get("added_by", "").strip(),
+        "include_archived": args.get("include_archived", "") in ("1", "true", "on"),
+    }
+
+def student_model(filters):
+    """Sorgulanan kaynak: student ya da (include_archived) student + arşiv."""
+    return ALL_STUDENTS if filters.get("include_archived") else Student
+
+def apply_student_filters(query, filters, model=Student):
+    if filters["q"]:
+        # Arşivle birleşimde FTS tablosu yalnızca student'ı kapsar: LIKE'a düş
+        dialect = db.engine.dialect.name if model is Student else None
+        clause = search.match_clause(model.search_key, model.id, filters["q"], dialect)
+        if clause is not None:
+            query = query.filter(clause)
+    if filters["status"] in STATUSES:
+        query = query.filter(model.status == filters["status"])
+    # Listedeki adlar id üzerinden index'li tam sayı eşitliğiyle; listede
+    # olmayan eski serbest metinler için ilike
+    index = faculty_index()
+    faculty = filters["faculty"]
+    faculty_id = index.faculty_id(faculty) if faculty else None
+    if faculty_id is not None:
+        query = query.filter(model.faculty_id == faculty_id)
+    elif faculty:
+        query = query.filter(model.faculty.ilike(f"%{faculty}%"))
+    department = filters["department"]
+    department_ids = index.department_id_set(department, faculty) if department else ()
+    if len(department_ids) == 1:
+        query = query.filter(model.department_id == next(iter(department_ids)))
+    elif department_ids:
+        query = query.filter(model.department_id.in_(sorted(department_ids)))
+    elif department:
+        query = query.filter(model.department.ilike(f"%{department}%"))
+    if filters["added_by"]:
+        query = query.filter(model.added_by == filters["added_by"])
+    return query
+
+def read_page_size(args, default=DASHBOARD_PAGE_SIZE, maximum=DASHBOARD_MAX_PAGE_SIZE):
+    try:
+        size = int(args.get("per_page", default))
+    except (TypeError, ValueError):
+        size = default
+    return max(1, min(size, maximum))
+
+def read_before_id(args):
+    try:
+        return int(args.get("before_id", ""))
+    except (TypeError, ValueError):
+        return None
+
+def read_sort(args):
+    sort = args.get("sort", "")
+    return sort if sort in DASHBOARD_SORTS else DASHBOARD_SORTS[0]
+
+def read_before_at(args):
+    try:
+        return datetime.fromisoformat(args.get("before_at", ""))
+    except (TypeError, ValueError):
+        return None
+
+def fetch_student_page(filters, before_id=None, per_page=DASHBOARD_PAGE_SIZE,
+                       sort="new", before_at=None):
+    """
+    Keyset (cursor) sayfalama: seçilen sıraya göre azalan en fazla per_page satır.
+    OFFSET kullanmadığımız için derin sayfalar da index üzerinden gelir
+    ("new": PK, "active": ix_student_activity).
+    Dönen değer: (satırlar, sonraki sayfanın query parametreleri ya da None)
+    """
+    model = student_model(filters)
+    activity = student_activity(model)
+    query = apply_student_filters(db.session.query(*dashboard_columns(model)), filters, model)
+    if sort == "active":
+        if before_id is not None and before_at is not None:
+            query = query.filter(tuple_(activity, model.id) < tuple_(before_at, before_id))
+        query = query.order_by(activity.desc(), model.id.desc())
+    else:
+        if before_id is not None:
+            query = query.filter(model.id < before_id)
+        query = query.order_by(model.id.desc())
+    rows = query.limit(per_page + 1).all()
+    if len(rows) <= per_page:
+        return rows, None
+    last = rows[per_page - 1]
+    cursor = {"before_id": last.id}
+    if sort == "active":
+        cursor["before_at"] = last.last_activity.isoformat()
+    return rows[:per_page], cursor
+
+def fetch_student_rows(filters, ids):
+    """Verilen id'lerden filtreye uyan dashboard satırları (canlı güncelleme için)."""
+    if not ids:
+        return []
+    model = student_model(filters)
+    query = apply_student_filters(db.session.query(*dashboard_columns(model)), filters, model)
+    return query.filter(model.id.in_(ids)).all()
+
+def count_students(filters):
+    """Filtreye uyan toplam kayıt sayısı; satır yüklemeden tek COUNT sorgusu."""
+    model = student_model(filters)
+    query = apply_student_filters(db.session.query(func.count(model.id)), filters, model)
+    return query.scalar() or 0
+
+# Dışa aktarmada yazılan kolonlar (başlık, kolon adı)
+EXPORT_COLUMNS = (
+    ("ID", "id"), ("Ad Soyad", "name"), ("Telefon", "phone"),
+    ("Okul No", "school_no"), ("Fakülte", "faculty"),
+    ("Bölüm", "department"), ("Durum", "status"),
+    ("Ekleyen", "added_by"), ("Problem", "problem"),
+    ("Kayıt Tarihi", "created_at"),
+)
+EXPORT_BATCH = 1000
+
+def export_students(filters, with_notes=False):
+    """
+    Dışa aktarma için (başlık, satır iteratörü). Satırlar yield_per ile
+    partiler hâlinde gelir (Postgres'te server-side cursor); not özetleri
+    öğrenci satırındaki sayaçlardan; son notun metni (student_id, created_at)
+    index'ine giden alt sorgudur.
+    """
+    model = student_model(filters)
+    header = [title for title, _ in EXPORT_COLUMNS]
+    columns = [getattr(model, name) for _, name in EXPORT_COLUMNS]
+    if with_notes:
+        note = ALL_NOTES if model is not Student else StudentNote
+        latest_text = db.session.query(note.text)\
+            .filter(note.student_id == model.id)\
+            .order_by(note.created_at.desc(), note.id.desc())\
+            .limit(1).scalar_subquery()
+        header += ["Not Sayısı", "Son Not Tarihi", "Son Not"]
+        columns += [model.note_count, model.last_note_at, latest_text]
+    query = apply_student_filters(db.session.query(*columns), filters, model)\
+        .order_by(model.id.desc())\
+        .execution_options(yield_per=EXPORT_BATCH)
+    return header, iter(query)
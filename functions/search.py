@@ -0,0 +1,118 @@
+"""
+Öğrenci arama yardımcıları.
+
+Aranan alanlar (isim, telefon, okul no) kayıt anında tek bir normalize
+`search_key` kolonuna yazılır. Postgres'te bu kolon üzerinde pg_trgm GIN index'i,
+SQLite'ta trigram tokenizer'lı bir FTS5 gölge tablosu kullanılır; böylece
+'%...%' aramaları tablo taraması yapmaz.
+"""
+import re
+
+from sqlalchemy import column, or_, select, table
+
+# Türkçe büyük/küçük harf: İ -> i, I -> ı (str.lower() İ'yi "i̇" yapar)
+_TR_LOWER = str.maketrans({"İ": "i", "I": "ı"})
+# Noktalı/noktasız ve şapkalı harfleri tek forma indir: "ılgaz" == "ilgaz" == "ILGAZ"
+_FOLD = str.maketrans("ıçğöşüâîû", "icgosuaiu")
+
+_PHONE_LIKE = re.compile(r"[\d\s()+\-.]+")
+_NON_DIGIT = re.compile(r"\D")
+
+# Aynı anahtar içindeki alanlar arası eşleşmeyi engeller
+FIELD_SEP = "|"
+
+# Trigram index'ler 3 karakterden kısa terimlerde kullanılamaz
+MIN_INDEXED_TERM = 3
+
+student_fts = table("student_fts", column("rowid"), column("search_key"))
+
+
+def turkish_lower(value):
+    return value.translate(_TR_LOWER).lower()
+
+
+def fold(value):
+    """Arama için normalize: Türkçe küçük harf, İ/ı katlama, boşluk sadeleştirme."""
+    if not value:
+        return ""
+    return " ".join(turkish_lower(value).translate(_FOLD).split())
+
+
+def digits(value):
+    return _NON_DIGIT.sub("", value or "")
+
+
+def build_search_key(name, phone, school_no):
+    return FIELD_SEP.join((fold(name), digits(phone), fold(school_no)))
+
+
+def search_terms(q):
+    """
+    Sorgu metninden aranacak terimler. Telefon gibi görünen girdiler
+    ("0532 123 45 67") hem rakam hâliyle hem de olduğu gibi aranır.
+    """
+    terms = [fold(q).replace(FIELD_SEP, " ").strip()]
+    if _PHONE_LIKE.fullmatch(q):
+        only_digits = digits(q)
+        if only_digits and only_digits not in terms:
+            terms.append(only_digits)
+    return [t for t in terms if t]
+
+
+def escape_like(term):
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def fts_query(terms):
+    return " OR ".join('"' + t.replace('"', '""') + '"' for t in terms)
+
+
+def match_clause(key_column, id_column, q, dialect):
+    """
+    `q` için WHERE koşulu. SQLite'ta tüm terimler index'lenebiliyorsa FTS5
+    tablosuna gider; aksi halde (Postgres'te trigram GIN index'iyle) LIKE.
+    """
+    terms = search_terms(q)
+    if not terms:
+        return None
+    if dialect == "sqlite" and all(len(t) >= MIN_INDEXED_TERM for t in terms):
+        fts_ids = select(student_fts.c.rowid).where(
+            student_fts.c.search_key.op("MATCH")(fts_query(terms))
+        )
+        return id_column.in_(fts_ids)
+    return or_(*(key_column.like(f"%{escape_like(t)}%", escape="\\") for t in terms))
+
+
+# -------------------------------
+# Şema (index / FTS) DDL
+# -------------------------------
+POSTGRES_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_student_search_key_trgm "
+    "ON student USING gin (search_key gin_trgm_ops)",
+]
+
+SQLITE_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS student_fts USING fts5("
+    "search_key, content='student', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS student_fts_ai AFTER INSERT ON student BEGIN "
+    "INSERT INTO student_fts(rowid, search_key) VALUES (new.id, new.search_key); END",
+    "CREATE TRIGGER IF NOT EXISTS student_fts_ad AFTER DELETE ON student BEGIN "
+    "INSERT INTO student_fts(student_fts, rowid, search_key) "
+    "VALUES ('delete', old.id, old.search_key); END",
+    "CREATE TRIGGER IF NOT EXISTS student_fts_au AFTER UPDATE OF search_key ON student BEGIN "
+    "INSERT INTO student_fts(student_fts, rowid, search_key) "
+    "VALUES ('delete', old.id, old.search_key); "
+    "INSERT INTO student_fts(rowid, search_key) VALUES (new.id, new.search_key); END",
+]
+
+# FTS içeriğini student tablosundan baştan kurar (backfill sonrası)
+SQLITE_REBUILD = "INSERT INTO student_fts(student_fts) VALUES ('rebuild')"
+
+
+def schema_statements(dialect):
+    if dialect.startswith("postgresql"):
+        return list(POSTGRES_DDL)
+    if dialect == "sqlite":
+        return list(SQLITE_DDL)
+    return []
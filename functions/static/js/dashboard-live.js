@@ -0,0 +1,62 @@
+// Canlı güncelleme (SSE): değişen satırlar /dashboard/rows'tan alınıp yerinde değiştirilir
+document.addEventListener('DOMContentLoaded', function () {
+  const tbody = document.getElementById('studentRows');
+  if (!tbody || !tbody.dataset.eventsUrl || !window.EventSource) return;
+  const banner = document.getElementById('liveBanner');
+  const prepend = tbody.dataset.prepend;  // "new" / "active" / "" (ilk sayfa değil)
+  let version = Number(tbody.dataset.version);
+  let created = new Set(), updated = new Set(), timer = null;
+
+  function stale() { banner.classList.remove('d-none'); }
+
+  function removeRow(id) {
+    const row = tbody.querySelector(`tr[data-id="${id}"]`);
+    if (row) row.remove();
+  }
+
+  async function applyChanges() {
+    timer = null;
+    const toTop = new Set(created);
+    if (prepend === 'active') updated.forEach(id => toTop.add(id));
+    const ids = [...new Set([...created, ...updated])];
+    created = new Set(); updated = new Set();
+    if (!ids.length) return;
+
+    const sep = tbody.dataset.rowsUrl.includes('?') ? '&' : '?';
+    const resp = await fetch(tbody.dataset.rowsUrl + sep + 'ids=' + ids.join(','),
+                             {credentials: 'same-origin'});
+    if (!resp.ok) return stale();
+    const rows = (await resp.json()).rows;
+    for (const id of ids.sort((a, b) => a - b)) {
+      const html = rows[id];
+      const row = tbody.querySelector(`tr[data-id="${id}"]`);
+      if (!html) {
+        if (row) row.remove();  // silindi ya da artık filtreye uymuyor
+      } else if (prepend && toTop.has(id)) {
+        if (row) row.remove();
+        const empty = tbody.querySelector('.empty-row');
+        if (empty) empty.remove();
+        tbody.insertAdjacentHTML('afterbegin', html);
+      } else if (row) {
+        row.outerHTML = html;
+      } else if (toTop.has(id)) {
+        stale();  // önceki sayfalara düşen yeni kayıt
+      }
+    }
+  }
+
+  const source = new EventSource(tbody.dataset.eventsUrl);
+  source.addEventListener('ready', function (e) {
+    // İlk bağlantıda ya da yeniden bağlanınca: arada kaçan değişiklik var mı
+    if (JSON.parse(e.data).version !== version) stale();
+  });
+  source.addEventListener('change', function (e) {
+    const m = JSON.parse(e.data);
+    if (m.bulk) return stale();
+    if (m.version) version = Math.max(version, m.version);
+    m.deleted.forEach(removeRow);
+    m.created.forEach(id => created.add(id));
+    m.updated.forEach(id => updated.add(id));
+    if (!timer) timer = setTimeout(applyChanges, 300);  // art arda olayları tek istekte topla
+  });
+});
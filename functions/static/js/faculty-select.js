@@ -0,0 +1,42 @@
+// Fakülte -> Bölüm cascade (öğrenci ekle / düzenle, dashboard filtreleri)
+//
+// Bölüm <select>'i ayarlarını data- özniteliklerinden alır:
+//   data-faculty-select  fakülte <select>'inin id'si
+//   data-faculties-url   fakülte -> bölüm listesi (/faculties.<hash>.json)
+//   data-current-dept    başta seçili gelecek bölüm
+//   data-empty-label     fakülte seçilmemişken gösterilen seçenek
+//   data-all-label       fakülte seçiliyken listenin başındaki boş seçenek (yoksa eklenmez)
+document.addEventListener('DOMContentLoaded', function () {
+  document.querySelectorAll('select[data-faculty-select]').forEach(async function (depSel) {
+    const facSel = document.getElementById(depSel.dataset.facultySelect);
+    if (!facSel) return;
+    const mapping = await fetch(depSel.dataset.facultiesUrl).then(r => r.json());
+
+    function refreshDepartments() {
+      const fac = facSel.value || "";
+      const currentDept = depSel.dataset.currentDept || "";
+      depSel.innerHTML = "";
+
+      if (!fac || !mapping[fac]) {
+        depSel.add(new Option(depSel.dataset.emptyLabel || "", ""));
+        return;
+      }
+      if (depSel.dataset.allLabel) {
+        depSel.add(new Option(depSel.dataset.allLabel, ""));
+      }
+      mapping[fac].forEach(dep => {
+        const o = new Option(dep, dep);
+        if (dep === currentDept) {
+          o.selected = true;
+        }
+        depSel.add(o);
+      });
+    }
+
+    refreshDepartments();
+    facSel.addEventListener('change', function () {
+      depSel.dataset.currentDept = "";
+      refreshDepartments();
+    });
+  });
+});
@@ -0,0 +1,27 @@
+// Not zaman çizelgesi: "Daha eski notlar" görünür olunca sonraki sayfa eklenir
+document.addEventListener('DOMContentLoaded', function () {
+  const timeline = document.getElementById('noteTimeline');
+  if (!timeline) return;
+
+  async function loadMore(more) {
+    if (more.dataset.loading) return;
+    more.dataset.loading = '1';
+    const resp = await fetch(more.dataset.url, {credentials: 'same-origin'});
+    if (!resp.ok) { delete more.dataset.loading; return; }
+    more.insertAdjacentHTML('afterend', await resp.text());
+    more.remove();
+    watch();
+  }
+
+  const observer = 'IntersectionObserver' in window
+    ? new IntersectionObserver(entries => entries.forEach(e => e.isIntersecting && loadMore(e.target)))
+    : null;
+
+  function watch() {
+    const more = timeline.querySelector('.notes-more');
+    if (!more) return;
+    more.querySelector('button').addEventListener('click', () => loadMore(more));
+    if (observer) observer.observe(more);
+  }
+  watch();
+});
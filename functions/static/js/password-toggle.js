@@ -0,0 +1,14 @@
+// Şifre göster / gizle (giriş sayfası)
+document.addEventListener('DOMContentLoaded', function () {
+  const toggle = document.getElementById("togglePassword");
+  const password = document.getElementById("password");
+  if (!toggle || !password) return;
+
+  toggle.addEventListener("click", () => {
+    const type = password.getAttribute("type") === "password" ? "text" : "password";
+    password.setAttribute("type", type);
+
+    toggle.classList.toggle("bi-eye");
+    toggle.classList.toggle("bi-eye-slash");
+  });
+});
@@ -0,0 +1,46 @@
+"""
+Testler geçici bir SQLite veritabanıyla çalışır. app modülü import anında
+uygulamayı kurduğu için ortam ayarları her şeyden önce yapılır.
+
+    cd functions && python -m pytest -q tests
+"""
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+_TMP = tempfile.mkdtemp(prefix="hts-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_TMP}/test.db"
+os.environ.setdefault("TEMPLATE_CACHE_DIR", "")
+os.environ.setdefault("JOB_WORKER", "off")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pytest  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def app():
+    import app as app_module
+    import maintenance
+    flask_app = app_module.app
+    flask_app.config["TESTING"] = True
+    with flask_app.app_context():
+        maintenance.upgrade_database()
+    return flask_app
+
+
+@pytest.fixture
+def client(app):
+    """Oturum açmış test istemcisi (kullanıcı: "test")."""
+    from models import db, User
+    with app.app_context():
+        user = User.query.filter_by(username="test").first()
+        if user is None:
+            user = User(username="test", password="-")
+            db.session.add(user)
+            db.session.commit()
+        uid = user.id
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session["_user_id"] = str(uid)
+    return client
@@ -0,0 +1,80 @@
+"""/api/v1: toplu yazımlar tek transaction'da (hepsi ya da hiçbiri), alan seçimi ve sayfalama."""
+
+
+def _create(client, *names):
+    r = client.post("/api/v1/students", json={"students": [{"name": n} for n in names]})
+    assert r.status_code == 201, r.get_json()
+    return r.get_json()["ids"]
+
+
+def test_requires_login(app):
+    r = app.test_client().get("/api/v1/students")
+    assert r.status_code == 401 and r.get_json() == {"error": "Giriş gerekli."}
+
+
+def test_batch_create_returns_ids_in_order(client):
+    ids = _create(client, "Api Sıra 1", "Api Sıra 2", "Api Sıra 3")
+    assert ids == sorted(ids) and len(set(ids)) == 3
+    for sid, name in zip(ids, ("Api Sıra 1", "Api Sıra 2", "Api Sıra 3")):
+        body = client.get(f"/api/v1/students/{sid}?fields=name,added_by").get_json()
+        assert body == {"id": sid, "name": name, "added_by": "test"}
+
+
+def test_batch_create_is_all_or_nothing(client):
+    r = client.post("/api/v1/students", json={"students": [
+        {"name": "Api Hepsi Ya Da Hiçbiri"}, {"name": ""}, {"name": "x", "status": "bilinmez"},
+    ]})
+    assert r.status_code == 422
+    assert [d["index"] for d in r.get_json()["details"]] == [1, 2]
+    listed = client.get("/api/v1/students?q=hepsi ya da").get_json()
+    assert listed["items"] == []
+
+
+def test_booleans_are_not_ids(client):
+    [sid] = _create(client, "Api Bool")
+    r = client.post("/api/v1/notes", json={"notes": [{"student_id": True, "text": "x"}]})
+    assert r.status_code == 422
+    assert r.get_json()["details"] == [{"index": 0, "errors": ["student_id tam sayı olmalı."]}]
+    r = client.post("/api/v1/students/status", json={"ids": [sid, False], "status": "cozuldu"})
+    assert r.status_code == 400
+
+
+def test_batch_notes_and_status(client):
+    a, b = _create(client, "Api Not A", "Api Not B")
+    r = client.post("/api/v1/notes", json={"notes": [
+        {"student_id": a, "text": "birinci"}, {"student_id": a, "text": "ikinci"},
+        {"student_id": b, "text": "üçüncü"},
+    ]})
+    assert r.status_code == 201 and r.get_json()["created"] == 3
+
+    body = client.get(f"/api/v1/students/{a}?fields=note_count&include=notes").get_json()
+    assert body["note_count"] == 2
+    assert sorted(n["text"] for n in body["notes"]) == ["birinci", "ikinci"]
+
+    # bulunamayan öğrenci: hiçbir not eklenmez
+    r = client.post("/api/v1/notes", json={"notes": [
+        {"student_id": b, "text": "eklenmemeli"}, {"student_id": 10 ** 9, "text": "x"},
+    ]})
+    assert r.status_code == 422 and r.get_json()["details"][0]["index"] == 1
+    assert client.get(f"/api/v1/students/{b}?fields=note_count").get_json()["note_count"] == 1
+
+    r = client.post("/api/v1/students/status", json={"ids": [a, b, a], "status": "cozuldu"})
+    assert r.get_json() == {"matched": 2, "changed": 2}
+    r = client.post("/api/v1/students/status", json={"ids": [a], "status": "cozuldu"})
+    assert r.get_json() == {"matched": 1, "changed": 0}
+    r = client.post("/api/v1/students/status", json={"ids": [a, 10 ** 9], "status": "cozulmedi"})
+    assert r.status_code == 404 and r.get_json()["details"] == {"missing": [10 ** 9]}
+
+
+def test_list_fields_and_keyset_pages(client):
+    ids = _create(client, "Api Liste 1", "Api Liste 2", "Api Liste 3")
+    first = client.get("/api/v1/students?q=api liste&per_page=2&fields=name&count=1").get_json()
+    assert [i["id"] for i in first["items"]] == ids[::-1][:2]
+    assert set(first["items"][0]) == {"id", "name"}
+    assert first["total"] == 3 and first["next_before_id"] == ids[1]
+
+    rest = client.get(f"/api/v1/students?q=api liste&per_page=2&before_id={ids[1]}").get_json()
+    assert [i["id"] for i in rest["items"]] == [ids[0]] and rest["next_before_id"] is None
+
+    r = client.get("/api/v1/students?fields=name,password")
+    assert r.status_code == 400 and r.get_json()["details"] == {"fields": ["password"]}
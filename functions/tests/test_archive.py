@@ -0,0 +1,53 @@
+"""Arşive taşınan öğrencilerin id'leri yeniden verilmez; geri yükleme çakışmayı bildirir."""
+from datetime import datetime, timedelta
+
+import pytest
+
+import archive
+from models import db, ArchivedStudent, Student, StudentNote
+
+
+def _archive(name):
+    s = Student(name=name, status=archive.ARCHIVE_STATUS)
+    s.notes.append(StudentNote(text="çözüldü"))
+    db.session.add(s)
+    db.session.commit()
+    sid, nid = s.id, s.notes[0].id
+    assert archive.archive_students([sid], datetime.utcnow() + timedelta(days=1)) == [sid]
+    db.session.commit()
+    return sid, nid
+
+
+def test_archived_ids_are_not_reused(app):
+    with app.app_context():
+        sid, nid = _archive("Arşivlenen En Son")
+
+        s = Student(name="Sonraki")
+        s.notes.append(StudentNote(text="yeni"))
+        db.session.add(s)
+        db.session.commit()
+        assert s.id > sid and s.notes[0].id > nid
+
+        assert archive.restore_student(sid)
+        db.session.commit()
+        assert db.session.get(Student, sid).name == "Arşivlenen En Son"
+        assert db.session.get(StudentNote, nid).student_id == sid
+
+
+def test_restore_collision_is_reported(app, client):
+    with app.app_context():
+        sid, _ = _archive("Çakışan")
+        # AUTOINCREMENT öncesi veritabanlarında id başka kayda verilmiş olabilir
+        db.session.add(Student(id=sid, name="Aynı id"))
+        db.session.commit()
+
+        with pytest.raises(ValueError):
+            archive.restore_student(sid)
+        db.session.rollback()
+
+    r = client.post(f"/student/{sid}/restore")
+    assert r.status_code == 302 and "include_archived=1" in r.location
+
+    with app.app_context():
+        assert db.session.get(ArchivedStudent, sid) is not None
+        assert db.session.get(Student, sid).name == "Aynı id"
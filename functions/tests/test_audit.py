@@ -0,0 +1,51 @@
+"""Geçmiş kaydı: bulutta olaylar istek dönmeden yazılır (thread / atexit'e güvenilmez)."""
+import pytest
+from flask import Flask
+
+import audit
+from models import db, AuditEvent, Student
+
+
+def test_audit_mode_defaults_to_sync_in_cloud():
+    assert audit.audit_mode({}) == "thread"
+    assert audit.audit_mode({"FIREBASE_CONFIG": "{}"}) == "sync"
+    assert audit.audit_mode({"K_SERVICE": "serving"}) == "sync"
+    assert audit.audit_mode({"K_SERVICE": "serving", "AUDIT_MODE": "thread"}) == "thread"
+
+
+def test_init_app_uses_a_synchronous_writer_in_cloud(monkeypatch):
+    monkeypatch.setenv("K_SERVICE", "serving")
+    monkeypatch.delenv("AUDIT_MODE", raising=False)
+    app = Flask(__name__)
+    audit.init_app(app)
+    assert app.extensions["audit"].synchronous
+
+
+@pytest.fixture
+def sync_writer(app):
+    previous = app.extensions.get("audit")
+    writer = app.extensions["audit"] = audit.AuditWriter(app, synchronous=True)
+    yield writer
+    app.extensions["audit"] = previous
+
+
+def test_event_is_persisted_when_the_request_returns(app, client, sync_writer):
+    with app.app_context():
+        s = Student(name="Geçmiş")
+        db.session.add(s)
+        db.session.commit()
+        sid = s.id
+
+    r = client.post(f"/student/{sid}/note", data={"note": "kayıt", "status": "cozuldu"})
+    assert r.status_code == 302
+
+    # flush() beklemeden: yazıcı thread'i hiç başlamadı
+    assert sync_writer._thread is None
+    with app.app_context():
+        rows = AuditEvent.query.filter_by(student_id=sid).order_by(AuditEvent.id).all()
+        assert [(e.action, e.entity, e.actor) for e in rows] == [
+            ("create", "student", None),
+            ("update", "student", "test"),
+            ("create", "note", "test"),
+        ]
+        assert rows[1].changes == {"status": ["cozulmedi", "cozuldu"]}
@@ -0,0 +1,34 @@
+"""load_user önbelleği: kullanıcı değişikliği commit'ten sonra görünür, geri alınan değişiklik hiç."""
+from auth import SessionUser, load_user, user_cache
+from models import db, User
+
+
+def test_cached_user_is_invalidated_after_commit(app):
+    with app.app_context():
+        user = User(username="onbellek-eski", password="-")
+        db.session.add(user)
+        db.session.commit()
+        uid = user.id
+        assert load_user(str(uid)).username == "onbellek-eski"
+
+        user.username = "onbellek-yeni"
+        db.session.flush()
+        # commit'ten önce başka bir istek eski satırı okuyup önbelleğe alır
+        user_cache.set(uid, SessionUser(uid, "onbellek-eski"))
+        db.session.commit()
+        assert load_user(str(uid)).username == "onbellek-yeni"
+
+
+def test_rolled_back_change_keeps_cached_user(app):
+    with app.app_context():
+        user = User(username="onbellek-geri", password="-")
+        db.session.add(user)
+        db.session.commit()
+        uid = user.id
+        cached = load_user(str(uid))
+
+        user.username = "onbellek-hic"
+        db.session.flush()
+        db.session.rollback()
+        assert load_user(str(uid)) is cached
+        assert db.session.get(User, uid).username == "onbellek-geri"
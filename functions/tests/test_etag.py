@@ -0,0 +1,58 @@
+"""Koşullu GET: yazım yoksa 304, yazımdan sonra yeni ETag; sürüm commit'ten sonra artar."""
+from models import db, Student, StudentNote, students_version
+
+
+def _revalidate(client, url, etag):
+    return client.get(url, headers={"If-None-Match": etag})
+
+
+def test_dashboard_etag_changes_only_after_a_write(app, client):
+    first = client.get("/dashboard?added_by=etag-test")
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    assert _revalidate(client, "/dashboard?added_by=etag-test", etag).status_code == 304
+
+    with app.app_context():
+        db.session.add(Student(name="ETag Öğrencisi", added_by="etag-test"))
+        db.session.commit()
+
+    fresh = _revalidate(client, "/dashboard?added_by=etag-test", etag)
+    assert fresh.status_code == 200
+    assert fresh.headers["ETag"] != etag
+    assert "ETag Öğrencisi" in fresh.get_data(as_text=True)
+    assert _revalidate(client, "/dashboard?added_by=etag-test",
+                       fresh.headers["ETag"]).status_code == 304
+
+
+def test_student_page_etag_follows_notes(app, client):
+    with app.app_context():
+        s = Student(name="ETag Detay")
+        db.session.add(s)
+        db.session.commit()
+        sid = s.id
+
+    etag = client.get(f"/student/{sid}").headers["ETag"]
+    assert _revalidate(client, f"/student/{sid}", etag).status_code == 304
+
+    client.post(f"/student/{sid}/note", data={"note": "yeni not"})
+    fresh = _revalidate(client, f"/student/{sid}", etag)
+    assert fresh.status_code == 200
+    assert "yeni not" in fresh.get_data(as_text=True)
+
+
+def test_version_is_bumped_after_commit_not_in_the_transaction(app):
+    with app.app_context():
+        before, _ = students_version()
+
+        s = Student(name="Sürüm")
+        db.session.add(s)
+        db.session.flush()
+        # data_versions satırı yazarın transaction'ında kilitlenmez
+        assert students_version()[0] == before
+        db.session.commit()
+        assert students_version()[0] == before + 1
+
+        db.session.add(StudentNote(student_id=s.id, text="geri alınacak"))
+        db.session.flush()
+        db.session.rollback()
+        assert students_version()[0] == before + 1
@@ -0,0 +1,58 @@
+"""Dışa aktarma: filtredeki her öğrenci tam bir kez, not özetleriyle; çıktı parça parça akar."""
+import csv
+import io
+import re
+import zipfile
+from datetime import datetime, timedelta
+
+import export
+from models import db, Student, StudentNote
+
+TAG = "disa-aktarma"
+COUNT = export.CHUNK_ROWS + 3
+
+
+def _seed(app):
+    with app.app_context():
+        if Student.query.filter_by(added_by=TAG).count():
+            return
+        base = datetime(2024, 1, 1)
+        for i in range(COUNT):
+            s = Student(name=f"Aktarım {i}", added_by=TAG)
+            if i % 100 == 0:
+                s.notes = [StudentNote(text=f"not {i}-{n}", created_at=base + timedelta(hours=n))
+                           for n in range(3)]
+            db.session.add(s)
+        db.session.commit()
+
+
+def _get(client, fmt):
+    r = client.get(f"/export?format={fmt}&notes=1&added_by={TAG}", buffered=False)
+    chunks = list(r.response)
+    r.close()
+    return r, chunks
+
+
+def test_csv_export_streams_every_row_with_notes(app, client):
+    _seed(app)
+    r, chunks = _get(client, "csv")
+    assert r.mimetype == "text/csv"
+    assert len(chunks) > 1  # CHUNK_ROWS'ta bir parça
+    rows = list(csv.reader(io.StringIO(b"".join(chunks).decode("utf-8-sig"))))
+    header, body = rows[0], rows[1:]
+    assert header[-3:] == ["Not Sayısı", "Son Not Tarihi", "Son Not"]
+    assert len(body) == COUNT
+    assert len({row[0] for row in body}) == COUNT
+
+    by_name = {row[1]: row for row in body}
+    assert by_name["Aktarım 0"][-3:] == ["3", "2024-01-01 02:00", "not 0-2"]
+    assert by_name["Aktarım 1"][-3:] == ["0", "", ""]
+
+
+def test_xlsx_export_has_the_same_rows(app, client):
+    _seed(app)
+    r, chunks = _get(client, "xlsx")
+    with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as z:
+        sheet = z.read("xl/worksheets/sheet1.xml").decode("utf-8")
+    assert len(re.findall(r"<row\b", sheet)) == COUNT + 1  # başlık + satırlar
+    assert "not 500-2" in sheet
@@ -0,0 +1,61 @@
+"""CSV içe aktarma: partiler hâlinde yazım, dosya içi / veritabanı mükerrer kontrolü, rapor."""
+import io
+
+import pytest
+
+import importer
+from models import db, Student, StudentStat, staff_counts
+
+CSV = (
+    "Ad Soyad;Telefon;Okul No;Fakülte;Bölüm;Durum;İlk Not\n"
+    "İçe Bir;0500 000 00 01;IMP-1;Tıp Fakültesi;TIP;çözüldü;ilk görüşme\n"
+    "İçe İki;0500 000 00 02;IMP-2;;;;\n"
+    ";0500 000 00 03;IMP-3;;;;\n"                  # isim yok
+    "İçe Dört;0500 000 00 04;IMP-1;;;;\n"          # önceki partideki okul no
+    "İçe Beş;0500 000 00 02;IMP-5;;;;\n"           # önceki partideki telefon
+    "\n"
+    "İçe Altı;0500 000 00 06;IMP-6;;;bilinmez;\n"  # geçersiz durum
+    "İçe Yedi;0500 000 00 07;IMP-7;;;;\n"
+    "İçe Yedi Tekrar;;IMP-7;;;;\n"                 # aynı partide okul no
+)
+
+
+def test_import_chunks_dedups_and_reports(app):
+    with app.app_context():
+        report = importer.import_students(io.StringIO(CSV), added_by="ice-aktaran", chunk_size=2)
+
+        assert (report.rows, report.created, report.duplicates, report.errors) == (8, 3, 3, 2)
+        assert sorted((line, kind) for line, kind, _ in report.issues) == [
+            (4, "error"), (5, "duplicate"), (6, "duplicate"),
+            (8, "error"), (10, "duplicate"),
+        ]
+
+        students = {s.name: s for s in Student.query.filter_by(added_by="ice-aktaran")}
+        assert sorted(students) == ["İçe Bir", "İçe Yedi", "İçe İki"]
+        first = students["İçe Bir"]
+        assert first.status == "cozuldu" and first.faculty_id is not None
+        assert first.note_count == 1 and [n.text for n in first.notes] == ["ilk görüşme"]
+        assert first.search_key == "ice bir|05000000001|imp-1"
+
+        # Core INSERT'ler de sayaçları günceller
+        assert dict(staff_counts())["ice-aktaran"] == 3
+        assert db.session.get(StudentStat, ("ice-aktaran", "cozuldu")).count == 1
+
+        # ikinci yükleme: hepsi veritabanındaki kayıtlarla mükerrer
+        again = importer.import_students(io.StringIO(CSV), added_by="ice-aktaran")
+        assert again.created == 0 and again.duplicates == 6
+
+
+def test_import_requires_a_name_column(app):
+    with app.app_context():
+        with pytest.raises(importer.ImportFileError, match="Ad Soyad"):
+            importer.import_students(io.StringIO("Telefon,Okul No\n1,2\n"), added_by="x")
+
+
+def test_upload_page_renders_report(client):
+    data = {"file": (io.BytesIO("\ufeffname,school_no\nYükleme Bir,UPL-1\n,UPL-2\n".encode()),
+                     "ogrenciler.csv")}
+    html = client.post("/import", data=data, content_type="multipart/form-data")\
+        .get_data(as_text=True)
+    assert "2 satır okundu: <strong>1</strong> eklendi" in " ".join(html.split())
+    assert "İsim zorunlu." in html
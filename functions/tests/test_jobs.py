@@ -0,0 +1,41 @@
+"""İş kuyruğu işçisinin varsayılan çalışma biçimi; bulutta işler ekleyen istekte biter."""
+import pytest
+
+import jobs
+from app import create_app
+from models import Job
+
+
+def test_worker_mode_defaults_to_inline_in_cloud():
+    assert jobs.worker_mode({}) == "thread"
+    assert jobs.worker_mode({"FIREBASE_CONFIG": "{}"}) == "inline"
+    assert jobs.worker_mode({"K_SERVICE": "serving"}) == "inline"
+    assert jobs.worker_mode({"K_SERVICE": "serving", "JOB_WORKER": "process"}) == "process"
+    assert jobs.worker_mode({"JOB_WORKER": "off"}) == "off"
+
+
+@pytest.fixture
+def cloud_app(app, monkeypatch):
+    monkeypatch.setenv("K_SERVICE", "serving")
+    monkeypatch.delenv("JOB_WORKER", raising=False)
+    return create_app()
+
+
+def test_job_enqueued_in_cloud_finishes(cloud_app):
+    assert isinstance(cloud_app.extensions["jobs"], jobs.InlineRunner)
+    with cloud_app.app_context():
+        j = jobs.enqueue("recount-stats", created_by="test")
+        assert (j.status, j.message) == ("done", "Sayaçlar yeniden hesaplandı.")
+        assert j.worker.endswith(":inline") and j.finished_at is not None
+
+
+@pytest.mark.parametrize("path, kind", [("/__seed_admin", "seed-admin"),
+                                        ("/__migrate_all", "migrate")])
+def test_maintenance_endpoints_finish_their_job(cloud_app, path, kind):
+    token = cloud_app.config["INIT_TOKEN"]
+    r = cloud_app.test_client().get(f"{path}?token={token}")
+    assert r.status_code == 200
+    body = r.get_json()
+    assert (body["kind"], body["status"]) == (kind, "done")
+    with cloud_app.app_context():
+        assert not Job.query.filter(Job.status.in_(jobs.ACTIVE_STATUSES)).count()
@@ -0,0 +1,35 @@
+"""Canlı güncelleme: bulutta varsayılan kapalı; dashboard satır parçaları bozuk id'lerde 500 vermez."""
+from flask import Flask
+
+import live
+from models import db, Student
+
+
+def test_live_is_off_in_cloud_without_postgres_broker():
+    assert live.live_enabled({})
+    assert not live.live_enabled({"LIVE": "0"})
+    assert not live.live_enabled({"K_SERVICE": "serving"})
+    assert not live.live_enabled({"FIREBASE_CONFIG": "{}", "LIVE": "1"})
+    assert live.live_enabled({"K_SERVICE": "serving", "LIVE": "1", "LIVE_BROKER": "postgres"})
+
+
+def test_init_app_skips_broker_in_cloud(monkeypatch):
+    monkeypatch.setenv("K_SERVICE", "serving")
+    monkeypatch.setenv("LIVE", "1")
+    monkeypatch.delenv("LIVE_BROKER", raising=False)
+    app = Flask(__name__)
+    live.init_app(app)
+    assert "live" not in app.extensions
+
+
+def test_dashboard_rows_skips_non_decimal_ids(app, client):
+    with app.app_context():
+        s = Student(name="Canlı Satır")
+        db.session.add(s)
+        db.session.commit()
+        sid = s.id
+
+    r = client.get(f"/dashboard/rows?ids={sid},²,-1,x")
+    assert r.status_code == 200
+    rows = r.get_json()["rows"]
+    assert list(rows) == [str(sid)] and "Canlı Satır" in rows[str(sid)]
@@ -0,0 +1,56 @@
+"""Dashboard keyset sayfalaması: sayfa sınırları ve eşit sıralama anahtarlarında id ile ayrım."""
+from datetime import datetime
+
+from models import db, Student, fetch_student_page, read_student_filters
+
+SAME_TIME = datetime(2024, 1, 1, 12, 0)
+
+
+def _seed(tag, count):
+    students = [Student(name=f"{tag} {i}", added_by=tag, created_at=SAME_TIME)
+                for i in range(count)]
+    db.session.add_all(students)
+    db.session.commit()
+    return sorted((s.id for s in students), reverse=True)
+
+
+def _all_pages(tag, per_page, sort):
+    filters = read_student_filters({"added_by": tag})
+    pages, cursor = [], {}
+    while True:
+        rows, cursor = fetch_student_page(
+            filters, cursor.get("before_id"), per_page, sort,
+            datetime.fromisoformat(cursor["before_at"]) if "before_at" in cursor else None,
+        )
+        pages.append([r.id for r in rows])
+        if cursor is None:
+            return pages
+
+
+def test_pages_split_on_exact_boundary(app):
+    with app.app_context():
+        ids = _seed("sayfa-sinir", 4)
+        # tam per_page katında son sayfadan sonra imleç yok, boş sayfa istenmez
+        assert _all_pages("sayfa-sinir", 2, "new") == [ids[:2], ids[2:]]
+        assert _all_pages("sayfa-sinir", 4, "new") == [ids]
+        assert _all_pages("sayfa-sinir", 3, "new") == [ids[:3], ids[3:]]
+
+
+def test_equal_activity_is_ordered_by_id(app):
+    with app.app_context():
+        ids = _seed("sayfa-esit", 5)
+        # hepsinin son hareketi aynı: imleç (zaman, id) satır atlamadan / tekrarlamadan ilerler
+        pages = _all_pages("sayfa-esit", 2, "active")
+        assert pages == [ids[:2], ids[2:4], ids[4:]]
+
+
+def test_dashboard_renders_next_page_link(app, client):
+    with app.app_context():
+        ids = _seed("sayfa-html", 3)
+    html = client.get("/dashboard?added_by=sayfa-html&per_page=2").get_data(as_text=True)
+    assert f'data-id="{ids[0]}"' in html and f'data-id="{ids[2]}"' not in html
+    assert f"before_id={ids[1]}" in html
+
+    html = client.get(f"/dashboard?added_by=sayfa-html&per_page=2&before_id={ids[1]}")\
+        .get_data(as_text=True)
+    assert f'data-id="{ids[2]}"' in html and f'data-id="{ids[0]}"' not in html
@@ -0,0 +1,61 @@
+"""Giriş denemesi sınırı: istemci IP'si başına ve instance'lar arası paylaşılan depo."""
+import pytest
+from flask import Request
+from werkzeug.test import EnvironBuilder
+
+from auth import limiter
+
+# LOGIN_RATE_LIMIT varsayılanı: dakikada 10
+PER_MINUTE = 10
+
+
+def _login(send, ip, username="yok"):
+    return send("/", method="POST", data={"username": username, "password": "yanlis"},
+                headers={"X-Forwarded-For": ip}, environ_base={"REMOTE_ADDR": "10.0.0.1"})
+
+
+def _via_serving(path, **kwargs):
+    main = pytest.importorskip("main")  # firebase-functions kurulu olmalı
+    resp = main.serving(Request(EnvironBuilder(path=path, **kwargs).get_environ()))
+    resp.close()
+    return resp
+
+
+def test_login_limit_is_per_client_ip_through_serving(app):
+    limiter.reset()
+    for i in range(PER_MINUTE):
+        assert _login(_via_serving, "203.0.113.10", f"u{i}").status_code != 429
+    assert _login(_via_serving, "203.0.113.10").status_code == 429
+    # aynı proxy'nin arkasındaki başka bir istemci etkilenmez
+    assert _login(_via_serving, "203.0.113.11").status_code != 429
+
+
+def test_login_limit_shared_through_redis(app):
+    """İki instance (iki app) aynı Redis'i kullanınca sayaç ortak."""
+    fakeredis = pytest.importorskip("fakeredis")
+    redis = pytest.importorskip("redis")
+    import app as app_module
+
+    server = fakeredis.FakeServer()
+    connection_class = getattr(fakeredis, "FakeRedisConnection", None) or fakeredis.FakeConnection
+
+    def instance():
+        pool = redis.ConnectionPool(server=server, connection_class=connection_class)
+        flask_app = app_module.create_app({
+            "TESTING": True,
+            "RATELIMIT_STORAGE_URI": "redis://redis.invalid:6379",
+            "RATELIMIT_STORAGE_OPTIONS": {"connection_pool": pool},
+        })
+        return flask_app.test_client()
+
+    first = instance()
+    for i in range(PER_MINUTE):
+        assert _login(first.open, "198.51.100.20", f"u{i}").status_code != 429
+    keys = redis.Redis(connection_pool=redis.ConnectionPool(
+        server=server, connection_class=connection_class)).keys("LIMITS*")
+    assert keys, "sayaçlar Redis'e yazılmalı"
+
+    # yeni instance: kendi bağlantı havuzu, aynı sunucu -> 11. deneme reddedilir
+    second = instance()
+    assert _login(second.open, "198.51.100.20").status_code == 429
+    assert _login(second.open, "198.51.100.21").status_code != 429
@@ -0,0 +1,92 @@
+"""
+Okuma replikası: birincil ve replika ayrı SQLite dosyaları. Aynı öğrencinin
+adı iki dosyada farklı olduğundan yanıttaki ad okumanın nereden yapıldığını
+gösterir.
+"""
+import sqlite3
+
+import pytest
+from sqlalchemy import select
+
+from app import create_app
+from database import STICKY_KEY
+from models import db, Student, StudentNote
+
+TAG = "replika-testi"
+
+
+def _copy(source, target):
+    with sqlite3.connect(source) as src, sqlite3.connect(target) as dst:
+        src.backup(dst)
+
+
+@pytest.fixture
+def routed(app, client, tmp_path):
+    """(app, client, öğrenci id'si, replika dosyası): birincilde "Birincil", replikada "Replika"."""
+    with app.app_context():
+        s = Student(name="Birincil", added_by=TAG)
+        db.session.add(s)
+        db.session.commit()
+        sid = s.id
+        source = db.engine.url.database
+    primary, replica = tmp_path / "primary.db", tmp_path / "replica.db"
+    _copy(source, primary)
+    _copy(source, replica)
+    with sqlite3.connect(replica) as conn:
+        conn.execute("UPDATE student SET name = 'Replika' WHERE id = ?", (sid,))
+
+    routed_app = create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{primary}",
+                             "DATABASE_READ_URL": f"sqlite:///{replica}"})
+    routed_client = routed_app.test_client()
+    with client.session_transaction() as logged_in, \
+            routed_client.session_transaction() as session:
+        session.update(logged_in)
+    with app.app_context():
+        db.session.delete(db.session.get(Student, sid))
+        db.session.commit()
+    return routed_app, routed_client, sid, replica
+
+
+def _names(client):
+    r = client.get(f"/api/v1/students?added_by={TAG}&fields=name")
+    assert r.status_code == 200
+    return [item["name"] for item in r.get_json()["items"]]
+
+
+def test_get_reads_from_replica(routed):
+    _, client, _, _ = routed
+    assert _names(client) == ["Replika"]
+
+
+def test_post_uses_primary_and_next_reads_stick_to_it(routed):
+    _, client, sid, replica = routed
+    # replikada öğrenci yok: POST'un okuması replikaya gitseydi 404 olurdu
+    with sqlite3.connect(replica) as conn:
+        conn.execute("DELETE FROM student WHERE id = ?", (sid,))
+    r = client.post("/api/v1/students/status", json={"ids": [sid], "status": "cozuldu"})
+    assert r.get_json() == {"matched": 1, "changed": 1}
+
+    # yazımdan sonra kendi değişikliğini görür (DB_READ_STICKY_SECONDS)
+    with client.session_transaction() as session:
+        assert STICKY_KEY in session
+    assert _names(client) == ["Birincil"]
+
+    with client.session_transaction() as session:
+        session[STICKY_KEY] = 0
+    assert _names(client) == []
+    with client.session_transaction() as session:
+        assert STICKY_KEY not in session
+
+
+def test_reads_after_a_write_in_the_same_session_use_primary(routed):
+    routed_app, _, sid, _ = routed
+    name = select(Student.name).where(Student.id == sid)
+    with routed_app.test_request_context("/"):
+        db.session.info["read_replica"] = True
+        assert db.session.scalar(name) == "Replika"
+
+        db.session.add(StudentNote(student_id=sid, text="yazım"))
+        db.session.flush()
+        assert "read_replica" not in db.session.info
+        assert db.session.scalar(name) == "Birincil"
+        db.session.rollback()
@@ -0,0 +1,57 @@
+"""Dashboard araması: Türkçe normalize anahtar, trigram (FTS5) eşleşmesi ve kısa terimler."""
+import search
+from models import db, Student, fetch_student_page, read_student_filters
+
+TAG = "arama-test"
+
+
+def _names(q):
+    rows, _ = fetch_student_page(read_student_filters({"q": q, "added_by": TAG}), per_page=50)
+    return sorted(r.name for r in rows)
+
+
+def test_fold_normalizes_turkish_letters_and_spaces():
+    assert search.fold("İLGAZ") == search.fold("ılgaz") == search.fold("Ilgaz") == "ilgaz"
+    assert search.fold("  Şükrü   ÇAĞLAR ") == "sukru caglar"
+    assert search.build_search_key("Öz Işık", "0532 (111) 22-33", "AB 12") \
+        == "oz isik|05321112233|ab 12"
+
+
+def test_phone_like_query_is_also_searched_as_digits():
+    assert search.search_terms("0532 111 22 33") == ["0532 111 22 33", "05321112233"]
+    assert search.search_terms("Ali") == ["ali"]
+    assert search.search_terms("  ") == []
+
+
+def test_search_matches_substrings_across_case_and_accents(app):
+    with app.app_context():
+        db.session.add_all([
+            Student(name="Şükrü Işık", phone="0532 111 22 33", school_no="AB-123", added_by=TAG),
+            Student(name="İlkay Öztürk", phone="0212 999 88 77", added_by=TAG),
+            Student(name="Mehmet Kaya", school_no="ZX-9", added_by=TAG),
+        ])
+        db.session.commit()
+
+        assert _names("sukru") == ["Şükrü Işık"]
+        assert _names("IŞIK") == ["Şükrü Işık"]
+        assert _names("ilkay") == ["İlkay Öztürk"]
+        assert _names("ztür") == ["İlkay Öztürk"]          # kelime ortası trigram
+        assert _names("111 22 33") == ["Şükrü Işık"]       # boşluklu telefon
+        assert _names("0212-999") == ["İlkay Öztürk"]
+        assert _names("ab-1") == ["Şükrü Işık"]            # okul no
+        assert _names("zx") == ["Mehmet Kaya"]             # 3 harften kısa: LIKE yolu
+        assert _names("k") == ["Mehmet Kaya", "İlkay Öztürk", "Şükrü Işık"]
+        assert _names("yok böyle") == []
+        # alanlar arası eşleşme yok: isim sonu + telefon başı
+        assert _names("ık0532") == []
+
+
+def test_search_follows_updates(app):
+    with app.app_context():
+        s = Student(name="Eski Adı", added_by=TAG)
+        db.session.add(s)
+        db.session.commit()
+        s.name = "Yeni Soyadı"
+        db.session.commit()
+        assert _names("eski ad") == []
+        assert _names("yeni soy") == ["Yeni Soyadı"]
@@ -0,0 +1,38 @@
+"""Firebase `serving` giriş noktası: istek wsgi_app üzerinden (middleware'lerle) çalışmalı."""
+import pytest
+from flask import Request
+from werkzeug.test import EnvironBuilder
+
+import metrics
+
+
+def _serve(path, **kwargs):
+    main = pytest.importorskip("main")  # firebase-functions kurulu olmalı
+    environ = EnvironBuilder(path=path, **kwargs).get_environ()
+    return main.serving(Request(environ))
+
+
+def test_serving_records_metrics(app):
+    metrics.registry.reset()
+    resp = _serve("/health")
+    assert resp.status_code == 200
+    assert resp.get_data() == b"OK"
+    resp.close()  # ölçüm gövde kapanınca tamamlanır
+    assert 'endpoint="web.health",method="GET",status="200"' in metrics.registry.render()
+
+
+def test_server_timing_only_with_metrics_token(app):
+    # SQL sayısı / süreleri anonim istemcilere gitmez
+    resp = _serve("/health")
+    resp.close()
+    assert "Server-Timing" not in resp.headers
+
+    resp = _serve("/health", headers={"X-Metrics-Token": "yanlis"})
+    resp.close()
+    assert "Server-Timing" not in resp.headers
+
+    resp = _serve("/health", headers={"X-Metrics-Token": app.config["INIT_TOKEN"]})
+    resp.close()
+    assert "app;dur=" in resp.headers["Server-Timing"]
+    assert 'queries"' in resp.headers["Server-Timing"]
+
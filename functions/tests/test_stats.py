@@ -0,0 +1,51 @@
+"""student_stats sayaçları öğrenci yazımlarıyla aynı transaction'da güncel kalır."""
+from models import db, Student, StudentStat, recount_student_stats, staff_counts
+
+
+def _counts():
+    return {(s.added_by, s.status): s.count for s in StudentStat.query.all() if s.count}
+
+
+def _staff(name):
+    return dict(staff_counts()).get(name, 0)
+
+
+def test_counters_follow_insert_update_delete(app):
+    with app.app_context():
+        a = Student(name="Sayaç 1", added_by="sayac-a")
+        b = Student(name="Sayaç 2", added_by="sayac-a", status="cozuldu")
+        db.session.add_all([a, b])
+        db.session.commit()
+        assert _staff("sayac-a") == 2
+        assert _counts()[("sayac-a", "cozulmedi")] == 1
+
+        a.status = "cozuldu"
+        b.added_by = "sayac-b"
+        db.session.commit()
+        assert _counts()[("sayac-a", "cozuldu")] == 1
+        assert ("sayac-a", "cozulmedi") not in _counts()
+        assert _staff("sayac-b") == 1
+
+        db.session.delete(b)
+        db.session.commit()
+        assert _staff("sayac-b") == 0
+
+        # rollback edilen yazım sayaçlara da yansımaz
+        db.session.add(Student(name="Geri alınan", added_by="sayac-a"))
+        db.session.flush()
+        db.session.rollback()
+        assert _staff("sayac-a") == 1
+
+        before = _counts()
+        recount_student_stats()
+        assert _counts() == before
+
+
+def test_main_page_lists_staff_totals(app, client):
+    with app.app_context():
+        db.session.add_all(Student(name=f"Ana {i}", added_by="sayac-main") for i in range(3))
+        db.session.commit()
+        expected = sum(n for _, n in staff_counts())
+    html = " ".join(client.get("/main").get_data(as_text=True).split())
+    assert f"Toplam {expected} öğrenci kaydı" in html
+    assert 'sayac-main</td> <td class="text-end fw-semibold">3</td>' in html
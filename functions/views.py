@@ -0,0 +1,518 @@
+"""
+HTML sayfaları (web blueprint'i). Uygulama app.create_app() içinde kurulur;
+seyrek kullanılan bakım endpoint'leri maintenance.py'de ve ilk istekte yüklenir.
+"""
+import functools
+import hashlib
+import io
+import os
+from datetime import datetime
+from pathlib import Path
+
+from flask import (
+    Blueprint, Response, render_template, request, redirect, url_for, flash, abort,
+    make_response, session, stream_with_context, g, current_app
+)
+from flask_login import login_user, login_required, logout_user, current_user
+from markupsafe import Markup
+from sqlalchemy import event
+
+from auth import (
+    authenticate, limiter, login_failed, login_username_key,
+    LOGIN_RATE_LIMIT, LOGIN_USER_RATE_LIMIT,
+)
+from caching import FragmentCache, fragment_backend
+from database import read_replica
+from faculties import (
+    FACULTY_DEPARTMENTS, FACULTIES_JSON, FACULTIES_DIGEST, resolve_faculty_department,
+)
+import assets
+import live
+from models import (
+    db, STATUSES, Student, StudentNote,
+    staff_counts, added_by_options,
+    students_version, student_page_stamp,
+    read_student_filters, read_page_size, read_before_id, read_sort, read_before_at,
+    fetch_student_page, fetch_student_rows, count_students, export_students,
+    NOTES_PAGE_SIZE, NOTES_MAX_PAGE_SIZE, fetch_student_with_notes, fetch_note_page,
+)
+
+TEMPLATES_DIR = Path(__file__).resolve().parent / "templates"
+
+web = Blueprint("web", __name__)
+
+# -------------------------------
+# ROUTES
+# -------------------------------
+@web.route("/", methods=["GET", "POST"])
+@limiter.limit(LOGIN_RATE_LIMIT, methods=["POST"])
+@limiter.limit(LOGIN_USER_RATE_LIMIT, methods=["POST"], key_func=login_username_key,
+               deduct_when=login_failed)
+def login():
+    if request.method == "POST":
+        username = (request.form.get("username") or "").strip()
+        password = (request.form.get("password") or "").strip()
+
+        print("LOGIN TRY:", username)
+
+        # Bilinmeyen kullanıcı ve yanlış şifre aynı iş ve aynı mesaj
+        user = authenticate(username, password)
+        if user is None:
+            g.login_failed = True
+            flash("Kullanıcı adı veya şifre yanlış!", "danger")
+            return redirect(url_for(".login"))
+
+        # 🔥 REMEMBER YOK, SADECE SESSION
+        login_user(user, remember=False, fresh=True)
+        print("LOGIN SUCCESS for", user.username)
+
+        next_url = request.args.get("next")
+        if next_url:
+            return redirect(next_url)
+
+        return redirect(url_for(".dashboard"))
+
+    return render_template("login.html")
+
+@web.errorhandler(429)
+def too_many_login_attempts(e):
+    # Blueprint'te sınır yalnızca login POST'unda var
+    flash("Çok fazla giriş denemesi. Lütfen biraz sonra tekrar deneyin.", "danger")
+    return render_template("login.html"), 429
+
+@web.route("/logout")
+@login_required
+def logout():
+    logout_user()
+    return redirect(url_for(".login"))
+
+@web.app_context_processor
+def inject_faculties_url():
+    return {"faculties_url": url_for("web.faculties_json", digest=FACULTIES_DIGEST)}
+
+@web.get("/faculties.<digest>.json")
+def faculties_json(digest):
+    if digest != FACULTIES_DIGEST:
+        # eski HTML'deki eski hash -> güncel sürüm
+        return redirect(url_for(".faculties_json", digest=FACULTIES_DIGEST))
+    resp = Response(FACULTIES_JSON, mimetype="application/json")
+    resp.set_etag(FACULTIES_DIGEST)
+    resp.cache_control.public = True
+    resp.cache_control.max_age = 31536000
+    resp.cache_control.immutable = True
+    return resp.make_conditional(request)
+
+@web.route("/health")
+def health():
+    return "OK", 200
+
+@web.route("/whoami")
+@login_required
+def whoami():
+    print("WHOAMI:", current_user.is_authenticated, getattr(current_user, "username", None))
+    return f"✅ {current_user.username}", 200
+
+@web.route("/debug")
+def debug():
+    return {"cookies": dict(request.cookies)}
+
+# -------------------------------
+# KOŞULLU GET (ETag / 304)
+# -------------------------------
+@functools.cache
+def render_version():
+    """
+    Şablonlar, statik paketler ya da sürüm (Cloud Run revision) değişince tüm
+    ETag'ler de değişir. İlk çağrıda hesaplanır (import'ta değil).
+    """
+    return hashlib.sha256(
+        b"".join(p.read_bytes() for p in sorted((TEMPLATES_DIR).glob("*.html")))
+        + assets.bundles.version.encode()
+        + os.getenv("K_REVISION", "").encode()
+    ).hexdigest()[:12]
+
+def page_etag(*parts):
+    """Sayfa girdilerinden (sürüm damgası, kullanıcı, query string) ETag üretir."""
+    raw = "|".join(str(p) for p in (render_version(), current_user.get_id()) + parts)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+def set_validators(resp, etag, last_modified=None):
+    # private + no-cache: tarayıcı saklar ama her seferinde doğrular
+    resp.set_etag(etag, weak=True)
+    if last_modified is not None:
+        resp.last_modified = last_modified
+    resp.cache_control.private = True
+    resp.cache_control.no_cache = True
+    return resp
+
+def not_modified(etag, last_modified=None, shows_flashes=True):
+    """
+    İstemcinin kopyası güncelse 304 yanıtı, değilse None. Şablon flash mesajı
+    gösteriyorsa ve bekleyen mesaj varsa sayfa her zaman render edilir.
+    """
+    if shows_flashes and session.get("_flashes"):
+        return None
+    resp = set_validators(Response(), etag, last_modified)
+    resp.make_conditional(request)
+    return resp if resp.status_code == 304 else None
+
+
+
+# -------------------------------
+# Dashboard satır parçaları
+# -------------------------------
+# student.id -> (damga, <tr> HTML). Damga satırın bütün girdilerini içerir
+# (satır sürümü, not sayısı, son hareket), bayat parça hiç eşleşmez.
+# FRAGMENT_CACHE_URL=redis://... verilirse instance'lar arasında paylaşılır.
+row_cache = FragmentCache(fragment_backend(
+    os.getenv("FRAGMENT_CACHE_URL", ""),
+    maxsize=int(os.getenv("FRAGMENT_CACHE_SIZE", "5000")),
+    ttl=float(os.getenv("FRAGMENT_CACHE_TTL", "3600")),
+))
+
+@event.listens_for(Student, "after_update")
+@event.listens_for(Student, "after_delete")
+def _invalidate_student_row(mapper, connection, target):
+    # edit_student, durum değişikliği, delete_student ve API yazımları
+    row_cache.invalidate(target.id)
+
+def _row_stamp(s):
+    return f"{render_version()}:{request.script_root}:{s.row_version}:{s.note_count}:{s.last_activity}"
+
+def student_row_html(students):
+    """{id: <tr> HTML}; yalnızca önbellekte olmayan / bayat satırlar render edilir."""
+    stamps = {s.id: _row_stamp(s) for s in students}
+    html = row_cache.get_many(stamps)
+    template = current_app.jinja_env.get_template("_student_row.html")
+    rendered = {}
+    for s in students:
+        if s.id not in html:
+            html[s.id] = template.render(s=s)
+            rendered[s.id] = (stamps[s.id], html[s.id])
+    row_cache.set_many(rendered)
+    return html
+
+def render_student_rows(students):
+    html = student_row_html(students)
+    return Markup("".join(html[s.id] for s in students))
+
+@web.route("/dashboard")
+@read_replica
+@login_required
+def dashboard():
+    filters   = read_student_filters(request.args)
+    per_page  = read_page_size(request.args)
+    before_id = read_before_id(request.args)
+    sort      = read_sort(request.args)
+    before_at = read_before_at(request.args)
+
+    # Son render'dan beri hiçbir öğrenci / not yazılmadıysa liste sorgusuna gerek yok
+    version, last_modified = students_version()
+    etag = page_etag("dashboard", version, request.query_string.decode("latin-1"))
+    cached = not_modified(etag, last_modified)
+    if cached is not None:
+        return cached
+
+    students, next_cursor = fetch_student_page(filters, before_id, per_page, sort, before_at)
+    total = count_students(filters)
+
+    resp = make_response(render_template(
+        "dashboard.html",
+        students=students, student_rows=render_student_rows(students), total=total,
+        version=version, live_enabled="live" in current_app.extensions,
+        before_id=before_id, next_cursor=next_cursor, per_page=per_page, sort=sort,
+        added_by_options=added_by_options(),
+        faculties=FACULTY_DEPARTMENTS,
+        **filters
+    ))
+    return set_validators(resp, etag, last_modified)
+
+@web.get("/dashboard/rows")
+@read_replica
+@login_required
+def dashboard_rows():
+    """
+    Canlı güncelleme için satır parçaları: {"rows": {id: <tr> HTML ya da null}}.
+    null: öğrenci silinmiş ya da sayfanın filtrelerine artık uymuyor.
+    """
+    ids = [int(i) for i in request.args.get("ids", "").split(",") if i.isdecimal()][:200]
+    html = student_row_html(fetch_student_rows(read_student_filters(request.args), ids))
+    return {"rows": {i: html.get(i) for i in ids}}
+
+@web.get("/events")
+@read_replica
+@login_required
+def events():
+    """Dashboard değişiklik akışı (Server-Sent Events, bkz. live.py)."""
+    broker = current_app.extensions.get("live")
+    if broker is None:
+        abort(404)
+    version, _ = students_version()
+    db.session.remove()  # akış boyunca havuzdan bağlantı tutma
+    return Response(
+        live.stream(broker, version, current_app.config["LIVE_STREAM_SECONDS"]),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@web.get("/export")
+@read_replica
+@login_required
+def export_list():
+    """Dashboard filtreleriyle aynı liste; CSV ya da XLSX olarak akış hâlinde."""
+    import export
+    fmt = request.args.get("format", "csv")
+    if fmt not in export.FORMATS:
+        abort(400)
+    writer, mimetype = export.FORMATS[fmt]
+    filters = read_student_filters(request.args)
+    with_notes = request.args.get("notes") in ("1", "true")
+
+    header, rows = export_students(filters, with_notes=with_notes)
+    filename = f"ogrenciler-{datetime.utcnow():%Y%m%d-%H%M}.{fmt}"
+    return Response(
+        stream_with_context(writer(header, rows)),
+        mimetype=mimetype,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+@web.route("/add", methods=["GET", "POST"])
+@login_required
+def add_student():
+    if request.method == "POST":
+        name       = (request.form.get("name") or "").strip()
+        phone      = (request.form.get("phone") or "").strip()
+        school_no  = (request.form.get("school_no") or "").strip()
+        department = (request.form.get("department") or "").strip()
+        faculty    = (request.form.get("faculty") or "").strip()
+        status     = request.form.get("status", "cozulmedi")
+        problem    = (request.form.get("problem") or "").strip()  # ✅ yeni
+        note_text  = (request.form.get("note") or "").strip()     # ilk not
+
+        if not name:
+            flash("İsim zorunlu.", "danger")
+            return render_template("add_student.html", faculties=FACULTY_DEPARTMENTS)
+
+        # Bölüm seçilen fakülteye ait olmalı; adlar kanonik hâliyle saklanır
+        try:
+            faculty, department = resolve_faculty_department(faculty, department)
+        except ValueError as e:
+            flash(str(e), "danger")
+            return render_template("add_student.html", faculties=FACULTY_DEPARTMENTS)
+
+        s = Student(
+            name=name,
+            phone=phone or None,
+            school_no=school_no or None,
+            department=department or None,
+            faculty=faculty or None,
+            status=status if status in STATUSES else "cozulmedi",
+            problem=problem or None,
+            added_by=current_user.username,
+        )
+        db.session.add(s)
+
+        if note_text:
+            db.session.flush()  # s.id için; öğrenci ve ilk not tek commit'te
+            n = StudentNote(student_id=s.id, text=note_text, author=current_user.username)
+            db.session.add(n)
+
+        db.session.commit()
+
+        flash("Öğrenci eklendi.", "success")
+        return redirect(url_for(".dashboard"))
+
+    return render_template("add_student.html", faculties=FACULTY_DEPARTMENTS)
+
+@web.route("/import", methods=["GET", "POST"])
+@login_required
+def import_students_view():
+    import importer
+    if request.method == "POST":
+        upload = request.files.get("file")
+        if not upload or not upload.filename:
+            return render_template("import_students.html", error="Dosya seçilmedi.")
+        # Büyük yüklemeler werkzeug tarafından geçici dosyaya alınır; satır satır okunur
+        lines = io.TextIOWrapper(upload.stream, encoding="utf-8-sig", newline="")
+        try:
+            report = importer.import_students(lines, added_by=current_user.username)
+        except importer.ImportFileError as e:
+            return render_template("import_students.html", error=str(e))
+        except UnicodeDecodeError:
+            return render_template("import_students.html",
+                                   error="Dosya UTF-8 değil; CSV (UTF-8) olarak kaydedin.")
+        return render_template("import_students.html", report=report)
+
+    return render_template("import_students.html")
+
+@web.route("/student/<int:id>", methods=["GET", "POST"])
+@read_replica
+@login_required
+def view_student(id):
+    if request.method == "POST":
+        s = Student.query.get_or_404(id)
+        note_text  = (request.form.get("note") or "").strip()
+        new_status = (request.form.get("status") or "").strip()
+
+        if note_text:
+            n = StudentNote(student_id=id, text=note_text, author=current_user.username)
+            db.session.add(n)
+
+        if new_status in STATUSES:
+            s.status = new_status
+
+        db.session.commit()
+        flash("Detay güncellendi.", "success")
+        return redirect(url_for(".view_student", id=id))
+
+    stamp = student_page_stamp(id)
+    if stamp is None:
+        return view_archived_student(id)
+    etag = page_etag("student", id, stamp.row_version, stamp.note_count, stamp.last_note_at)
+    last_modified = max(filter(None, (stamp.updated_at, stamp.created_at, stamp.last_note_at)),
+                        default=None)
+    cached = not_modified(etag, last_modified, shows_flashes=False)
+    if cached is not None:
+        return cached
+
+    found = fetch_student_with_notes(id)
+    if found is None:
+        abort(404)
+    s, notes, next_cursor = found
+    resp = make_response(render_template(
+        "view_student.html", student=s, notes=notes, next_cursor=next_cursor,
+    ))
+    return set_validators(resp, etag, last_modified)
+
+def view_archived_student(id):
+    """Arşivdeki öğrenci: salt okunur, tüm notlarıyla; geri yükleme formu."""
+    import archive
+    found = archive.archived_student_with_notes(id)
+    if found is None:
+        abort(404)
+    s, notes = found
+    return render_template(
+        "view_student.html", student=s, notes=notes, next_cursor=None, archived=True,
+    )
+
+@web.route("/student/<int:id>/restore", methods=["POST"])
+@login_required
+def restore_student(id):
+    import archive
+    try:
+        restored = archive.restore_student(id)
+    except ValueError as e:
+        db.session.rollback()
+        flash(str(e), "danger")
+        return redirect(url_for(".dashboard", include_archived=1))
+    if not restored:
+        abort(404)
+    db.session.commit()
+    flash("Öğrenci arşivden geri yüklendi.", "success")
+    return redirect(url_for(".view_student", id=id))
+
+@web.get("/student/<int:id>/notes")
+@read_replica
+@login_required
+def student_notes(id):
+    """Not zaman çizelgesinin sonraki sayfası (sonsuz kaydırma için HTML parçası)."""
+    stamp = student_page_stamp(id)
+    if stamp is None:
+        abort(404)
+    etag = page_etag("notes", id, stamp.note_count, stamp.last_note_at,
+                     request.query_string.decode("latin-1"))
+    cached = not_modified(etag, stamp.last_note_at, shows_flashes=False)
+    if cached is not None:
+        return cached
+
+    notes, next_cursor = fetch_note_page(
+        id, read_before_at(request.args), read_before_id(request.args),
+        read_page_size(request.args, NOTES_PAGE_SIZE, NOTES_MAX_PAGE_SIZE),
+    )
+    resp = make_response(render_template(
+        "_notes.html", student_id=id, notes=notes, next_cursor=next_cursor,
+    ))
+    return set_validators(resp, etag, stamp.last_note_at)
+
+@web.route("/student/<int:id>/edit", methods=["GET", "POST"])
+@login_required
+def edit_student(id):
+    s = Student.query.get_or_404(id)
+
+    if request.method == "POST":
+        s.name       = request.form.get("name", s.name)
+        s.phone      = request.form.get("phone", s.phone)
+        s.school_no  = request.form.get("school_no", s.school_no)
+        faculty    = request.form.get("faculty", s.faculty)
+        department = request.form.get("department", s.department)
+        # Değiştiyse doğrula (listede olmayan eski kayıtlar olduğu gibi kalabilir)
+        if (faculty, department) != (s.faculty, s.department):
+            try:
+                faculty, department = resolve_faculty_department(faculty, department)
+            except ValueError as e:
+                flash(str(e), "danger")
+                return redirect(url_for(".edit_student", id=id))
+        s.faculty, s.department = faculty, department
+
+        # Yeni eklediğimiz problem alanı
+        s.problem    = request.form.get("problem", s.problem)
+
+        new_status = request.form.get("status", s.status)
+        if new_status in STATUSES:
+            s.status = new_status
+
+        db.session.commit()
+        flash("Öğrenci güncellendi.", "success")
+        return redirect(url_for(".view_student", id=id))
+
+    # <-- Burası fonksiyonun içi, indent *bir tab/4 boşluk* olacak
+    return render_template(
+        "edit_student.html",
+        student=s,
+        faculties=FACULTY_DEPARTMENTS
+    )
+
+@web.route("/student/<int:id>/delete", methods=["POST"])
+@login_required
+def delete_student(id):
+    s = Student.query.get_or_404(id)
+    db.session.delete(s)
+    db.session.commit()
+    flash("Öğrenci silindi.", "success")
+    return redirect(url_for(".dashboard"))
+
+@web.route("/student/<int:id>/note", methods=["POST"])
+@login_required
+def add_note(id):
+    s = Student.query.get_or_404(id)
+    note_text  = (request.form.get("note") or "").strip()
+    new_status = (request.form.get("status") or "").strip()
+    if note_text:
+        n = StudentNote(student_id=id, text=note_text, author=current_user.username)
+        db.session.add(n)
+    if new_status in STATUSES:
+        s.status = new_status
+    db.session.commit()
+    flash("Detay güncellendi.", "success")
+    return redirect(url_for(".view_student", id=id))
+
+@web.route("/note/<int:note_id>/delete", methods=["POST"])
+@login_required
+def delete_note(note_id):
+    n = StudentNote.query.get_or_404(note_id)
+    if n.author != current_user.username and current_user.username != "admin":
+        flash("Bu notu silme yetkin yok.", "danger")
+        return redirect(url_for(".view_student", id=n.student_id))
+    sid = n.student_id
+    db.session.delete(n)
+    db.session.commit()
+    flash("Not silindi.", "success")
+    return redirect(url_for(".view_student", id=sid))
+
+@web.route("/main")
+@read_replica
+@login_required
+def main_screen():
+    rows = staff_counts()
+    total = sum(cnt for _, cnt in rows)
+    return render_template("main.html", rows=rows, total=total)